@@ -0,0 +1,29 @@
+from benchmarks.timing import measure, summarize
+from core.audio.sample_bank import SampleBank
+from core.audio.library import create_library
+from core.configurations import NOTES
+
+
+def run(octave = 4):
+    """
+        Measures, for every note of the given octave, the time needed to decode its sounds into a new sample bank
+        (cold load) and to get them from the bank once decoded (warm load). The cold load reads the files through
+        the operating system's page cache, so run the suite after dropping the caches to measure a cold disk.
+        The mixer must be initialised.
+
+        Parameters
+        ----------
+        octave : int, optional
+    """
+    results = {}
+    library = create_library()
+    for note in NOTES:
+        bank = SampleBank(memory_budget = float('inf'), library = library)
+        cold = []
+        warm = []
+        for id in library.get_ids(note, octave):
+            cold += measure(lambda: bank.load(note, octave, id))
+            warm += measure(lambda: bank.get(note, octave, id), repeat = 10)
+        results[f"{note}{octave}"] = {'cold': summarize(cold), 'warm': summarize(warm),
+                                      'memory_usage': bank.get_memory_usage()}
+    return results
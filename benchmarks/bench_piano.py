@@ -0,0 +1,64 @@
+from benchmarks.timing import measure, summarize
+from core.GUI.piano.pian import Piano
+from core.GUI.top_menu.top_menu import TopMenu
+from core.configurations import PIANO_RELX, PIANO_RELY, PIANO_RELWIDTH, PIANO_RELHEIGHT, TOPMENU_RELHEIGHT
+
+
+def run_construction(root, audio, renderers = ('buttons', 'canvas'), octaves = range(1, 9), repeat = 5):
+    """
+        Measures the time needed to build and lay out a Piano with every renderer and number of octaves.
+
+        Parameters
+        ----------
+        root : tkinter.Tk
+        audio : AudioDevice
+        renderers : tuple, optional
+        octaves : iterable, optional
+        repeat : int, optional
+    """
+    results = {}
+    for renderer in renderers:
+        results[renderer] = {}
+        for count in octaves:
+            durations = []
+            for x in range(repeat):
+                pianos = []
+                durations += measure(lambda: pianos.append(_build_piano(root, audio, count, renderer)))
+                audio.prefetcher.wait()
+                pianos[0].destroy()
+            results[renderer][count] = summarize(durations)
+    return results
+
+
+def run_rebuild(root, audio, repeat = 20):
+    """
+        Measures the time needed by TopMenu to rebuild its piano with change_piano() and to reset it with
+        reset_piano(), and the number of widgets of the window after the repeated rebuilds and resets.
+
+        Parameters
+        ----------
+        root : tkinter.Tk
+        audio : AudioDevice
+        repeat : int, optional
+    """
+    menu = TopMenu(root, audio, parent = False, rlx=0, rly=0, rlwidth=1, rlheight=TOPMENU_RELHEIGHT)
+    root.update_idletasks()
+    widgets = len(root.winfo_children())
+    change = measure(lambda: _update(root, menu.change_piano), repeat)
+    widgets_after_change = len(root.winfo_children())
+    reset = measure(lambda: _update(root, menu.reset_piano), repeat)
+    widgets_after_reset = len(root.winfo_children())
+    return {'change_piano': summarize(change), 'reset_piano': summarize(reset), 'widgets': widgets,
+            'widgets_after_change_piano': widgets_after_change, 'widgets_after_reset_piano': widgets_after_reset}
+
+
+def _build_piano(root, audio, octaves, renderer):
+    piano = Piano(root, rlx=PIANO_RELX, rly=PIANO_RELY, rlwidth=PIANO_RELWIDTH, rlheight=PIANO_RELHEIGHT,
+                  octaves=octaves, audio=audio, renderer=renderer)
+    root.update_idletasks()
+    return piano
+
+
+def _update(root, method):
+    method()
+    root.update_idletasks()
@@ -0,0 +1,52 @@
+import time
+from benchmarks.timing import summarize
+from core.GUI.piano.pian import Piano
+from core.game.scheduler import GameScheduler
+from core.configurations import PIANO_RELX, PIANO_RELY, PIANO_RELWIDTH, PIANO_RELHEIGHT
+
+
+class ScaledWidget():
+    """
+        Class used to run a game faster than real time. Wraps a widget and divides the delays of its after() calls
+        by the given scale.
+
+        @widget : tkinter widget
+            the wrapped widget
+
+        @scale : double
+            the speed of the game compared to real time
+    """
+    def __init__(self, widget, scale):
+        self.widget = widget
+        self.scale = scale
+
+    def after(self, ms, method):
+        return self.widget.after(max(0, round(ms / self.scale)), method)
+
+    def after_cancel(self, id):
+        self.widget.after_cancel(id)
+
+
+def run(root, audio, count = 50, scale = 50):
+    """
+        Plays a practice game of count notes on a new piano, sped up by the given scale, and returns how late the
+        scheduler called each game event, in real ms.
+
+        Parameters
+        ----------
+        root : tkinter.Tk
+        audio : AudioDevice
+        count : int, optional
+        scale : double, optional
+    """
+    piano = Piano(root, rlx=PIANO_RELX, rly=PIANO_RELY, rlwidth=PIANO_RELWIDTH, rlheight=PIANO_RELHEIGHT, audio=audio)
+    audio.prefetcher.wait()
+    piano.scheduler = GameScheduler(ScaledWidget(piano.gui, scale), clock = lambda: time.monotonic() * scale)
+    piano.set_game_over(root.quit)
+    start = time.perf_counter()
+    piano.practice_mode(count, lambda: None)
+    root.mainloop()
+    duration = time.perf_counter() - start
+    lateness = [late / scale for deadline, late in piano.scheduler.get_jitter()]
+    piano.destroy()
+    return {'notes': count, 'scale': scale, 'duration': duration, 'lateness': summarize(lateness)}
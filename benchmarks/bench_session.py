@@ -0,0 +1,50 @@
+import random
+import time
+from core.game.session import GameSession, PRACTICE, TEST
+from core.configurations import NOTES
+
+RESPONSE_TIME = 0.8 #SECONDS, THE SIMULATED TIME A PLAYER TAKES TO ANSWER
+
+
+def simulate(mode, targets, count, rng):
+    """
+        Plays a whole game on a simulated clock, answering every round after RESPONSE_TIME with a random key, and
+        returns the session.
+
+        Parameters
+        ----------
+        mode : str
+        targets : list
+        count : int
+        rng : random.Random
+    """
+    session = GameSession(mode, targets, count, rng = rng)
+    session.start(0.0)
+    while session.is_running():
+        now = session.get_next_time()
+        session.tick(now)
+        if session.is_awaiting():
+            session.press(*rng.choice(targets), now + RESPONSE_TIME)
+    return session
+
+
+def run(sessions = 2000, count = 50):
+    """
+        Simulates the given number of practice and test games of count notes each, faster than real time, and
+        returns how many games are simulated per second.
+
+        Parameters
+        ----------
+        sessions : int, optional
+        count : int, optional
+    """
+    targets = [(note, octave) for octave in range(4, 6) for note in NOTES]
+    rng = random.Random(0)
+    results = {}
+    for mode in (PRACTICE, TEST):
+        start = time.perf_counter()
+        for x in range(sessions):
+            simulate(mode, targets, count, rng)
+        duration = time.perf_counter() - start
+        results[mode] = {'sessions': sessions, 'notes': count, 'duration': duration, 'sessions_per_second': sessions / duration}
+    return results
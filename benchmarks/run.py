@@ -0,0 +1,76 @@
+"""
+    Runs the benchmarks headless and prints the results as JSON.
+
+    Usage: python -m benchmarks.run [--suite audio|piano|scheduler|session] [--output FILE] [--time-scale SCALE]
+
+    The sounds are played with SDL's dummy audio driver. The piano benchmarks need a display, but the Tk window is
+    withdrawn, so they can run under a virtual one: xvfb-run python -m benchmarks.run
+"""
+import os
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tkinter
+from benchmarks import bench_audio, bench_piano, bench_scheduler, bench_session
+from core.audio.device import AudioDevice
+from definitions import ROOT_DIR
+
+SUITES = ['audio', 'piano', 'scheduler', 'session']
+
+
+def main(arguments = None):
+    parser = argparse.ArgumentParser(description = 'Runs the benchmarks and prints the results as JSON.')
+    parser.add_argument('--suite', action = 'append', choices = SUITES, help = 'the suites to run. Defaults to all')
+    parser.add_argument('--output', help = 'writes the results to this file instead of the standard output')
+    parser.add_argument('--time-scale', type = float, default = 50, help = 'the speed of the scheduler game')
+    args = parser.parse_args(arguments)
+    suites = args.suite or SUITES
+
+    audio = AudioDevice()
+    audio.open()
+    results = {'meta': _get_meta(audio), 'results': {}}
+    if 'audio' in suites:
+        results['results']['sample_load'] = bench_audio.run()
+    if 'session' in suites:
+        results['results']['session_simulation'] = bench_session.run()
+    if 'piano' in suites or 'scheduler' in suites:
+        root = tkinter.Tk()
+        root.withdraw()
+        if 'piano' in suites:
+            results['results']['piano_construction'] = bench_piano.run_construction(root, audio)
+            results['results']['piano_rebuild'] = bench_piano.run_rebuild(root, audio)
+        if 'scheduler' in suites:
+            results['results']['practice_scheduler'] = bench_scheduler.run(root, audio, scale = args.time_scale)
+        root.destroy()
+    audio.close()
+
+    output = json.dumps(results, indent = 2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+def _get_meta(audio):
+    import pygame
+    return {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': _get_commit(), 'python': platform.python_version(),
+            'platform': platform.platform(), 'pygame': pygame.version.ver, 'tk': tkinter.TkVersion,
+            'mixer': {'frequency': audio.frequency, 'size': audio.size, 'channels': audio.channels, 'buffer': audio.buffer}}
+
+
+def _get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd = ROOT_DIR, capture_output = True, text = True).stdout.strip()
+    except OSError:
+        return None
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import time
+
+
+def measure(method, repeat = 1):
+    """
+        Calls the method repeat times and returns the duration of each call in ms.
+
+        Parameters
+        ----------
+        method : method
+        repeat : int, optional
+    """
+    durations = []
+    for x in range(repeat):
+        start = time.perf_counter()
+        method()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def summarize(values):
+    """
+        Returns the number of values and their minimum, median, mean, 95th percentile and maximum.
+
+        Parameters
+        ----------
+        values : list
+    """
+    values = sorted(values)
+    if not values:
+        return {'count': 0}
+    return {'count': len(values), 'min': values[0], 'median': values[len(values) // 2],
+            'mean': sum(values) / len(values), 'p95': values[min(len(values) - 1, len(values) * 95 // 100)],
+            'max': values[-1]}
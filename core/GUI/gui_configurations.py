@@ -23,6 +23,9 @@ VALUE_FONT = 'Helvetica 26 bold'
 VALUE_TEXT_COLOR = CC
 VALUE_BACKGROUND_COLOR = ROOT_BACKGROUND
 
+#GAME SUMMARY
+SUMMARY_FONT = 'Helvetica 11'
+
 #BUTTONS: SAVE SETTINGS, PRACTICE, TEST
 THREE_BUTTONS_COLOR = CB
 THREE_BUTTONS_FONT = 'Helvetica 16 bold'
@@ -1,6 +1,6 @@
 import tkinter
 from enum import Enum
-from tkinter import Frame, Label, Checkbutton, Button
+from tkinter import Frame, Label, Checkbutton, Button, Canvas
 from core.GUI.gui_configurations import *
 
 class GUITypes(Enum):
@@ -8,7 +8,8 @@ class GUITypes(Enum):
     FRAME = 1,
     CHECKBUTTON = 2,
     BUTTON = 3,
-    TEXT = 4
+    TEXT = 4,
+    CANVAS = 5
 
 
 class GUIPiece():
@@ -86,6 +87,8 @@ class GUIPiece():
             self.gui = Checkbutton()
         elif type == GUITypes.BUTTON:
             self.gui = Button()
+        elif type == GUITypes.CANVAS:
+            self.gui = Canvas()
         else:
             raise AttributeError("Please select a GUIType.")
 
@@ -211,6 +214,12 @@ class LabelWithCheckboxAndNumbersInput(GUILabel):
 
                get_value()
                     :returns: the value of the input label
+
+               set_checked(flag)
+                    sets the state of the check button
+
+               set_value(value)
+                    sets the value of the input label, without calling the methods of the buttons
     """
     def __init__(self, master, rlx, rly, rlwidth, rlheight, label_text, checkbox_text, check_flag, current_value, min_method = None, max_method = None, parent = True, initiate = True, min_value = 1, max_value = 8, **kw):
         super().__init__(master, rlx, rly, rlwidth, rlheight, parent = parent, initiate = initiate, **kw)
@@ -240,6 +249,12 @@ class LabelWithCheckboxAndNumbersInput(GUILabel):
     def get_value(self):
         return self.input_with_buttons.get_value()
 
+    def set_checked(self, flag):
+        self.checkbox_with_label.set_checked(flag)
+
+    def set_value(self, value):
+        self.input_with_buttons.set_value(value)
+
     def __initialise_label(self, text, relwidth, relheight):
         args = create_args(['background', 'font', 'foreground'], [TOP_LABEL_COLOR, TOP_LABEL_FONT, TOP_LABEL_TEXT_COLOR])
         self.text_label = GUILabel(self, 0, 0, relwidth, relheight, text = text, **args)
@@ -304,6 +319,9 @@ class InputWithButtons(GUILabel):
 
                get_value()
                     :returns: the value of the input label
+
+               set_value(value)
+                    sets the value of the input label, limited to [min_value, max_value]
     """
 
     def __init__(self, master, rlx, rly, rlwidth, rlheight, min_value, max_value, current_value, min_method = None, max_method = None, parent = True, initiate = True, **kw):
@@ -319,6 +337,10 @@ class InputWithButtons(GUILabel):
     def get_value(self):
         return self.value
 
+    def set_value(self, value):
+        self.value = min(max(value, self.min_value), self.max_value)
+        self.__update_label()
+
     def disable(self):
         self.button_down.disable()
         self.button_up.disable()
@@ -400,6 +422,9 @@ class LabelWithCheckboxAndText(GUILabel):
 
                check()
                     changes the state of the check button
+
+               set_checked(flag)
+                    sets the state of the check button
     """
 
     def __init__(self, master, rlx, rly, rlwidth, rlheight, check_flag, checkbox_text, parent = True, initiate = True, **kw):
@@ -413,6 +438,9 @@ class LabelWithCheckboxAndText(GUILabel):
     def is_checked(self):
         return self.check.get() == 1
 
+    def set_checked(self, flag):
+        self.check.set(1 if flag else 0)
+
     def check(self):
         self.check_button.check_the_button()
 
@@ -0,0 +1,260 @@
+from bisect import bisect_right
+from core.GUI.gui_pieces import GUIPiece, GUITypes
+from core.GUI.piano.piano_keys import BasePianoKey
+
+KEY_NAME_FONT = 'Helvetica 9 bold'
+KEY_NAME_COLOR = 'red'
+KEY_OUTLINE_COLOR = 'black'
+
+
+class KeyIndex():
+    """
+        Class used to find the key drawn under a point. The keys of one layer are kept sorted by their left edge, so
+        a point is resolved with one binary search.
+
+        Methods
+        -------
+        add(key, rlx, rly, rlwidth, rlheight)
+            Adds a key with the given relative bounds
+
+        remove(key)
+            Removes a key
+
+        find(relx, rely)
+            :returns: the key under the given relative point, or None
+    """
+    def __init__(self):
+        self.starts = []
+        self.bounds = []
+
+    def add(self, key, rlx, rly, rlwidth, rlheight):
+        index = bisect_right(self.starts, rlx)
+        self.starts.insert(index, rlx)
+        self.bounds.insert(index, (key, rlx + rlwidth, rly, rly + rlheight))
+
+    def remove(self, key):
+        for index, bounds in enumerate(self.bounds):
+            if bounds[0] is key:
+                del self.starts[index]
+                del self.bounds[index]
+                return
+
+    def find(self, relx, rely):
+        index = bisect_right(self.starts, relx) - 1
+        if index < 0:
+            return None
+        key, end, top, bottom = self.bounds[index]
+        if relx < end and top <= rely < bottom:
+            return key
+        return None
+
+
+class PianoCanvas(GUIPiece):
+    """
+            Class used to draw all the keys of a piano on one canvas. The key under a click is found with a
+            precomputed index of the x coordinates of the keys. The short (black) keys are drawn on top of the
+            full height (white) keys, so they are checked first.
+
+            @master : GUIPiece
+                the parent of the class
+
+            @rlx : double
+                the relx of this class
+
+            @rly : double
+                the rely of this class
+
+            @rlwidth : double
+                the relwidth of this class
+
+            @relheight : double
+                the relheight of this class
+
+            @parent : bool, optional
+                if True, adapts the relative sizes according to master's relative sizes
+
+            @initiate : bool, optional
+                if True, calls the method place()
+
+            Methods
+            -------
+            add_key(key, rlx, rly, rlwidth, rlheight)
+                draws a key and adds it to the index. :returns: the id of the canvas item
+
+            add_text(text, relx, rely)
+                draws a hidden text. :returns: the id of the canvas item
+
+            remove_key(key, item)
+                deletes the item of a key and removes the key from the index
+
+            delete_item(item)
+                deletes an item
+
+            key_at(relx, rely)
+                :returns: the key under the given relative point, or None
+
+            set_item_color(item, color)
+                changes the fill color of an item
+
+            set_item_text(item, text)
+                changes the text of an item
+
+            show_item(item)
+                shows an item
+
+            hide_item(item)
+                hides an item
+    """
+    def __init__(self, master, rlx, rly, rlwidth, rlheight, parent = True, initiate = True, **kw):
+        super().__init__(master, rlx, rly, rlwidth, rlheight, GUITypes.CANVAS, parent = parent, initiate = initiate, highlightthickness = 0, **kw)
+        self.items = []
+        self.full_keys = KeyIndex()
+        self.short_keys = KeyIndex()
+        self.width = 1
+        self.height = 1
+        self.gui.bind('<Configure>', lambda event: self.__resize(event.width, event.height))
+        self.gui.bind('<ButtonPress-1>', lambda event: self.__press(event.x, event.y))
+
+    def add_key(self, key, rlx, rly, rlwidth, rlheight):
+        item = self.gui.create_rectangle(0, 0, 0, 0, fill = key.get_color(), outline = KEY_OUTLINE_COLOR)
+        self.__add_item(item, [rlx, rly, rlx + rlwidth, rly + rlheight])
+        index = self.full_keys if rly + rlheight >= 1 else self.short_keys
+        index.add(key, rlx, rly, rlwidth, rlheight)
+        return item
+
+    def add_text(self, text, relx, rely):
+        item = self.gui.create_text(0, 0, text = text, font = KEY_NAME_FONT, fill = KEY_NAME_COLOR, state = 'hidden')
+        self.__add_item(item, [relx, rely])
+        return item
+
+    def remove_key(self, key, item):
+        self.full_keys.remove(key)
+        self.short_keys.remove(key)
+        self.delete_item(item)
+
+    def delete_item(self, item):
+        self.items = [(other, coordinates) for other, coordinates in self.items if other != item]
+        self.gui.delete(item)
+
+    def key_at(self, relx, rely):
+        key = self.short_keys.find(relx, rely)
+        if key is None:
+            key = self.full_keys.find(relx, rely)
+        return key
+
+    def set_item_color(self, item, color):
+        self.gui.itemconfigure(item, fill = color)
+
+    def set_item_text(self, item, text):
+        self.gui.itemconfigure(item, text = text)
+
+    def show_item(self, item):
+        self.gui.itemconfigure(item, state = 'normal')
+
+    def hide_item(self, item):
+        self.gui.itemconfigure(item, state = 'hidden')
+
+    def __add_item(self, item, coordinates):
+        self.items.append((item, coordinates))
+        self.__place_item(item, coordinates)
+
+    def __place_item(self, item, coordinates):
+        scaled = [value * (self.width if index % 2 == 0 else self.height) for index, value in enumerate(coordinates)]
+        self.gui.coords(item, *scaled)
+
+    def __resize(self, width, height):
+        self.width = max(width, 1)
+        self.height = max(height, 1)
+        for item, coordinates in self.items:
+            self.__place_item(item, coordinates)
+
+    def __press(self, x, y):
+        key = self.key_at(x / self.width, y / self.height)
+        if key is not None:
+            key.press()
+
+
+class CanvasPianoKey(BasePianoKey):
+    """
+        Class used to represent a piano key drawn on the PianoCanvas of its piano. Has the same constructor and
+        methods as PianoKey, so the piano can use both renderers.
+
+           @master : Piano
+                the piano of this key. The piano must have a PianoCanvas called canvas
+           @note : str
+                the note of this key
+           @octave : int
+                the octave of this key
+           @rlx : double
+                the relx of this key inside the piano
+           @rly : double
+                the rely of this key inside the piano
+           @rlwidth : double
+                the relwidth of this key
+           @relheight : double
+                the relheight of this key
+           @id : int
+                 the id of the sound to be played
+           @audio : AudioDevice
+                 the audio device that plays the sounds of the piano
+
+        Methods
+        -------
+        press()
+            calls the command of this key, if the key is enabled
+
+        get_key()
+            Returns the canvas item of this key
+
+        show_key_name()
+            shows the name of the note
+
+        hide_key_name()
+            hides the name of the note
+
+        enable()
+            enables this key
+
+        disable()
+            disables this key
+
+        destroy()
+            deletes the items of this key from the canvas
+
+        See BasePianoKey for the methods shared by every renderer.
+    """
+    def __init__(self, master, note, octave, color, rlx, rly, rlwidth, rlheight, id, audio, **kw):
+        super().__init__(master, note, octave, color, id, audio)
+        self.canvas = master.canvas
+        self.enabled = True
+        self.item = self.canvas.add_key(self, rlx, rly, rlwidth, rlheight)
+        self.key_name = self.canvas.add_text(self.get_name(), rlx + rlwidth / 2, rly + rlheight * 0.96)
+
+    def press(self):
+        if self.enabled:
+            super().press()
+
+    def get_key(self):
+        return self.item
+
+    def show_key_name(self):
+        self.canvas.show_item(self.key_name)
+
+    def hide_key_name(self):
+        self.canvas.hide_item(self.key_name)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def destroy(self):
+        self.canvas.remove_key(self, self.item)
+        self.canvas.delete_item(self.key_name)
+
+    def set_color(self, color):
+        self.canvas.set_item_color(self.item, color)
+
+    def set_key_name(self, text):
+        self.canvas.set_item_text(self.key_name, text)
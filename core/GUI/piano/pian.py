@@ -1,13 +1,25 @@
 import random
 from core.GUI.gui_pieces import GUIPiece, GUITypes
+from core.GUI.piano.canvas_piano import PianoCanvas, CanvasPianoKey
 from core.GUI.piano.piano_keys import PianoKey
-from core.configurations import TOTAL_TIME, SOUNDS_COUNT, TIME_FOR_SHOW_ANSWER, PIANO_OCTAVE
+from core.audio.device import AudioDevice
+from core.game.chords import create_chord_picker
+from core.game.drill import read_drill
+from core.game.scheduler import GameScheduler
+from core.game.selection import create_selector
+from core.game.session import GameSession, PRACTICE, TEST
+from core.instrumentation import probe
+from core.pitch import get_midi, get_name, SEMITONES
+from core.configurations import PIANO_OCTAVE, PIANO_RENDERER
 
 
 class Piano(GUIPiece):
 
     """
-       Class used to represent a Piano.
+       Class used to represent a Piano. The games are run by a GameSession, and the piano is the view of the
+       session: it plays the sounds of the rounds and shows their answers on its keys. The keys are kept in pitch
+       order, so the key of a MIDI number is found in O(1) from the MIDI number of the first key, and shifting the
+       octaves only changes that offset and renames the keys once.
 
        @master : GUIPiece
            the parent of the class
@@ -30,6 +42,23 @@ class Piano(GUIPiece):
        @octaves : int, optional
             the number of octaves a piano should have. Range [1, 8]
 
+       @audio : AudioDevice, optional
+            the audio device used by the piano keys. If None, the piano opens its own device. Sharing one device
+            between pianos avoids initialising the mixer and decoding the sounds again
+
+       @renderer : str, optional
+            'buttons' draws every key as a Tk button, 'canvas' draws all the keys on one canvas
+
+       @store : AttemptStore, optional
+            if given, the rounds of the games are saved in it
+
+       @analytics : ConfusionMatrix, optional
+            if given, the answers of the games are counted in it
+
+       @drill : str, optional
+            the path of a MIDI file. If given, the games play the notes of the file, moved onto the keys of the
+            game, at the times of the file, instead of random notes
+
        @parent : bool, optional
             if True, adapts the relative sizes according to master's relative sizes
 
@@ -56,8 +85,20 @@ class Piano(GUIPiece):
         one_octave_down()
             decreases the octave of the piano
 
-        trigger()
-            triggers the method that shows the answer in test mode
+        answer(key)
+            answers the current round of the game with the given key
+
+        get_key(note, octave)
+            returns the key of the given note, or None if it is not shown
+
+        get_key_by_pitch(pitch)
+            returns the key of the given MIDI number, or None if it is not shown
+
+        press_key(note, octave)
+            presses the key of the given note, like a click. Returns False if the key is not shown
+
+        get_pitch_range()
+            returns the range of the MIDI numbers of the keys
 
         disable_keyboard()
             disables the piano keys of the piano
@@ -70,15 +111,53 @@ class Piano(GUIPiece):
 
         set_current_octave(current_octave)
             sets the current octave of the piano
+
+        reset()
+            stops the current game and puts the keys back in free play mode, without creating any widget
+
+        destroy()
+            destroys the piano and its keys
+
+        Methods called by the GameSession
+        ---------------------------------
+        on_play(note, octave, id)
+            plays the sound of a round
+
+        on_play_chord(sounds, delay)
+            plays the sounds of a round of several notes, mixed into one sound
+
+        on_show_answer(note, octave)
+            colors the key of the answer in red and disables the keyboard
+
+        on_hide_answer(note, octave)
+            restores the color of the key of the answer and enables the keyboard
+
+        on_game_over(session)
+            calls the method set by set_game_over
        """
-    def __init__(self, master, rlx, rly, rlwidth, rlheight, current_octave = 1, octaves = PIANO_OCTAVE, parent = False, **kw):
+    def __init__(self, master, rlx, rly, rlwidth, rlheight, current_octave = 1, octaves = PIANO_OCTAVE, audio = None, renderer = PIANO_RENDERER, store = None, analytics = None, drill = None, parent = False, **kw):
         super().__init__(master, rlx, rly, rlwidth, rlheight, GUITypes.FRAME, parent = parent, **kw)
         assert current_octave > 0 and current_octave < 9
         assert octaves > 0 and octaves < 9
         self.keys = []
+        self.offset = 0
+        self.session = None
         self.total_octaves = octaves
         self.current_octave = current_octave
+        if audio is None:
+            audio = AudioDevice()
+            audio.open()
+        self.audio = audio
+        self.store = store
+        self.analytics = analytics
+        self.drill = drill
+        self.recorders = [recorder for recorder in (store, analytics) if recorder is not None]
+        self.selector = create_selector(store = store, library = audio.library)
+        self.chords = create_chord_picker()
+        self.scheduler = GameScheduler(self.gui, probe = probe)
+        self.__initiate_renderer(renderer)
         self.__initiate_keys()
+        self.__prefetch()
 
 
 
@@ -124,7 +203,7 @@ class Piano(GUIPiece):
             if True, only sounds from the octave self.current_octave will be played
     """
     def practice_mode(self, count, start_method, one_octave_only = False):
-        self.__start_practice(count, self.__get_limits(one_octave_only, start_method))
+        self.__start(PRACTICE, count, self.__get_limits(one_octave_only, start_method))
 
     """
         Starts test mode. A sound is played. When a player presses a piano key, the answer is shown on the piano
@@ -139,29 +218,80 @@ class Piano(GUIPiece):
             if True, only sounds from the octave self.current_octave will be played
     """
     def test_mode(self, count, start_method, one_octave_only = False):
-        self.__start_test(count, self.__get_limits(one_octave_only, start_method))
+        for key in self.keys:
+            key.activate_test_mode()
+        self.__start(TEST, count, self.__get_limits(one_octave_only, start_method))
 
     """
         Increases the octave of the piano
     """
     def one_octave_up(self):
-        if self.current_octave <= 8 - self.total_octaves:
-            for key in self.keys: key.one_octave_up()
-        self.current_octave = min(self.current_octave + 1, 8)
+        self.__shift(1)
+        self.__prefetch()
 
     """
         Decreases the octave of the piano
     """
     def one_octave_down(self):
-        if self.current_octave <= 9 - self.total_octaves:
-            for key in self.keys: key.one_octave_down()
-        self.current_octave = max(0, self.current_octave -1)
+        self.__shift(-1)
+        self.__prefetch()
+
+    """
+        Answers the current round of the game with the note of the given key
+
+        Parameters
+        ----------
+        key : BasePianoKey
+    """
+    def answer(self, key):
+        if self.session is not None:
+            self.session.press(key.note, key.octave)
+
+    """
+        Returns the key of the given note, or None if the note is not shown
+
+        Parameters
+        ----------
+        note : str
+        octave : int
+    """
+    def get_key(self, note, octave):
+        return self.get_key_by_pitch(get_midi(note, octave))
+
+    """
+        Returns the key of the given MIDI number, or None if the key is not shown
+
+        Parameters
+        ----------
+        pitch : int
+    """
+    def get_key_by_pitch(self, pitch):
+        index = pitch - self.offset
+        if 0 <= index < len(self.keys):
+            return self.keys[index]
+        return None
 
     """
-        Triggers the method for showing the answer in test mode.
+        Presses the key of the given note, as if it was clicked: the key plays its sound, or answers the current
+        round in test mode. Returns False if the note is not shown
+
+        Parameters
+        ----------
+        note : str
+        octave : int
     """
-    def trigger(self):
-        self.gui.after(0, self.__trigger_show_answer)
+    def press_key(self, note, octave):
+        key = self.get_key(note, octave)
+        if key is None:
+            return False
+        key.press()
+        return True
+
+    """
+        Returns the range of the MIDI numbers of the keys
+    """
+    def get_pitch_range(self):
+        return range(self.offset, self.offset + len(self.keys))
 
     """
         Enables the piano's keyboard
@@ -185,28 +315,128 @@ class Piano(GUIPiece):
         Sets the current octave
     """
     def set_current_octave(self, octave):
-        if octave > self.current_octave:
-            self.__set_current_octave(lambda: self.one_octave_up(), octave - self.current_octave)
-        else:
-            self.__set_current_octave(lambda: self.one_octave_down(), self.current_octave - octave)
+        self.__shift(octave - self.current_octave)
+        self.__prefetch()
+
+    """
+        Stops the current game and puts every key back in free play mode
+    """
+    def reset(self):
+        if self.session is not None:
+            self.session.stop()
+            self.session = None
+        self.scheduler.cancel()
+        for key in self.keys: key.reset()
+        self.enable_keyboard()
+
+    """
+        Destroys the piano and its keys
+    """
+    def destroy(self):
+        self.reset()
+        for key in self.keys: key.destroy()
+        if self.renderer == 'canvas':
+            self.canvas.destroy()
+        super().destroy()
+
+    def __shift(self, octaves):
+        offset = self.offset
+        for x in range(abs(octaves)):
+            if octaves > 0:
+                if self.current_octave <= 8 - self.total_octaves:
+                    self.offset += 12
+                self.current_octave = min(self.current_octave + 1, 8)
+            else:
+                if self.current_octave <= 9 - self.total_octaves:
+                    self.offset -= 12
+                self.current_octave = max(0, self.current_octave -1)
+        if self.offset != offset:
+            pitches = range(self.offset, self.offset + len(self.keys))
+            names = [get_name(pitch) for pitch in pitches]
+            for key, pitch in zip(self.keys, pitches):
+                key.set_pitch(pitch, draw = False)
+            for key, name in zip(self.keys, names):
+                key.set_key_name(name)
+
+    def __get_visible_octaves(self):
+        return range(self.keys[0].octave, self.keys[-1].octave + 1)
+
+    def __prefetch(self):
+        self.audio.request_octaves(self.__get_visible_octaves())
+
+    """
+        Plays the sound with the given id of the given note, if the key of the note is shown and its sound is enabled
+
+        Parameters
+        ----------
+        note : str
+        octave : int
+        id : int
+    """
+    def on_play(self, note, octave, id):
+        key = self.get_key(note, octave)
+        if key is not None:
+            key.play_variant(id)
+
+    """
+        Plays the sounds of the given notes mixed into one sound, if the sound of their keys is enabled
+
+        Parameters
+        ----------
+        sounds : list
+            (note, octave, id) tuples
+        delay : int
+            the ms between the starts of two notes
+    """
+    def on_play_chord(self, sounds, delay):
+        keys = [self.get_key(note, octave) for note, octave, id in sounds]
+        if all(key is not None and key.is_sound_enabled() for key in keys):
+            self.audio.play_chord(sounds, delay)
+
+    """
+        Colors the key of the given note in red and disables the keyboard
+
+        Parameters
+        ----------
+        note : str
+        octave : int
+    """
+    def on_show_answer(self, note, octave):
+        key = self.get_key(note, octave)
+        if key is not None:
+            key.change_color_to_red()
 
-    def __set_current_octave(self, method, count):
-        for x in range(count): method()
+    """
+        Restores the color of the key of the given note and enables the keyboard
 
-    def __random_key(self, limits):
-        return self.keys[random.randint(limits[0], limits[1] - 1)]
+        Parameters
+        ----------
+        note : str
+        octave : int
+    """
+    def on_hide_answer(self, note, octave):
+        key = self.get_key(note, octave)
+        if key is not None:
+            key.change_color_to_default()
 
-    def __start_practice(self, count, limits):
-        for x in range(0, count):
-            self.__random_key(limits).play_and_show_answer(x)
-        self.gui.after(count * TOTAL_TIME, self.__game_over)
+    """
+        Calls the method set by set_game_over
 
-    def __game_over(self):
+        Parameters
+        ----------
+        session : GameSession
+    """
+    def on_game_over(self, session):
         self.game_over()
 
-    def __trigger_show_answer(self):
-        self.answers[self.count].change_color_to_red()
-        self.gui.after(0, self.__next_trigger)
+    def __start(self, mode, count, limits):
+        targets = [(key.note, key.octave) for key in self.keys[limits[0]:limits[1]]]
+        timeline = None
+        if self.drill is not None:
+            timeline = read_drill(self.drill, range(self.offset + limits[0], self.offset + limits[1]))
+        self.session = GameSession(mode, targets, count, sink = self, scheduler = self.scheduler, selector = self.selector,
+                                   recorders = self.recorders, timeline = timeline, chords = self.chords)
+        self.session.start()
 
     def __get_limits(self, one_octave_only: bool, start_method):
         start_method()
@@ -219,70 +449,35 @@ class Piano(GUIPiece):
 
         return start, start + difference
 
-    def __next_trigger(self):
-        self.count += 1
-        if self.count < len(self.answers):
-            self.gui.after(TIME_FOR_SHOW_ANSWER, self.__next_test)
+    def __initiate_renderer(self, renderer):
+        self.renderer = renderer
+        if renderer == 'buttons':
+            self.key_class = PianoKey
+        elif renderer == 'canvas':
+            self.key_class = CanvasPianoKey
+            self.canvas = PianoCanvas(self, 0, 0, 1, 1, background = self.get_background_color())
         else:
-            self.gui.after(TIME_FOR_SHOW_ANSWER,self.__game_over)
-
-    def __start_test(self, count, limits):
-        self.answers = []
-        self.count = 0
-        for key in self.keys:
-            key.activate_test_mode()
-        for x in range(0, count):
-            self.answers.append(self.__random_key(limits))
-        self.__next_test()
-
-    def __next_test(self):
-        self.answers[self.count].play_random()
+            raise AttributeError("Please select a piano renderer: 'buttons' or 'canvas'.")
 
     def __initiate_keys(self):
         white_width = 1/(self.total_octaves * 7)
-        id = random.randint(0, SOUNDS_COUNT - 1)
+        id = random.choice(self.audio.library.get_all_ids() or (0,))
 
         if 9 - self.total_octaves < self.current_octave:
             starting = 9 - self.total_octaves
         else:
             starting = self.current_octave
 
-        whites = self.__initiate_key(starting_octave = starting, octaves=self.total_octaves, keys=["C", "D", "E", "F", "G", "A", "B"], color="White", positions=[0, 1, 2, 3, 4, 5, 6], width = white_width, relxwidth = white_width, start_step = 0, relh = 1, id = id)
+        self.offset = get_midi("C", starting)
+        self.keys = [None] * (12 * self.total_octaves)
+        self.__initiate_key(starting_octave = starting, octaves=self.total_octaves, keys=["C", "D", "E", "F", "G", "A", "B"], color="White", positions=[0, 1, 2, 3, 4, 5, 6], width = white_width, relxwidth = white_width, start_step = 0, relh = 1, id = id)
         black_width = white_width * 0.7
-        blacks = self.__initiate_key(starting_octave = starting, octaves=self.total_octaves, keys=["Cb", "Db", "Fb", "Gb", "Ab"], color="Black", positions=[1, 2, 4, 5, 6], width = black_width, relxwidth = white_width, start_step= white_width * 0.35, relh = 0.6, id = id)
-
-        for i in range(self.total_octaves):
-            self.keys.append(self.__pop_first(whites))
-            self.keys.append(self.__pop_first(blacks))
-            self.keys.append(self.__pop_first(whites))
-
-            self.keys.append(self.__pop_first(blacks))
-            self.keys.append(self.__pop_first(whites))
-            self.keys.append(self.__pop_first(whites))
-
-            self.keys.append(self.__pop_first(blacks))
-            self.keys.append(self.__pop_first(whites))
-            self.keys.append(self.__pop_first(blacks))
-
-            self.keys.append(self.__pop_first(whites))
-            self.keys.append(self.__pop_first(blacks))
-            self.keys.append(self.__pop_first(whites))
-
-    def __pop_first(self, list):
-        x = list[0]
-        list.remove(x)
-        return x
+        self.__initiate_key(starting_octave = starting, octaves=self.total_octaves, keys=["Cb", "Db", "Fb", "Gb", "Ab"], color="Black", positions=[1, 2, 4, 5, 6], width = black_width, relxwidth = white_width, start_step= white_width * 0.35, relh = 0.6, id = id)
 
     def __initiate_key(self, starting_octave, octaves, keys, color, positions, width, relxwidth, start_step, relh, id):
-        res = []
         for o in range(octaves):
             octave = o * 7
             for index in range(len(positions)):
                 relx = relxwidth * (octave + positions[index]) - start_step
-                key = PianoKey(self, keys[index], starting_octave + o, color, rlx = relx, rly = 0, rlwidth = width, rlheight = relh, id = id)
-                res.append(key)
-
-        return res
-
-
-
+                key = self.key_class(self, keys[index], starting_octave + o, color, rlx = relx, rly = 0, rlwidth = width, rlheight = relh, id = id, audio = self.audio)
+                self.keys[12 * o + SEMITONES[keys[index]]] = key
@@ -1,176 +1,254 @@
-import random
-from datetime import datetime
-from pygame import mixer
+from abc import ABC, abstractmethod
 from core.GUI.gui_pieces import GUIButton, GUILabel
-from core.configurations import PRACTICE_GUESS_TIME, TIME_FOR_SHOW_ANSWER, SOUNDS_COUNT
-from definitions import ROOT_DIR
+from core.instrumentation import probe
+from core.pitch import get_midi, get_note, get_name
 
-TOTAL_WAITING = PRACTICE_GUESS_TIME + TIME_FOR_SHOW_ANSWER
-
-class PianoKey(GUIButton):
+class BasePianoKey(ABC):
 
     """
-        Class used to represent a piano key.
+        Class used to represent the behaviour shared by the piano keys of every renderer. A renderer subclasses it
+        and implements the methods that draw the key.
 
-           @master : GUIPiece
-                the parent of the class
+           @master : Piano
+                the piano of this key
            @note : str
                 the note of this key
            @octave : int
                 the octave of this key
-           @rlx : double
-                the relx of this class
-           @rly : double
-                the rely of this class
-           @rlwidth : double
-                the relwidth of this class
-           @relheight : double
-                the relheight of this class
+           @color : str
+                the color of this key
            @id : int
                  the id of the sound to be played
-           @parent : bool, optional
-                 if True, adapts the relative sizes according to master's relative sizes
+           @audio : AudioDevice
+                 the audio device that plays the sounds of the piano
 
         Methods
         -------
         activate_test_mode()
-            Activates test mode
+            Activates test mode: pressing this key answers the current round of the game
 
         get_path()
             Returns the path of the sounds played by this key
 
+        get_pitch()
+            Returns the MIDI number of this key
+
+        set_pitch(pitch, draw)
+            Changes the note and the octave of this key to the given MIDI number. If draw is True, the default, its
+            name is updated too
+
         one_octave_up()
             Increases the octave of this key
 
         one_octave_down()
             Decreases the octave of this key
 
-        get_key()
-            Returns the gui piece of this key
+        get_name()
+            Returns the note and the octave of this key
 
         get_color()
             Returns the color of this key
 
-        play_and_show_answer(times)
-            Plays this key's sound and after times ms, triggers the method used to show the answer in practice mode
-
         change_color_to_red()
-            Changes the color of this key to red, then to wait after 2 seconds
+            Changes the color of this key to red and disables the keyboard
+
+        change_color_to_default()
+            Changes the color of this key back to its color and enables the keyboard
 
         play()
             play the sound associated with self.id
 
-        play_random()
-            play a sound with a random id
+        play_variant(id)
+            play the sound with the given id, if the sound of this key is enabled
 
-        show_key_name()
-            shows the name of the note
+        is_sound_enabled()
+            Returns True if the sound of this key is enabled
 
-        hide_key_name()
-            hides the name of the note
+        press()
+            calls the method set by set_command. By default, the key plays its sound
+
+        set_command(command)
+            Sets the method called when this key is pressed
+
+        reset()
+            Puts the key back in free play mode, with its sound enabled and its original color
 
         disable_sound()
             disables the sound of this class
 
         enable_sound()
             enables the sound of this class
+
+        Methods implemented by the renderers
+        ------------------------------------
+        set_color(color)
+            Changes the color drawn for this key
+
+        set_key_name(text)
+            Changes the name shown on this key
     """
-    def __init__(self, master, note, octave, color, rlx, rly, rlwidth, rlheight, id, parent = True, **kw):
-        super().__init__(master, rlx, rly, rlwidth, rlheight, parent = parent, background= color, command = lambda: self.play(), **kw)
+    def __init__(self, master, note, octave, color, id, audio):
+        self.master = master
         self.note = note
+        self.pitch = get_midi(note, octave)
         self.color = color
         self.id = id
+        self.default_id = id
         self.octave = octave
-        self.sounds = 'sounds'
-        self.__set_key_name()
-        mixer.init()
+        self.audio = audio
+        self.command = self.play
 
     def activate_test_mode(self):
-        self.gui.config(command=lambda: self.__trigger_show_answer())
+        self.set_command(lambda: self.master.answer(self))
 
     def get_path(self):
-        return f'{ROOT_DIR}/sounds/'
+        return self.audio.source.path
+
+    def get_pitch(self):
+        return self.pitch
+
+    def set_pitch(self, pitch, draw = True):
+        self.pitch = pitch
+        self.note, self.octave = get_note(pitch)
+        if draw:
+            self.set_key_name(get_name(pitch))
 
     def one_octave_up(self):
-        self.__change_octave(self.octave+1)
+        self.set_pitch(self.pitch + 12)
 
     def one_octave_down(self):
-        self.__change_octave(self.octave-1)
+        self.set_pitch(self.pitch - 12)
 
     def get_name(self):
-        return f"{self.note}{self.octave}"
-
-    def get_key(self):
-        return self.gui
+        return get_name(self.pitch)
 
     def get_color(self):
         return self.color
 
-    def log(self, message):
-        print(f"{message}: {datetime.now()}")
-
-    def play_and_show_answer(self, times: int):
-        s = TOTAL_WAITING * times
-        self.gui.after(s, self.__play_and_change_color_to_red)
-
     def change_color_to_red(self):
-        self.log("Changing color to red")
         self.master.disable_keyboard()
-        self.gui.config(bg ='red')
-        self.gui.after(TIME_FOR_SHOW_ANSWER - 500, self.__change_color_to_default)
+        self.set_color('red')
+        probe.mark('color')
+
+    def change_color_to_default(self):
+        self.set_color(self.color)
+        self.master.enable_keyboard()
 
     def play(self):
         self.__play(self.id)
 
-    def play_random(self):
+    def play_variant(self, id):
         if self.id != None:
-            self.__play(random.randint(0, SOUNDS_COUNT-1))
+            self.__play(id)
 
-    def show_key_name(self):
-        self.key_name.place()
+    def is_sound_enabled(self):
+        return self.id != None
 
-    def hide_key_name(self):
-        self.key_name.forget()
+    def press(self):
+        probe.begin()
+        self.command()
+
+    def set_command(self, command):
+        self.command = command
+
+    def reset(self):
+        self.set_command(self.play)
+        self.set_color(self.color)
+        self.enable_sound()
 
     def disable_sound(self):
         self.id = None
 
     def enable_sound(self):
-        self.sound_on = True
+        self.id = self.default_id
+
+    @abstractmethod
+    def set_color(self, color):
+        pass
+
+    @abstractmethod
+    def set_key_name(self, text):
+        pass
 
     def __lt__(self, other):
-        return self.get_name() < other.get_name()
+        return self.pitch < other.pitch
 
     def __gt__(self, other):
-        return self.get_name() > other.get_name()
+        return self.pitch > other.pitch
 
     def __play(self, id):
-        path = f"{ROOT_DIR}\\sounds\\{self.note}{self.octave}-id{id}.mp3"
-        mixer.music.load(path)
-        mixer.music.play()
+        self.audio.play(self.note, self.octave, id)
 
-    def __trigger_show_answer(self):
-        self.master.trigger()
 
-    def __play_and_change_color_to_red(self):
-        self.play_random()
-        self.gui.after(PRACTICE_GUESS_TIME, self.change_color_to_red)
+class PianoKey(BasePianoKey, GUIButton):
 
-    def __change_color_to_default(self):
-        self.log("Changing color to default")
-        self.gui.config(bg = self.color)
-        self.master.enable_keyboard()
+    """
+        Class used to represent a piano key drawn as a Tk button.
 
-    def __change_color(self, color):
+           @master : GUIPiece
+                the parent of the class
+           @note : str
+                the note of this key
+           @octave : int
+                the octave of this key
+           @rlx : double
+                the relx of this class
+           @rly : double
+                the rely of this class
+           @rlwidth : double
+                the relwidth of this class
+           @relheight : double
+                the relheight of this class
+           @id : int
+                 the id of the sound to be played
+           @audio : AudioDevice
+                 the audio device that plays the sounds of the piano
+           @parent : bool, optional
+                 if True, adapts the relative sizes according to master's relative sizes
+
+        Methods
+        -------
+        get_key()
+            Returns the gui piece of this key
+
+        show_key_name()
+            shows the name of the note
+
+        hide_key_name()
+            hides the name of the note
+
+        destroy()
+            destroys the button and the name label of this key
+
+        See BasePianoKey for the methods shared by every renderer.
+    """
+    def __init__(self, master, note, octave, color, rlx, rly, rlwidth, rlheight, id, audio, parent = True, **kw):
+        GUIButton.__init__(self, master, rlx, rly, rlwidth, rlheight, parent = parent, background= color, command = lambda: self.press(), **kw)
+        BasePianoKey.__init__(self, master, note, octave, color, id, audio)
+        self.__set_key_name()
+
+    def get_key(self):
+        return self.gui
+
+    def show_key_name(self):
+        self.key_name.place()
+
+    def hide_key_name(self):
+        self.key_name.forget()
+
+    def destroy(self):
+        self.key_name.destroy()
+        GUIButton.destroy(self)
+
+    def set_color(self, color):
         self.gui.config(bg = color)
 
+    def set_key_name(self, text):
+        self.key_name.gui.config(text = text)
+
     def __set_key_name(self):
         rely = 0.92
         width = .6
         relx = (1-width)/2
         self.key_name = GUILabel(self, rlx= relx, rly= rely, rlwidth= width, rlheight=1 - rely - 0.01, text=f"{self.get_name()}", initiate = False)
         self.key_name.gui.config(font='Helvetica 9 bold', foreground='red', background = self.color)
-
-    def __change_octave(self, octave):
-        self.octave = octave
-        self.key_name.gui.config(text = f'{self.get_name()}')
@@ -1,9 +1,9 @@
-from core.GUI.gui_configurations import TOP_MENU_BACKGROUND
-from core.GUI.gui_pieces import GUIPiece, GUITypes
+from core.GUI.gui_configurations import TOP_MENU_BACKGROUND, SUMMARY_FONT
+from core.GUI.gui_pieces import GUIPiece, GUITypes, GUILabel
 from core.GUI.piano.pian import Piano
 from core.GUI.top_menu.top_menu_pieces import StartingOctavePanel, SoundsPerSessionPanel, ThreeButtonsLabel
-from core.configurations import PIANO_RELX, PIANO_RELY, PIANO_RELWIDTH, PIANO_RELHEIGHT
-from definitions import ROOT_DIR
+from core.configurations import PIANO_RELX, PIANO_RELY, PIANO_RELWIDTH, PIANO_RELHEIGHT, TOPMENU_RELHEIGHT
+from core.settings import settings
 
 SPACING = 0.01
 RELY = 0.05
@@ -18,6 +18,14 @@ class TopMenu(GUIPiece):
 
            @master : tkinter
                the parent of the class
+           @audio : AudioDevice
+               the audio device used by the piano
+           @store : AttemptStore, optional
+               the store of the rounds played on the piano
+           @analytics : ConfusionMatrix, optional
+               the statistics of the answers. If given, a summary is shown after every game
+           @drill : str, optional
+               the path of the MIDI file played by the games of the piano, if any
            @rlx : double
                the relx of this class
            @rly : double
@@ -47,12 +55,23 @@ class TopMenu(GUIPiece):
         change_piano()
             creates a new piano that will replace the current piano on the GUI
 
+        reset_piano()
+            stops the game of the current piano and prepares it for the next game, without rebuilding it. Shows
+            the summary of the game, if it had answers
+
+        hide_summary()
+            hides the summary of the last game
+
         save_settings()
-            saves the game's current settings inside default_settings.py
+            saves the game's current settings. The file is written in the background
 """
-    def __init__(self, master, rlx, rly, rlwidth, rlheight, parent = False, **kw):
+    def __init__(self, master, audio, rlx, rly, rlwidth, rlheight, store = None, analytics = None, drill = None, parent = False, **kw):
         super().__init__(master, rlx, rly, rlwidth, rlheight, GUITypes.LABEL, parent, background = TOP_MENU_BACKGROUND, **kw)
-        self.piano = Piano(master, rlx=PIANO_RELX, rly=PIANO_RELY, rlwidth=PIANO_RELWIDTH, rlheight=PIANO_RELHEIGHT)
+        self.audio = audio
+        self.store = store
+        self.analytics = analytics
+        self.drill = drill
+        self.piano = Piano(master, rlx=PIANO_RELX, rly=PIANO_RELY, rlwidth=PIANO_RELWIDTH, rlheight=PIANO_RELHEIGHT, audio=audio, store=store, analytics=analytics, drill=drill)
         self.__initiate()
 
     def get_sounds_per_session(self):
@@ -72,22 +91,43 @@ class TopMenu(GUIPiece):
         self.three_buttons.enable_buttons()
 
     def change_piano(self):
-        self.piano.disable_sound()
-        self.piano.gui.destroy()
+        self.audio.stop_all()
+        self.piano.destroy()
         piano = Piano(self.master, rlx=PIANO_RELX, rly=PIANO_RELY, rlwidth=PIANO_RELWIDTH, rlheight=PIANO_RELHEIGHT,
-                      background="White", current_octave = self.starting_octave.get_value())
+                      background="White", current_octave = self.starting_octave.get_value(),
+                      audio=self.audio, store=self.store, analytics=self.analytics, drill=self.drill)
+        self.piano = piano
         self.starting_octave.change_piano(piano)
         self.sounds.change_piano(piano)
         self.three_buttons.change_piano(piano)
 
+    def reset_piano(self):
+        self.audio.stop_all()
+        self.__show_summary(self.piano.session)
+        self.piano.reset()
+        self.piano.set_current_octave(self.starting_octave.get_value())
+
+    def hide_summary(self):
+        self.summary.forget()
+
     def save_settings(self):
-        vars = ['STARTING_OCTAVE', 'SOUNDS_PER_SESSION', 'ONE_OCTAVE_ONLY', 'SHOW_KEYS']
-        vals = [self.starting_octave.input_with_buttons.get_value(), self.sounds.input_with_buttons.get_value(), self.starting_octave.is_checked(), self.sounds.is_checked()]
-        lines = [f"{vars[i]} = {vals[i]}\n" for i in range(len(vars))]
-        DEFAULT_SETTINGS = f'{ROOT_DIR}/core/default_settings.py'
-        with open(DEFAULT_SETTINGS, 'w') as f:
-            f.writelines(lines)
-            f.close()
+        settings.update({'STARTING_OCTAVE': self.starting_octave.get_value(), 'SOUNDS_PER_SESSION': self.sounds.get_value(),
+                         'ONE_OCTAVE_ONLY': self.starting_octave.is_checked(), 'SHOW_KEYS': self.sounds.is_checked()})
+
+    def __show_summary(self, session):
+        if self.analytics is None or session is None or not session.get_results()['answered']:
+            return
+        results = session.get_results()
+        summary = self.analytics.summary()
+        lines = [f"Game: {results['correct']}/{results['answered']} right, {results['mean_response'] / 1000:.1f} s per answer."
+                 f"   All games: {summary['accuracy']:.0%} of {summary['answers']} answers right."]
+        if summary['confusions']:
+            lines.append("Most confused: " + ", ".join(f"{note}{octave} as {answer}{answer_octave} ({times})"
+                                                       for note, octave, answer, answer_octave, times in summary['confusions']))
+        if summary['intervals']:
+            lines.append("Most frequent errors: " + ", ".join(f"{interval:+d} semitones ({times})" for interval, times in summary['intervals']))
+        self.summary.set_text("\n".join(lines))
+        self.summary.place()
 
     def __initiate(self):
         width_per_widget = (1 - 2 * PIANO_RELX - 2*SPACING)/3
@@ -100,6 +140,9 @@ class TopMenu(GUIPiece):
         new_relx += width_per_widget + SPACING
         self.__place_buttons(new_relx, width_per_widget)
 
+        self.summary = GUILabel(self.master, PIANO_RELX, TOPMENU_RELHEIGHT, PIANO_RELWIDTH, PIANO_RELY - TOPMENU_RELHEIGHT,
+                                parent = False, initiate = False, background = TOP_MENU_BACKGROUND, font = SUMMARY_FONT)
+
     def __place_sounds_per_session(self, relx, width):
         self.sounds = SoundsPerSessionPanel(self, piano = self.piano, rlx= relx, rly= RELY, rlwidth= width, rlheight= HEIGHT, parent = self, background='Grey')
 
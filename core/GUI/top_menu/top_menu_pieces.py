@@ -1,7 +1,7 @@
 from core.GUI.gui_configurations import THREE_BUTTONS_COLOR, THREE_BUTTONS_FONT, THREE_BUTTONS_TEXT_COLOR, create_args
 from core.GUI.gui_pieces import GUILabel, LabelWithCheckboxAndNumbersInput, GUIButton
 from core.configurations import SOUNDS_COUNT_MAXIMUM, SOUNDS_COUNT_MINIMUM
-from core.default_settings import SHOW_KEYS, ONE_OCTAVE_ONLY, SOUNDS_PER_SESSION, STARTING_OCTAVE
+from core.settings import settings
 
 
 class ThreeButtonsLabel(GUILabel):
@@ -76,7 +76,7 @@ class ThreeButtonsLabel(GUILabel):
         self.master.save_settings()
 
     def __stop_game(self):
-        self.master.change_piano()
+        self.master.reset_piano()
         self.master.enable_buttons()
         self.stop.forget()
         self.save_settings.place()
@@ -86,6 +86,7 @@ class ThreeButtonsLabel(GUILabel):
         self.piano.practice_mode(count, self.master.disable_buttons, one_octave_only)
 
     def __prepare_for_game(self):
+        self.master.hide_summary()
         self.save_settings.forget()
         self.stop.place()
 
@@ -111,11 +112,13 @@ class StartingOctavePanel(LabelWithCheckboxAndNumbersInput):
                 the relwidth of this class
             @relheight : double
                 the relheight of this class
-            @check_flag : bool
-                the default state of the check button
+            @check_flag : bool, optional
+                the default state of the check button. Defaults to the ONE_OCTAVE_ONLY setting
             @parent : bool, optional
                 if True, adapts the relative sizes according to master's relative sizes
 
+            The panel follows the STARTING_OCTAVE and ONE_OCTAVE_ONLY settings while the application runs.
+
             Methods
             -------
 
@@ -127,20 +130,30 @@ class StartingOctavePanel(LabelWithCheckboxAndNumbersInput):
 
     """
 
-    def __init__(self, master, piano, rlx, rly, rlwidth, rlheight, check_flag = ONE_OCTAVE_ONLY, parent = True, initiate = True, **kw):
+    def __init__(self, master, piano, rlx, rly, rlwidth, rlheight, check_flag = None, parent = True, initiate = True, **kw):
+        check_flag = settings.get('ONE_OCTAVE_ONLY') if check_flag is None else check_flag
         super().__init__(master, rlx, rly, rlwidth, rlheight, check_flag = check_flag, label_text='Starting octave:',
-                         checkbox_text="One octave only", parent = parent, current_value = STARTING_OCTAVE, initiate = initiate, min_method = lambda: piano.one_octave_down(),
+                         checkbox_text="One octave only", parent = parent, current_value = settings.get('STARTING_OCTAVE'), initiate = initiate, min_method = lambda: piano.one_octave_down(),
                          max_method=lambda: piano.one_octave_up(), **kw)
+        self.piano = piano
         if piano.current_octave != self.get_value():
             piano.set_current_octave(self.get_value())
+        settings.subscribe('STARTING_OCTAVE', self.__change_starting_octave)
+        settings.subscribe('ONE_OCTAVE_ONLY', self.set_checked)
 
     def change_piano(self, piano):
+        self.piano = piano
         self.set_max_method(lambda: piano.one_octave_up())
-        self.set_max_method(lambda: piano.one_octave_down())
+        self.set_min_method(lambda: piano.one_octave_down())
 
     def get_one_octave_only(self):
         return self.is_checked()
 
+    def __change_starting_octave(self, octave):
+        self.set_value(octave)
+        if self.piano.current_octave != self.get_value():
+            self.piano.set_current_octave(self.get_value())
+
 
 class SoundsPerSessionPanel(LabelWithCheckboxAndNumbersInput):
     """
@@ -156,11 +169,13 @@ class SoundsPerSessionPanel(LabelWithCheckboxAndNumbersInput):
                 the relwidth of this class
             @relheight : double
                 the relheight of this class
-            @check_flag : bool
-                the default state of the check button
+            @check_flag : bool, optional
+                the default state of the check button. Defaults to the SHOW_KEYS setting
             @parent : bool, optional
                 if True, adapts the relative sizes according to master's relative sizes
 
+            The panel follows the SOUNDS_PER_SESSION and SHOW_KEYS settings while the application runs.
+
             Methods
             -------
 
@@ -175,13 +190,17 @@ class SoundsPerSessionPanel(LabelWithCheckboxAndNumbersInput):
                 :returns: the checkbutton state of this class
 
     """
-    def __init__(self, master, piano, rlx, rly, rlwidth, rlheight, check_flag = SHOW_KEYS, parent = True, initiate = True, **kw):
+    def __init__(self, master, piano, rlx, rly, rlwidth, rlheight, check_flag = None, parent = True, initiate = True, **kw):
+        check_flag = settings.get('SHOW_KEYS') if check_flag is None else check_flag
         super().__init__(master, rlx, rly, rlwidth, rlheight, label_text ="Sounds per session:",
                          check_flag = check_flag, checkbox_text="Show keys", parent = parent, min_value=SOUNDS_COUNT_MINIMUM,
-                         max_value=SOUNDS_COUNT_MAXIMUM, current_value = SOUNDS_PER_SESSION, initiate = initiate, **kw)
+                         max_value=SOUNDS_COUNT_MAXIMUM, current_value = settings.get('SOUNDS_PER_SESSION'), initiate = initiate, **kw)
         self.change_piano(piano)
+        settings.subscribe('SOUNDS_PER_SESSION', self.set_value)
+        settings.subscribe('SHOW_KEYS', self.__change_show_keys)
 
     def change_piano(self, piano):
+        self.piano = piano
         piano.switch_key_names_visibility(self.is_checked())
         self.checkbox_with_label.check_button.configure(command = lambda: piano.switch_key_names_visibility(self.is_checked()))
 
@@ -189,4 +208,8 @@ class SoundsPerSessionPanel(LabelWithCheckboxAndNumbersInput):
         return self.input_with_buttons.get_value()
 
     def get_show_keys(self):
-        return self.is_checked()
\ No newline at end of file
+        return self.is_checked()
+
+    def __change_show_keys(self, flag):
+        self.set_checked(flag)
+        self.piano.switch_key_names_visibility(self.is_checked())
\ No newline at end of file
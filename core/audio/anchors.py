@@ -0,0 +1,177 @@
+import argparse
+import os
+import threading
+from functools import lru_cache
+import numpy as np
+from pygame import mixer
+from core.audio.pcm import to_sound, from_sound
+from core.pitch import get_anchor, get_midi, get_frequency
+from core.configurations import ANCHOR_INTERVAL, ANCHOR_MEASURE_PITCH, NOTES, MIXER_FREQUENCY, MIXER_SIZE, \
+    MIXER_CHANNELS, MIXER_BUFFER
+
+
+def resample(samples, semitones):
+    """
+        Returns the samples played faster or slower, so their pitch moves by the given number of semitones. The
+        samples between two input samples are linearly interpolated, for every channel at once.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            one row per sample and one column per channel
+        semitones : float
+    """
+    ratio = 2 ** (semitones / 12)
+    positions = np.arange(int((len(samples) - 1) / ratio) + 1) * ratio
+    indexes = positions.astype(np.intp)
+    fractions = (positions - indexes)[:, np.newaxis]
+    following = np.minimum(indexes + 1, len(samples) - 1)
+    return samples[indexes] * (1 - fractions) + samples[following] * fractions
+
+
+def estimate_frequency(samples, frequency, expected):
+    """
+        Returns the frequency of the strongest peak of the spectrum within a semitone of the expected frequency.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            one row per sample and one column per channel
+        frequency : int
+            the sample rate
+        expected : float
+            the frequency of the note in Hz
+    """
+    mono = samples.mean(axis = 1) * np.hanning(len(samples))
+    size = 1 << int(np.ceil(np.log2(len(mono) * 4)))
+    spectrum = np.log(np.abs(np.fft.rfft(mono, size)) + 1e-12)
+    resolution = frequency / size
+    low = max(1, int(expected * 2 ** (-1 / 12) / resolution))
+    high = min(len(spectrum) - 2, int(expected * 2 ** (1 / 12) / resolution) + 1)
+    peak = low + int(np.argmax(spectrum[low:high + 1]))
+    left, middle, right = spectrum[peak - 1:peak + 2]
+    curvature = left - 2 * middle + right
+    shift = 0.5 * (left - right) / curvature if curvature else 0
+    return (peak + shift) * resolution
+
+
+def get_cents(frequency, expected):
+    """
+        :returns: the distance in cents from the expected frequency to the frequency
+    """
+    return 1200 * np.log2(frequency / expected)
+
+
+class AnchorSource:
+    """
+        Class used to read only the anchor sounds of a source, one every ANCHOR_INTERVAL semitones, and to make the
+        other notes by resampling the nearest anchor. The decoded anchors of the whole piano are kept in memory, as
+        float32, so the notes made from the same anchor decode it once, even after moving to other octaves. The
+        pitch error of every resampled note can be measured.
+
+           @source : DirectorySource, PackSource or CachedSource
+                the source of the anchor sounds
+
+           @interval : int, optional
+                the number of semitones between two anchors
+
+           @measure : bool, optional
+                if True, the pitch error of every resampled note is measured
+
+        Methods
+        -------
+        load(note, octave, id)
+            Returns the given sound as a mixer.Sound, read from the source or resampled from its anchor
+
+        get_pitch_errors()
+            Returns a dictionary that maps the (note, octave, id) of every resampled note to its pitch error in cents,
+            compared with equal temperament
+
+        get_anchor_errors()
+            Returns a dictionary that maps the (note, octave, id) of every anchor used to its pitch error in cents
+    """
+    def __init__(self, source, interval = ANCHOR_INTERVAL, measure = ANCHOR_MEASURE_PITCH):
+        self.source = source
+        self.interval = interval
+        self.measure = measure
+        self.path = source.path
+        self.lock = threading.Lock()
+        self.pitch_errors = {}
+        self.anchor_errors = {}
+        self.get_anchor_samples = lru_cache(maxsize = None)(self.get_anchor_samples) #ONE ENTRY PER ANCHOR AND ID
+
+    def load(self, note, octave, id):
+        anchor = get_anchor(note, octave, self.interval)
+        if anchor == (note, octave):
+            return self.source.load(note, octave, id)
+        semitones = get_midi(note, octave) - get_midi(*anchor)
+        samples = resample(self.get_anchor_samples(*anchor, id), semitones)
+        if self.measure:
+            self.__measure(note, octave, id, samples, anchor)
+        return to_sound(samples)
+
+    def get_anchor_samples(self, note, octave, id):
+        samples = from_sound(self.source.load(note, octave, id)).astype(np.float32)
+        samples.flags.writeable = False
+        return samples
+
+    def get_pitch_errors(self):
+        with self.lock:
+            return dict(self.pitch_errors)
+
+    def get_anchor_errors(self):
+        with self.lock:
+            return dict(self.anchor_errors)
+
+    def __measure(self, note, octave, id, samples, anchor):
+        frequency = mixer.get_init()[0]
+        error = get_cents(estimate_frequency(samples, frequency, get_frequency(note, octave)), get_frequency(note, octave))
+        anchor_error = self.anchor_errors.get((*anchor, id))
+        if anchor_error is None:
+            expected = get_frequency(*anchor)
+            anchor_error = get_cents(estimate_frequency(self.get_anchor_samples(*anchor, id), frequency, expected), expected)
+        with self.lock:
+            self.pitch_errors[(note, octave, id)] = error
+            self.anchor_errors[(*anchor, id)] = anchor_error
+
+
+def report(octaves = range(1, 9)):
+    """
+        Resamples every note of the given octaves from the configured sample source and prints the mean pitch error
+        of each note, next to the mean pitch error of its anchor.
+
+        Parameters
+        ----------
+        octaves : iterable, optional
+    """
+    from core.audio.library import create_library
+    from core.audio.sources import create_source
+    mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+    source = create_source(anchors = False)
+    anchors = AnchorSource(source, measure = True)
+    library = create_library(anchors = True)
+    for octave in octaves:
+        for note in NOTES:
+            for id in library.get_ids(note, octave):
+                anchors.load(note, octave, id)
+    errors = anchors.get_pitch_errors()
+    anchor_errors = anchors.get_anchor_errors()
+    print(f"{'note':<8}{'anchor':<8}{'error':>10}{'anchor error':>14}{'worst':>10}  (cents)")
+    for octave in octaves:
+        for note in NOTES:
+            values = [errors[(note, octave, id)] for id in library.get_ids(note, octave) if (note, octave, id) in errors]
+            if not values:
+                continue
+            anchor = get_anchor(note, octave)
+            baseline = [anchor_errors[(*anchor, id)] for id in library.get_ids(*anchor) if (*anchor, id) in anchor_errors]
+            print(f"{note + str(octave):<8}{anchor[0] + str(anchor[1]):<8}{np.mean(values):>10.1f}"
+                  f"{np.mean(baseline):>14.1f}{max(values, key = abs):>10.1f}")
+    mixer.quit()
+
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    parser = argparse.ArgumentParser(description = 'Reports the pitch error of the notes resampled from the anchor sounds.')
+    parser.add_argument('--octaves', type = int, nargs = '+', default = list(range(1, 9)), help = 'the octaves to report')
+    args = parser.parse_args()
+    report(args.octaves)
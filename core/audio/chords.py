@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from pygame import mixer
+from core.audio.pcm import from_sound, to_sound
+from core.configurations import CHORD_CACHE_SIZE, CHORD_HEADROOM
+
+
+class ChordMixer:
+    """
+        Class used to mix the sounds of several notes into one mixer.Sound, so the notes of a chord start on the
+        same sample instead of being started one by one from Python on several channels. The notes of a melodic
+        interval are mixed with a delay between them. The mixed sounds are kept by their signature, the sounds and
+        the delay, and the least recently used ones are dropped when there are more than the given number.
+
+           @sample_bank : SampleBank
+                the decoded sounds of the notes
+
+           @size : int, optional
+                the number of mixed sounds that are kept
+
+        Methods
+        -------
+        get(sounds, delay)
+            Returns the mixed sound of the given (note, octave, id) sounds, each one starting delay ms after the
+            previous one
+
+        get_size()
+            Returns the number of mixed sounds that are kept
+    """
+    def __init__(self, sample_bank, size = CHORD_CACHE_SIZE):
+        self.sample_bank = sample_bank
+        self.size = size
+        self.sounds = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, sounds, delay = 0):
+        key = (tuple(sounds), delay)
+        with self.lock:
+            sound = self.sounds.get(key)
+            if sound is not None:
+                self.sounds.move_to_end(key)
+                return sound
+        sound = self.__mix(key[0], delay)
+        with self.lock:
+            self.sounds[key] = sound
+            while len(self.sounds) > self.size:
+                self.sounds.popitem(last = False)
+        return sound
+
+    def get_size(self):
+        return len(self.sounds)
+
+    def __mix(self, sounds, delay):
+        step = int(mixer.get_init()[0] * delay / 1000)
+        samples = [from_sound(self.sample_bank.get(*sound)) for sound in sounds]
+        length = max(index * step + len(data) for index, data in enumerate(samples))
+        mix = np.zeros((length, samples[0].shape[1]))
+        for index, data in enumerate(samples):
+            mix[index * step:index * step + len(data)] += data
+        peak = np.abs(mix).max()
+        if peak > CHORD_HEADROOM:
+            mix *= CHORD_HEADROOM / peak
+        return to_sound(mix)
@@ -0,0 +1,129 @@
+from pygame import mixer
+from core.audio.engine import AudioEngine
+from core.audio.library import create_library
+from core.audio.pcm_cache import CachedSource
+from core.audio.prefetcher import SamplePrefetcher
+from core.audio.sample_bank import SampleBank
+from core.audio.sources import create_source
+from core.instrumentation import probe
+from core.configurations import MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER
+
+
+class AudioDevice:
+    """
+        Class used to represent the audio output of the application. The mixer is initialised once when the device
+        is opened and released when it is closed. The device owns the sample bank, the chord mixer, the prefetcher
+        and the engine, and the piano keys play their sounds through it.
+
+           @frequency : int, optional
+                the sample rate of the mixer
+
+           @size : int, optional
+                the number of bits of each sample. Negative values are signed samples
+
+           @channels : int, optional
+                the number of output channels
+
+           @buffer : int, optional
+                the number of samples of the mixer buffer. Smaller buffers lower the latency
+
+           @source : DirectorySource, PackSource, SynthSource or CachedSource, optional
+                the source of the sounds. Defaults to the source selected by SAMPLE_SOURCE
+
+           @library : SampleLibrary, optional
+                the sounds of the source. Defaults to the library of the source selected by SAMPLE_SOURCE
+
+        Methods
+        -------
+        open()
+            Initialises the mixer, reads the library and creates the sample bank, the chord mixer, the prefetcher and
+            the engine
+
+        close()
+            Stops the prefetcher, saves the fingerprints of the PCM cache and releases the mixer
+
+        is_open()
+            Returns True if the device was opened and not closed
+
+        play(note, octave, id)
+            Plays the given sound and returns its channel. If the sound does not exist, another variant of the
+            note is played, and nothing is played if the note has no sound
+
+        play_chord(sounds, delay)
+            Plays the given (note, octave, id) sounds mixed into one sound, each one starting delay ms after the
+            previous one, and returns its channel
+
+        request_octaves(octaves)
+            Decodes the sounds of the given octaves in the background
+
+        stop_all()
+            Fades out every sound that is playing
+    """
+    def __init__(self, frequency = MIXER_FREQUENCY, size = MIXER_SIZE, channels = MIXER_CHANNELS, buffer = MIXER_BUFFER, source = None, library = None):
+        self.frequency = frequency
+        self.size = size
+        self.channels = channels
+        self.buffer = buffer
+        self.source = source
+        self.library = library
+        self.sample_bank = None
+        self.chords = None
+        self.prefetcher = None
+        self.engine = None
+
+    def open(self):
+        if self.is_open():
+            return
+        mixer.pre_init(self.frequency, self.size, self.channels, self.buffer)
+        mixer.init(self.frequency, self.size, self.channels, self.buffer)
+        if self.source is None:
+            self.source = create_source()
+        if self.library is None:
+            self.library = create_library()
+        self.sample_bank = SampleBank(self.source, library = self.library)
+        from core.audio.chords import ChordMixer #IMPORTED HERE SO IMPORTING THE DEVICE DOES NOT NEED NUMPY
+        self.chords = ChordMixer(self.sample_bank)
+        self.prefetcher = SamplePrefetcher(self.sample_bank)
+        self.engine = AudioEngine()
+
+    def close(self):
+        if not self.is_open():
+            return
+        self.prefetcher.stop()
+        source = self.source
+        while source is not None: #THE CACHE MAY BE WRAPPED BY THE ANCHORS AND THE PREPROCESSING
+            if isinstance(source, CachedSource):
+                source.flush()
+            source = getattr(source, 'source', None)
+        mixer.quit()
+        self.engine = None
+
+    def is_open(self):
+        return self.engine is not None
+
+    def play(self, note, octave, id):
+        id = self.library.get_variant(note, octave, id)
+        if id is None:
+            return None
+        sound = self.sample_bank.get(note, octave, id)
+        probe.mark('lookup')
+        channel = self.engine.play(sound)
+        probe.mark('play')
+        return channel
+
+    def play_chord(self, sounds, delay = 0):
+        sounds = [(note, octave, self.library.get_variant(note, octave, id)) for note, octave, id in sounds]
+        sounds = [sound for sound in sounds if sound[2] is not None]
+        if not sounds:
+            return None
+        sound = self.chords.get(sounds, delay)
+        probe.mark('lookup')
+        channel = self.engine.play(sound)
+        probe.mark('play')
+        return channel
+
+    def request_octaves(self, octaves):
+        self.prefetcher.request(octaves)
+
+    def stop_all(self):
+        self.engine.stop_all()
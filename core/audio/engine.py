@@ -0,0 +1,65 @@
+from collections import deque
+from pygame import mixer
+from core.configurations import VOICES, FADEOUT_TIME
+
+
+class AudioEngine:
+    """
+        Class used to play several sounds at the same time. The engine owns the mixer channels and gives each new
+        sound the free channel that was used the longest time ago. One channel more than the number of voices is
+        allocated: only when a sound takes the last free channel does the oldest voice start fading out, so it is
+        free by the time it is stolen and no note is cut off abruptly. Voices are never faded while a channel is
+        free.
+
+           @voices : int, optional
+                the number of sounds that can be heard at the same time
+
+           @fadeout : int, optional
+                the number of ms used to fade out a sound when it is stopped or stolen
+
+        Methods
+        -------
+        play(sound)
+            Plays the sound on a free voice, or on the oldest one if every voice is busy, and returns its channel
+
+        stop(channel)
+            Fades out the sound played on the given channel
+
+        stop_all()
+            Fades out every sound that is playing
+
+        get_busy_voices()
+            Returns the number of voices that are playing a sound
+    """
+    def __init__(self, voices = VOICES, fadeout = FADEOUT_TIME):
+        assert voices > 0
+        assert mixer.get_init() is not None, "The mixer must be initialised by the AudioDevice."
+        mixer.set_num_channels(voices + 1)
+        self.voices = voices
+        self.fadeout = fadeout
+        self.channels = [mixer.Channel(i) for i in range(voices + 1)]
+        self.order = deque(range(voices + 1)) #FROM THE LEAST TO THE MOST RECENTLY STARTED CHANNEL
+
+    def play(self, sound):
+        if mixer.find_channel() is None:
+            index = self.order[0]
+        else:
+            index = next(index for index in self.order if not self.channels[index].get_busy())
+        self.order.remove(index)
+        self.order.append(index)
+        channel = self.channels[index]
+        channel.play(sound)
+        if mixer.find_channel() is None:
+            self.channels[self.order[0]].fadeout(self.fadeout)
+        return channel
+
+    def stop(self, channel):
+        channel.fadeout(self.fadeout)
+
+    def stop_all(self):
+        for channel in self.channels:
+            if channel.get_busy():
+                channel.fadeout(self.fadeout)
+
+    def get_busy_voices(self):
+        return sum(1 for channel in self.channels if channel.get_busy())
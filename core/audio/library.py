@@ -0,0 +1,256 @@
+import argparse
+import json
+import os
+import struct
+from functools import lru_cache
+from core.audio.sample_pack import SOUND_FILE
+from core.pitch import get_anchor
+from core.configurations import SAMPLE_SOURCE, ANCHOR_SAMPLES_ENABLED, ANCHOR_INTERVAL, SOUNDS_COUNT, SYNTH_DURATION, NOTES
+from definitions import SOUNDS_DIR, SAMPLE_PACK_PATH, LIBRARY_CACHE_PATH
+
+MPEG1_BITRATES = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320] #KBPS, LAYER III
+MPEG2_BITRATES = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+SAMPLE_RATES = [44100, 48000, 32000]
+HEADER_SIZE = 4096 #BYTES READ TO FIND THE FIRST FRAME
+
+
+def get_tag_size(data):
+    """
+        Returns the size of the ID3v2 tag that starts the given first 10 bytes of an MP3 file, 0 if there is none.
+    """
+    if data[:3] != b'ID3' or len(data) < 10:
+        return 0
+    return 10 + ((data[6] & 0x7f) << 21 | (data[7] & 0x7f) << 14 | (data[8] & 0x7f) << 7 | data[9] & 0x7f)
+
+
+def get_mp3_duration(data, size, start = 0):
+    """
+        Returns the duration in seconds of an MP3 file from the bytes that follow its ID3v2 tag, without decoding
+        it: from the frame count of the Xing, Info or VBRI header when there is one, from the bitrate of the first
+        frame otherwise, without the encoder delay and padding when the encoder wrote them. Returns 0 if no frame
+        is found.
+
+        Parameters
+        ----------
+        data : bytes
+            the bytes of the file that follow the ID3v2 tag
+        size : int
+            the size of the file
+        start : int, optional
+            the position of data in the file
+    """
+    for offset in range(len(data) - 4):
+        if data[offset] != 0xff or data[offset + 1] & 0xe0 != 0xe0:
+            continue
+        header = struct.unpack('>I', data[offset:offset + 4])[0]
+        version, layer = header >> 19 & 3, header >> 17 & 3
+        bitrate, rate, mode = header >> 12 & 15, header >> 10 & 3, header >> 6 & 3
+        if version == 1 or layer != 1 or bitrate in (0, 15) or rate == 3:
+            continue
+        mpeg1 = version == 3
+        frequency = SAMPLE_RATES[rate] >> (0 if mpeg1 else 1 if version == 2 else 2)
+        samples = 1152 if mpeg1 else 576
+        side = (32 if mode != 3 else 17) if mpeg1 else (17 if mode != 3 else 9)
+        for position, tag in ((offset + 4 + side, b'Xing'), (offset + 4 + side, b'Info'), (offset + 36, b'VBRI')):
+            if data[position:position + 4] != tag:
+                continue
+            if tag == b'VBRI':
+                return struct.unpack('>I', data[position + 14:position + 18])[0] * samples / frequency
+            if data[position + 7] & 1:
+                frames = struct.unpack('>I', data[position + 8:position + 12])[0] * samples
+                if data[position + 7] == 15 and len(data) >= position + 144: #THE ENCODER DELAY AND PADDING OF THE LAME TAG
+                    gap = int.from_bytes(data[position + 141:position + 144], 'big')
+                    frames -= (gap >> 12) + (gap & 0xfff)
+                return frames / frequency
+        kbps = (MPEG1_BITRATES if mpeg1 else MPEG2_BITRATES)[bitrate]
+        return (size - start - offset) * 8 / (kbps * 1000)
+    return 0
+
+
+class SampleLibrary:
+    """
+        Class used to describe the sounds that can be played: the ids of the variants of every note, with the size
+        of their file and their duration. The notes may have different numbers of variants, and a note may have
+        none. Everything is kept in memory, so asking for the variants of a note never touches the disk.
+
+           @sounds : iterable
+                the (note, octave, id, size, duration) of every sound
+
+        Methods
+        -------
+        get_ids(note, octave)
+            Returns the sorted tuple of the ids of the given note, empty if the note has no sound
+
+        get_all_ids()
+            Returns the sorted tuple of the ids of at least one note
+
+        has(note, octave, id)
+            Returns True if the given sound exists
+
+        get_variant(note, octave, id)
+            Returns the given id if the sound exists, else one of the ids of the note, or None if the note has no
+            sound
+
+        get_size(note, octave, id)
+            Returns the size in bytes of the file of the given sound
+
+        get_duration(note, octave, id)
+            Returns the duration in seconds of the given sound
+
+        get_count()
+            Returns the number of sounds
+
+        get_sounds()
+            Returns the (note, octave, id, size, duration) of every sound
+
+        with_anchors(interval)
+            Returns a library where every note has the variants of its anchor
+    """
+    def __init__(self, sounds):
+        self.sounds = {(note, octave, id): (size, duration) for note, octave, id, size, duration in sounds}
+        ids = {}
+        for note, octave, id in self.sounds:
+            ids.setdefault((note, octave), []).append(id)
+        self.ids = {pitch: tuple(sorted(variants)) for pitch, variants in ids.items()}
+        self.all_ids = tuple(sorted({id for note, octave, id in self.sounds}))
+
+    def get_ids(self, note, octave):
+        return self.ids.get((note, octave), ())
+
+    def get_all_ids(self):
+        return self.all_ids
+
+    def has(self, note, octave, id):
+        return (note, octave, id) in self.sounds
+
+    def get_variant(self, note, octave, id):
+        if (note, octave, id) in self.sounds:
+            return id
+        ids = self.ids.get((note, octave))
+        return ids[id % len(ids)] if ids else None
+
+    def get_size(self, note, octave, id):
+        return self.sounds[(note, octave, id)][0]
+
+    def get_duration(self, note, octave, id):
+        return self.sounds[(note, octave, id)][1]
+
+    def get_count(self):
+        return len(self.sounds)
+
+    def get_sounds(self):
+        return [(*key, *value) for key, value in self.sounds.items()]
+
+    def with_anchors(self, interval = ANCHOR_INTERVAL):
+        sounds = []
+        for octave in range(1, 9):
+            for note in NOTES:
+                anchor = get_anchor(note, octave, interval)
+                sounds.extend((note, octave, id, *self.sounds[(*anchor, id)]) for id in self.get_ids(*anchor))
+        return SampleLibrary(sounds)
+
+
+def scan_directory(path = SOUNDS_DIR):
+    """
+        Returns the SampleLibrary of the sound files of the given directory, read in one pass.
+    """
+    sounds = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            match = SOUND_FILE.match(entry.name)
+            if not match:
+                continue
+            size = entry.stat().st_size
+            with open(entry.path, 'rb') as f:
+                start = get_tag_size(f.read(10))
+                f.seek(start)
+                data = f.read(HEADER_SIZE)
+            sounds.append((match.group(1), int(match.group(2)), int(match.group(3)), size, get_mp3_duration(data, size, start)))
+    return SampleLibrary(sounds)
+
+
+def load_directory(path = SOUNDS_DIR, cache = LIBRARY_CACHE_PATH):
+    """
+        Returns the SampleLibrary of the given directory. The library is saved to the cache file with the
+        modification time of the directory, which changes when a file is added, removed or renamed, so the directory
+        is scanned again only then.
+
+        Parameters
+        ----------
+        path : str, optional
+        cache : str, optional
+            the file where the library is saved
+    """
+    mtime = os.stat(path).st_mtime_ns
+    try:
+        with open(cache) as f:
+            saved = json.load(f)
+        if saved['path'] == path and saved['mtime'] == mtime:
+            return SampleLibrary(map(tuple, saved['sounds']))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    library = scan_directory(path)
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok = True)
+        temporary = f"{cache}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump({'path': path, 'mtime': mtime, 'sounds': library.get_sounds()}, f)
+        os.replace(temporary, cache)
+    except OSError:
+        pass
+    return library
+
+
+def load_pack(path = SAMPLE_PACK_PATH):
+    """
+        Returns the SampleLibrary of the sounds of the given sample pack.
+    """
+    from core.audio.sample_pack import SamplePack
+    pack = SamplePack(path)
+    sounds = []
+    try:
+        for note, octave, id in pack.get_keys():
+            with pack.get_buffer(note, octave, id) as buffer: #THE MAPPING CANNOT BE CLOSED WHILE A VIEW OF IT EXISTS
+                size = len(buffer)
+                start = get_tag_size(bytes(buffer[:10]))
+                data = bytes(buffer[start:start + HEADER_SIZE])
+            sounds.append((note, octave, id, size, get_mp3_duration(data, size, start)))
+    finally:
+        pack.close()
+    return SampleLibrary(sounds)
+
+
+@lru_cache(maxsize = None)
+def create_library(name = SAMPLE_SOURCE, anchors = ANCHOR_SAMPLES_ENABLED):
+    """
+        Returns the SampleLibrary of the sample source with the given name: 'directory', 'pack' or 'synth'. The
+        library is read once per process.
+
+        Parameters
+        ----------
+        name : str, optional
+        anchors : bool, optional
+            if True, every note has the variants of its anchor, the sounds it is resampled from
+    """
+    if name == 'synth':
+        return SampleLibrary((note, octave, id, 0, SYNTH_DURATION) for octave in range(1, 9) for note in NOTES
+                             for id in range(SOUNDS_COUNT))
+    if name == 'directory':
+        library = load_directory()
+    elif name == 'pack':
+        library = load_pack()
+    else:
+        raise AttributeError("Please select a sample source: 'directory', 'pack' or 'synth'.")
+    return library.with_anchors() if anchors else library
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Prints the sounds of the sample library.')
+    parser.add_argument('--source', default = SAMPLE_SOURCE, choices = ['directory', 'pack', 'synth'])
+    args = parser.parse_args()
+    library = create_library(args.source)
+    sounds = library.get_sounds()
+    print(f"{library.get_count()} sounds, {sum(sound[3] for sound in sounds)} bytes, "
+          f"{sum(sound[4] for sound in sounds):.1f} seconds")
+    for octave in range(1, 9):
+        print(f"Octave {octave}: " + ' '.join(f"{note}:{len(library.get_ids(note, octave))}" for note in NOTES))
@@ -0,0 +1,48 @@
+import numpy as np
+from pygame import mixer
+
+FORMATS = {8: np.uint8, -8: np.int8, 16: np.uint16, -16: np.int16, 32: np.float32}
+
+
+def to_sound(samples):
+    """
+        Converts samples into a mixer.Sound in the format of the mixer.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            float samples between -1 and 1, with one column per channel or one dimension for mono sounds
+    """
+    frequency, size, channels = mixer.get_init()
+    samples = np.clip(samples, -1, 1)
+    if samples.ndim == 1:
+        samples = samples[:, np.newaxis]
+    if samples.shape[1] != channels:
+        samples = np.repeat(samples[:, :1], channels, axis = 1)
+    dtype = np.dtype(FORMATS[size])
+    if dtype.kind == 'f':
+        data = samples.astype(dtype)
+    else:
+        info = np.iinfo(dtype)
+        middle = (int(info.max) + int(info.min) + 1) / 2
+        data = np.round(samples * (info.max - middle) + middle).astype(dtype)
+    return mixer.Sound(buffer = np.ascontiguousarray(data).tobytes())
+
+
+def from_sound(sound):
+    """
+        Converts a mixer.Sound in the format of the mixer into float samples between -1 and 1, with one column per
+        channel.
+
+        Parameters
+        ----------
+        sound : mixer.Sound
+    """
+    frequency, size, channels = mixer.get_init()
+    dtype = np.dtype(FORMATS[size])
+    data = np.frombuffer(sound.get_raw(), dtype = dtype).reshape(-1, channels)
+    if dtype.kind == 'f':
+        return data.astype(np.float64)
+    info = np.iinfo(dtype)
+    middle = (int(info.max) + int(info.min) + 1) / 2
+    return (data.astype(np.float64) - middle) / (info.max - middle)
@@ -0,0 +1,277 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+from core.configurations import PCM_CACHE_MAX_SIZE, PCM_CACHE_SAVE_DELAY, NOTES, MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER
+from definitions import PCM_CACHE_DIR
+
+EXTENSION = '.pcm'
+FINGERPRINTS = 'fingerprints.json'
+
+
+class FingerprintIndex:
+    """
+        Class used to remember the hash of the content of the sound files. A file is hashed again only when its size
+        or modification time changed, so the cache does not read every sound file on every launch.
+
+           @path : str
+                the file where the index is saved
+
+        Methods
+        -------
+        get_file(path)
+            Returns the hash of the content of the given file
+
+        get_buffer(buffer)
+            Returns the hash of the given bytes
+
+        save()
+            Writes the index to its file, if it changed
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.changed = False
+        try:
+            with open(path) as f:
+                self.files = json.load(f)
+        except (OSError, ValueError):
+            self.files = {}
+
+    def get_file(self, path):
+        stat = os.stat(path)
+        with self.lock:
+            known = self.files.get(path)
+        if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        with open(path, 'rb') as f:
+            fingerprint = self.get_buffer(f.read())
+        with self.lock:
+            self.files[path] = [stat.st_size, stat.st_mtime_ns, fingerprint]
+            self.changed = True
+        return fingerprint
+
+    def get_buffer(self, buffer):
+        return hashlib.sha1(buffer).hexdigest()
+
+    def save(self):
+        with self.lock:
+            if not self.changed:
+                return
+            temporary = f"{self.path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temporary, 'w') as f:
+                    json.dump(self.files, f)
+                os.replace(temporary, self.path)
+                self.changed = False
+            except OSError:
+                pass
+
+
+class PCMCache:
+    """
+        Class used to keep decoded sounds on disk, so a sound file is decoded once per machine instead of once per
+        launch. An entry is keyed by a hash of the content of its sound file and by the format of the mixer, so it
+        is invalidated when the file changes or when the mixer format changes. When the entries use more than the
+        maximum size, the least recently read entries are deleted. The fingerprints are saved once the cache has
+        been idle for a moment, on a timer thread, so filling the cache writes the index once instead of once per
+        sound. The timer is a daemon, so it never keeps the application alive: flush() saves the index at once and
+        the audio device calls it when it is closed.
+
+           @path : str, optional
+                the directory of the cache
+
+           @max_size : int, optional
+                the number of bytes the entries may use
+
+           @delay : float, optional
+                the seconds between the last write and the save of the fingerprints
+
+        Methods
+        -------
+        fingerprints : FingerprintIndex
+            the hashes of the sound files
+
+        get_key(fingerprint, format)
+            Returns the key of a sound, given the hash of its file and the (frequency, size, channels) of the mixer
+
+        read(key)
+            Returns the decoded samples of the given key, or None if they are not cached
+
+        write(key, data)
+            Stores the decoded samples of the given key
+
+        flush()
+            Saves the fingerprints now
+
+        get_size()
+            Returns the number of bytes used by the entries
+
+        clear()
+            Deletes every entry
+    """
+    def __init__(self, path = PCM_CACHE_DIR, max_size = PCM_CACHE_MAX_SIZE, delay = PCM_CACHE_SAVE_DELAY):
+        self.path = path
+        self.max_size = max_size
+        self.delay = delay
+        self.timer = None
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok = True)
+        self.fingerprints = FingerprintIndex(os.path.join(path, FINGERPRINTS))
+        self.size = sum(entry.stat().st_size for entry in self.__get_entries())
+
+    def get_key(self, fingerprint, format):
+        frequency, size, channels = format
+        return f"{fingerprint}-{frequency}-{size}-{channels}"
+
+    def read(self, key):
+        path = self.__get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def write(self, key, data):
+        path = self.__get_path(key)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            return
+        with self.lock:
+            self.size += len(data)
+            if self.size > self.max_size:
+                self.__evict()
+            self.__schedule_save()
+
+    def flush(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        self.fingerprints.save()
+
+    def get_size(self):
+        return self.size
+
+    def clear(self):
+        with self.lock:
+            for entry in self.__get_entries():
+                self.__remove(entry.path)
+            self.size = 0
+
+    def __schedule_save(self):
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = threading.Timer(self.delay, self.__save_later)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def __save_later(self):
+        with self.lock:
+            self.timer = None
+        self.fingerprints.save()
+
+    def __get_path(self, key):
+        return os.path.join(self.path, key + EXTENSION)
+
+    def __get_entries(self):
+        with os.scandir(self.path) as entries:
+            return [entry for entry in entries if entry.name.endswith(EXTENSION)]
+
+    def __evict(self):
+        entries = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in self.__get_entries())
+        self.size = sum(size for time, size, path in entries)
+        for time, size, path in entries:
+            if self.size <= self.max_size:
+                return
+            if self.__remove(path):
+                self.size -= size
+
+    def __remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+class CachedSource:
+    """
+        Class used to read the sounds of a source through a PCMCache. A sound that is not cached is decoded by the
+        source and its samples are stored in the cache. A cached sound is loaded into a mixer.Sound straight from
+        its decoded samples.
+
+           @source : DirectorySource or PackSource
+                the source that decodes the sounds that are not cached
+
+           @cache : PCMCache, optional
+                the cache of the decoded sounds
+
+        Methods
+        -------
+        load(note, octave, id)
+            Returns the given sound as a mixer.Sound
+
+        flush()
+            Saves the fingerprints of the cache now
+    """
+    def __init__(self, source, cache = None):
+        self.source = source
+        self.cache = cache if cache is not None else PCMCache()
+        self.path = source.path
+
+    def load(self, note, octave, id):
+        from pygame import mixer
+        fingerprint = self.source.get_fingerprint(note, octave, id, self.cache.fingerprints)
+        key = self.cache.get_key(fingerprint, mixer.get_init())
+        data = self.cache.read(key)
+        if data is not None:
+            return mixer.Sound(buffer = data)
+        sound = self.source.load(note, octave, id)
+        self.cache.write(key, sound.get_raw())
+        return sound
+
+    def flush(self):
+        self.cache.flush()
+
+
+def warm(octaves = range(1, 9)):
+    """
+        Decodes every sound of the configured sample source into the PCM cache, using the configured mixer format.
+
+        Parameters
+        ----------
+        octaves : iterable, optional
+    """
+    from pygame import mixer
+    from core.audio.library import create_library
+    from core.audio.sources import create_source
+    mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+    source = create_source(cached = True, anchors = False, processed = False)
+    library = create_library(anchors = False)
+    for octave in octaves:
+        for note in NOTES:
+            for id in library.get_ids(note, octave):
+                source.load(note, octave, id)
+    source.flush()
+    mixer.quit()
+
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    parser = argparse.ArgumentParser(description = 'Manages the cache of decoded sounds.')
+    parser.add_argument('command', choices = ['warm', 'clear', 'size'])
+    parser.add_argument('--octaves', type = int, nargs = '+', default = list(range(1, 9)), help = 'the octaves to warm up')
+    args = parser.parse_args()
+    if args.command == 'warm':
+        warm(args.octaves)
+    elif args.command == 'clear':
+        PCMCache().clear()
+    print(f"{PCMCache().get_size()} bytes cached in {PCM_CACHE_DIR}")
@@ -0,0 +1,66 @@
+import queue
+import threading
+from core.configurations import PREFETCH_NEIGHBOUR_OCTAVES
+
+
+class SamplePrefetcher:
+    """
+        Class used to decode the sounds of a sample bank on a worker thread. The octaves shown on the piano are
+        decoded first, followed by the neighbouring octaves. A new request replaces the requests that were not
+        started yet, so moving quickly through the octaves only decodes the octaves where the piano stops.
+
+           @sample_bank : SampleBank
+                the bank that receives the decoded sounds
+
+           @neighbours : int, optional
+                the number of octaves prefetched below and above the visible octaves
+
+        Methods
+        -------
+        request(octaves)
+            Decodes the given octaves and their neighbours in the background
+
+        wait()
+            Blocks until every request is decoded
+
+        stop()
+            Stops the worker thread
+    """
+    def __init__(self, sample_bank, neighbours = PREFETCH_NEIGHBOUR_OCTAVES):
+        self.sample_bank = sample_bank
+        self.neighbours = neighbours
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target = self.__run, name = 'sample-prefetcher', daemon = True)
+        self.thread.start()
+
+    def request(self, octaves):
+        octaves = list(octaves)
+        self.sample_bank.use_octaves(octaves)
+        self.requests.put(octaves + self.__get_neighbours(octaves))
+
+    def wait(self):
+        self.requests.join()
+
+    def stop(self):
+        self.requests.put(None)
+        self.thread.join()
+
+    def __get_neighbours(self, octaves):
+        neighbours = []
+        for distance in range(1, self.neighbours + 1):
+            for octave in (min(octaves) - distance, max(octaves) + distance):
+                if 1 <= octave <= 8:
+                    neighbours.append(octave)
+        return neighbours
+
+    def __run(self):
+        while True:
+            octaves = self.requests.get()
+            if octaves is None:
+                self.requests.task_done()
+                return
+            for octave in octaves:
+                if not self.requests.empty():
+                    break
+                self.sample_bank.load_octave(octave)
+            self.requests.task_done()
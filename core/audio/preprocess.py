@@ -0,0 +1,235 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.audio.sample_pack import SOUND_FILE
+from core.configurations import ONSET_THRESHOLD, ONSET_PREROLL, TARGET_LOUDNESS, MAX_GAIN, MIXER_FREQUENCY, MIXER_SIZE, \
+    MIXER_CHANNELS, MIXER_BUFFER
+from definitions import SOUNDS_DIR, SAMPLE_MANIFEST_PATH
+
+FRAME = 0.001 #SECONDS, THE RESOLUTION OF THE ONSET DETECTION
+SILENCE = -70 #DBFS, THE FRAMES BELOW ARE IGNORED BY THE LOUDNESS
+
+
+def get_key(note, octave, id):
+    return f"{note}{octave}-id{id}"
+
+
+def find_onset(samples, frequency, threshold = ONSET_THRESHOLD):
+    """
+        Returns the index of the first sample of the first 1 ms frame whose level is less than threshold dB below
+        the loudest frame.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            one row per sample and one column per channel
+        frequency : int
+        threshold : float, optional
+    """
+    size = max(1, int(frequency * FRAME))
+    count = len(samples) // size
+    if count == 0:
+        return 0
+    frames = np.abs(samples[:count * size]).max(axis = 1).reshape(count, size).max(axis = 1)
+    peak = frames.max()
+    if peak <= 0:
+        return 0
+    return int(np.argmax(frames >= peak * 10 ** (threshold / 20))) * size
+
+
+def get_loudness(samples, frequency):
+    """
+        Returns the loudness of the samples in dBFS: the mean power of the 1 ms frames that are not silent.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            one row per sample and one column per channel
+        frequency : int
+    """
+    size = max(1, int(frequency * FRAME))
+    count = len(samples) // size
+    if count == 0:
+        return SILENCE
+    powers = (samples[:count * size] ** 2).mean(axis = 1).reshape(count, size).mean(axis = 1)
+    audible = powers[powers > 10 ** (SILENCE / 10)]
+    if len(audible) == 0:
+        return SILENCE
+    return float(10 * np.log10(audible.mean()))
+
+
+def analyse(samples, frequency):
+    """
+        Returns the trim offset in ms and the gain in dB that start the samples at their onset and bring them to
+        TARGET_LOUDNESS, without clipping and without more than MAX_GAIN dB of gain.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            one row per sample and one column per channel
+        frequency : int
+    """
+    onset = max(0, find_onset(samples, frequency) - int(frequency * ONSET_PREROLL / 1000))
+    loudness = get_loudness(samples[onset:], frequency)
+    peak = float(np.abs(samples).max())
+    headroom = -20 * np.log10(peak) if peak > 0 else MAX_GAIN
+    gain = min(TARGET_LOUDNESS - loudness, MAX_GAIN, headroom)
+    return {'offset': onset * 1000 / frequency, 'gain': round(float(gain), 2), 'loudness': round(loudness, 2)}
+
+
+def apply(samples, frequency, entry):
+    """
+        Returns the samples trimmed and amplified as described by the given manifest entry.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            one row per sample and one column per channel
+        frequency : int
+        entry : dict
+    """
+    start = int(round(entry['offset'] * frequency / 1000))
+    return samples[start:] * 10 ** (entry['gain'] / 20)
+
+
+class ProcessedSource:
+    """
+        Class used to apply the trim offset and the gain of the sample manifest to the sounds of a source when they
+        are loaded. The sounds without an entry in the manifest are not changed.
+
+           @source : DirectorySource, PackSource or CachedSource
+                the source of the sounds
+
+           @manifest : dict
+                the entries of the manifest, by sound key
+
+        Methods
+        -------
+        load(note, octave, id)
+            Returns the given sound as a mixer.Sound, trimmed and amplified
+    """
+    def __init__(self, source, manifest):
+        self.source = source
+        self.manifest = manifest
+        self.path = source.path
+
+    def load(self, note, octave, id):
+        sound = self.source.load(note, octave, id)
+        entry = self.manifest.get(get_key(note, octave, id))
+        if entry is None or (entry['offset'] == 0 and entry['gain'] == 0):
+            return sound
+        from pygame import mixer
+        from core.audio.pcm import from_sound, to_sound
+        return to_sound(apply(from_sound(sound), mixer.get_init()[0], entry))
+
+
+def read_manifest(path = SAMPLE_MANIFEST_PATH):
+    """
+        Returns the entries of the sample manifest, or an empty dictionary if there is no manifest.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)['sounds']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _initialise_worker():
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from pygame import mixer
+    mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+
+
+def _process(task):
+    path, render = task
+    from pygame import mixer
+    from core.audio.pcm import from_sound
+    samples = from_sound(mixer.Sound(path))
+    frequency = mixer.get_init()[0]
+    entry = analyse(samples, frequency)
+    if render is not None:
+        _write_wave(render, apply(samples, frequency, entry), frequency)
+    return entry
+
+
+def _write_wave(path, samples, frequency):
+    data = np.round(np.clip(samples, -1, 1) * 32767).astype('<i2')
+    temporary = path + '.tmp'
+    with wave.open(temporary, 'wb') as f:
+        f.setnchannels(data.shape[1])
+        f.setsampwidth(2)
+        f.setframerate(frequency)
+        f.writeframes(data.tobytes())
+    os.replace(temporary, path)
+
+
+def _hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def build_manifest(sounds = SOUNDS_DIR, output = SAMPLE_MANIFEST_PATH, render = None, workers = None):
+    """
+        Analyses the sound files of the given directory in a pool of processes and writes the trim offset and the
+        gain of every sound to the manifest. The sounds whose file did not change since the last manifest are not
+        analysed again. Returns the number of analysed sounds and the number of sounds.
+
+        Parameters
+        ----------
+        sounds : str, optional
+            the directory that contains the sound files
+        output : str, optional
+            the path of the manifest
+        render : str, optional
+            if given, the trimmed and amplified sounds are also written to this directory as 16 bit WAV files
+        workers : int, optional
+            the number of processes. Defaults to the number of processors
+    """
+    previous = read_manifest(output)
+    entries = {}
+    tasks = []
+    with os.scandir(sounds) as files:
+        for file in files:
+            match = SOUND_FILE.match(file.name)
+            if not match:
+                continue
+            key = get_key(match.group(1), int(match.group(2)), int(match.group(3)))
+            fingerprint = _hash(file.path)
+            destination = os.path.join(render, key + '.wav') if render is not None else None
+            entry = previous.get(key)
+            if entry is not None and entry.get('hash') == fingerprint and (destination is None or os.path.exists(destination)):
+                entries[key] = entry
+            else:
+                tasks.append((key, fingerprint, file.path, destination))
+    if render is not None:
+        os.makedirs(render, exist_ok = True)
+    if tasks:
+        with ProcessPoolExecutor(max_workers = workers, initializer = _initialise_worker) as pool:
+            results = pool.map(_process, [(path, destination) for key, fingerprint, path, destination in tasks],
+                               chunksize = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1))))
+            for (key, fingerprint, path, destination), entry in zip(tasks, results):
+                entries[key] = dict(entry, hash = fingerprint)
+    temporary = output + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump({'frequency': MIXER_FREQUENCY, 'sounds': dict(sorted(entries.items()))}, f, indent = 1)
+    os.replace(temporary, output)
+    return len(tasks), len(entries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Writes the trim offset and the gain of every sound to the sample manifest.')
+    parser.add_argument('--sounds', default = SOUNDS_DIR, help = 'the directory that contains the sound files')
+    parser.add_argument('--output', default = SAMPLE_MANIFEST_PATH, help = 'the path of the manifest')
+    parser.add_argument('--render', help = 'also writes the trimmed and normalised sounds to this directory as WAV files')
+    parser.add_argument('--workers', type = int, help = 'the number of processes, the number of processors by default')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    analysed, total = build_manifest(args.sounds, args.output, args.render, args.workers)
+    duration = time.perf_counter() - start
+    print(f"Analysed {analysed} of {total} sounds in {duration:.1f} s, manifest written to {args.output}", file = sys.stderr)
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import OrderedDict
+from pygame import mixer
+from core.audio.sources import DirectorySource
+from core.configurations import NOTES, SAMPLE_BANK_MEMORY_BUDGET
+
+
+class SampleBank:
+    """
+        Class used to keep the sounds of the piano decoded in memory, so that playing a note does not read or
+        decode a file. The sounds are grouped by octave. When the decoded sounds use more memory than the budget,
+        the least recently used octaves are evicted. The bank can be used by the Tk thread and by a prefetcher
+        thread at the same time.
+
+           @source : DirectorySource, PackSource, SynthSource or CachedSource, optional
+                the source that decodes the sounds. Defaults to the sounds directory
+
+           @memory_budget : int, optional
+                the number of bytes the decoded sounds may use before octaves are evicted
+
+           @library : SampleLibrary, optional
+                the sounds that exist. Defaults to the library of the source
+
+        Methods
+        -------
+        load_octaves(octaves)
+            Decodes every sound of the given octaves
+
+        load_octave(octave)
+            Decodes every sound of the given octave
+
+        load(note, octave, id)
+            Decodes the given sound, if it is not decoded yet
+
+        get(note, octave, id)
+            Returns the decoded sound. The sound is decoded first if it was not loaded before, which is counted as
+            a miss
+
+        is_loaded(note, octave, id)
+            Returns True if the given sound is decoded
+
+        use_octaves(octaves)
+            Marks the given octaves as the most recently used ones. They are not evicted until other octaves are used
+
+        get_loaded_octaves()
+            Returns the octaves that have decoded sounds, from the least to the most recently used
+
+        get_memory_usage()
+            Returns the number of bytes used by the decoded sounds
+
+        get_loading_time()
+            Returns the number of seconds spent decoding sounds
+
+        get_misses()
+            Returns the number of sounds that were decoded by get() because they were not loaded, and the number of
+            seconds spent decoding them. The misses are decoded on the thread that plays the sound
+    """
+    def __init__(self, source = None, memory_budget = SAMPLE_BANK_MEMORY_BUDGET, library = None):
+        if library is None:
+            from core.audio.library import create_library
+            library = create_library() if source is not None else create_library('directory', anchors = False)
+        self.source = source if source is not None else DirectorySource()
+        self.library = library
+        self.memory_budget = memory_budget
+        self.sounds = {}
+        self.octaves = OrderedDict()
+        self.pinned = set()
+        self.memory_usage = 0
+        self.loading_time = 0
+        self.misses = 0
+        self.miss_time = 0
+        self.lock = threading.Lock()
+
+    def load_octaves(self, octaves):
+        for octave in octaves:
+            self.load_octave(octave)
+
+    def load_octave(self, octave):
+        for note in NOTES:
+            for id in self.library.get_ids(note, octave):
+                self.load(note, octave, id)
+
+    def load(self, note, octave, id):
+        key = (note, octave, id)
+        sound = self.sounds.get(key)
+        if sound is not None:
+            return sound
+        start = time.perf_counter()
+        sound = self.source.load(note, octave, id)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            if key in self.sounds:
+                return self.sounds[key]
+            size = self.__get_size(sound)
+            self.sounds[key] = sound
+            self.octaves.setdefault(octave, {})[key] = size
+            self.memory_usage += size
+            self.loading_time += elapsed
+            self.__evict(octave)
+        return sound
+
+    def get(self, note, octave, id):
+        sound = self.sounds.get((note, octave, id))
+        if sound is None:
+            start = time.perf_counter()
+            sound = self.load(note, octave, id)
+            with self.lock:
+                self.misses += 1
+                self.miss_time += time.perf_counter() - start
+            return sound
+        with self.lock:
+            if octave in self.octaves:
+                self.octaves.move_to_end(octave)
+        return sound
+
+    def is_loaded(self, note, octave, id):
+        return (note, octave, id) in self.sounds
+
+    def use_octaves(self, octaves):
+        with self.lock:
+            self.pinned = set(octaves)
+            for octave in octaves:
+                self.octaves.setdefault(octave, {})
+                self.octaves.move_to_end(octave)
+
+    def get_loaded_octaves(self):
+        with self.lock:
+            return [octave for octave, sounds in self.octaves.items() if sounds]
+
+    def get_memory_usage(self):
+        return self.memory_usage
+
+    def get_loading_time(self):
+        return self.loading_time
+
+    def get_misses(self):
+        return self.misses, self.miss_time
+
+    def __evict(self, loading_octave):
+        for octave in list(self.octaves):
+            if self.memory_usage <= self.memory_budget:
+                return
+            if octave != loading_octave and octave not in self.pinned:
+                self.__evict_octave(octave)
+
+    def __evict_octave(self, octave):
+        for key, size in self.octaves.pop(octave).items():
+            del self.sounds[key]
+            self.memory_usage -= size
+
+    def __get_size(self, sound):
+        frequency, size, channels = mixer.get_init()
+        return round(sound.get_length() * frequency) * channels * abs(size) // 8
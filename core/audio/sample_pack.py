@@ -0,0 +1,115 @@
+import argparse
+import mmap
+import os
+import re
+import struct
+from core.pitch import is_anchor
+from definitions import SOUNDS_DIR, SAMPLE_PACK_PATH
+
+MAGIC = b'EEPK'
+VERSION = 1
+HEADER = struct.Struct('<4sHI') #magic, version, number of entries
+ENTRY = struct.Struct('<4sBHQQ') #note, octave, id, offset, length
+SOUND_FILE = re.compile(r'^([A-G]b?)(\d)-id(\d+)\.mp3$')
+
+
+class SamplePack:
+    """
+        Class used to read a sample pack: a single file that holds every sound file of the sounds directory. The file
+        starts with a header and an index that maps every (note, octave, id) to the offset and the length of its
+        sound file. The pack is memory mapped, so the sounds are read without opening a file for each of them and
+        the buffers given to the caller share the memory of the mapping.
+
+           @path : str, optional
+                the path of the pack
+
+        Methods
+        -------
+        get_buffer(note, octave, id)
+            Returns a memoryview of the encoded sound file, without copying it
+
+        get_keys()
+            Returns the (note, octave, id) of every sound of the pack
+
+        close()
+            Unmaps the pack. The buffers returned before must not be used anymore
+    """
+    def __init__(self, path = SAMPLE_PACK_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        self.view = memoryview(self.mmap)
+        self.index = self.__read_index()
+
+    def get_buffer(self, note, octave, id):
+        offset, length = self.index[(note, octave, id)]
+        return self.view[offset:offset + length]
+
+    def get_keys(self):
+        return list(self.index)
+
+    def close(self):
+        self.view.release()
+        self.mmap.close()
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __read_index(self):
+        magic, version, count = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} sample pack.")
+        index = {}
+        for position in range(HEADER.size, HEADER.size + count * ENTRY.size, ENTRY.size):
+            note, octave, id, offset, length = ENTRY.unpack_from(self.mmap, position)
+            index[(note.rstrip(b'\0').decode('ascii'), octave, id)] = (offset, length)
+        return index
+
+
+def build_pack(sounds = SOUNDS_DIR, output = SAMPLE_PACK_PATH, keep = None):
+    """
+        Writes every sound file of the sounds directory into a sample pack. The pack is written to a temporary file
+        that replaces the output once complete. Returns the number of sounds written.
+
+        Parameters
+        ----------
+        sounds : str, optional
+            the directory that contains the sound files
+        output : str, optional
+            the path of the pack
+        keep : method, optional
+            called with (note, octave, id). If given, only the sounds for which it returns True are written
+    """
+    files = []
+    with os.scandir(sounds) as entries:
+        for entry in entries:
+            match = SOUND_FILE.match(entry.name)
+            if match is None:
+                continue
+            key = (match.group(1), int(match.group(2)), int(match.group(3)))
+            if keep is None or keep(*key):
+                files.append((key, entry.path, entry.stat().st_size))
+    files.sort()
+
+    offset = HEADER.size + len(files) * ENTRY.size
+    temporary = output + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(files)))
+        for (note, octave, id), path, size in files:
+            f.write(ENTRY.pack(note.encode('ascii'), octave, id, offset, size))
+            offset += size
+        for key, path, size in files:
+            with open(path, 'rb') as sound:
+                f.write(sound.read())
+    os.replace(temporary, output)
+    return len(files)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Packs the sounds directory into a single sample pack.')
+    parser.add_argument('--sounds', default = SOUNDS_DIR, help = 'the directory that contains the sound files')
+    parser.add_argument('--output', default = SAMPLE_PACK_PATH, help = 'the path of the pack')
+    parser.add_argument('--anchors', action = 'store_true', help = 'packs only the anchor sounds, see ANCHOR_INTERVAL')
+    args = parser.parse_args()
+    keep = (lambda note, octave, id: is_anchor(note, octave)) if args.anchors else None
+    print(f"Packed {build_pack(args.sounds, args.output, keep)} sounds into {args.output}")
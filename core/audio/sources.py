@@ -0,0 +1,108 @@
+import io
+import os
+from pygame import mixer
+from core.audio.pcm_cache import CachedSource
+from core.audio.sample_pack import SamplePack
+from core.configurations import SAMPLE_SOURCE, PCM_CACHE_ENABLED, ANCHOR_SAMPLES_ENABLED, SAMPLE_MANIFEST_ENABLED, \
+    TRANSCODE_ENABLED
+from definitions import SOUNDS_DIR, SAMPLE_PACK_PATH, SAMPLE_MANIFEST_PATH, TRANSCODED_DIR
+
+
+class DirectorySource:
+    """
+        Class used to read the sounds from a directory that holds one MP3 file per sound.
+
+           @path : str, optional
+                the directory that contains the sound files
+
+        Methods
+        -------
+        get_path(note, octave, id)
+            Returns the path of the file of the given sound
+
+        get_fingerprint(note, octave, id, fingerprints)
+            Returns the hash of the file of the given sound, using the given FingerprintIndex
+
+        load(note, octave, id)
+            Decodes the given sound into a mixer.Sound
+    """
+    def __init__(self, path = SOUNDS_DIR):
+        self.path = path
+
+    def get_path(self, note, octave, id):
+        return os.path.join(self.path, f"{note}{octave}-id{id}.mp3")
+
+    def get_fingerprint(self, note, octave, id, fingerprints):
+        return fingerprints.get_file(self.get_path(note, octave, id))
+
+    def load(self, note, octave, id):
+        return mixer.Sound(self.get_path(note, octave, id))
+
+
+class PackSource:
+    """
+        Class used to read the sounds from a sample pack. The pack holds the encoded sound files, which mixer.Sound
+        can only decode from a file object, so every sound is copied once out of the mapping into an io.BytesIO
+        before it is decoded. The copy is the size of the encoded file, a few kilobytes, and is dropped as soon as
+        the sound is decoded; the decoded samples are what the PCM cache keeps.
+
+           @path : str, optional
+                the path of the sample pack
+
+        Methods
+        -------
+        get_fingerprint(note, octave, id, fingerprints)
+            Returns the hash of the given sound, using the given FingerprintIndex
+
+        load(note, octave, id)
+            Decodes the given sound into a mixer.Sound
+    """
+    def __init__(self, path = SAMPLE_PACK_PATH):
+        self.path = path
+        self.pack = SamplePack(path)
+
+    def get_fingerprint(self, note, octave, id, fingerprints):
+        return fingerprints.get_buffer(self.pack.get_buffer(note, octave, id))
+
+    def load(self, note, octave, id):
+        return mixer.Sound(file = io.BytesIO(self.pack.get_buffer(note, octave, id)))
+
+
+def create_source(name = SAMPLE_SOURCE, cached = PCM_CACHE_ENABLED, anchors = ANCHOR_SAMPLES_ENABLED,
+                  processed = SAMPLE_MANIFEST_ENABLED, transcoded = TRANSCODE_ENABLED):
+    """
+        Returns the sample source with the given name: 'directory', 'pack' or 'synth'.
+
+        Parameters
+        ----------
+        name : str, optional
+        cached : bool, optional
+            if True, the source reads the decoded sounds through the PCM cache. The synthesizer is never cached
+        anchors : bool, optional
+            if True, only the anchor sounds are read and the other notes are resampled from them
+        processed : bool, optional
+            if True and the sample manifest exists, the sounds are trimmed and normalised as the manifest says
+        transcoded : bool, optional
+            if True, the 'directory' source reads the transcoded sounds that exist instead of the MP3 files
+    """
+    if name == 'synth':
+        from core.audio.synth import SynthSource
+        return SynthSource()
+    if name == 'directory':
+        source = DirectorySource()
+        if transcoded and os.path.isdir(TRANSCODED_DIR):
+            from core.audio.transcode import TranscodedSource
+            source = TranscodedSource(source)
+    elif name == 'pack':
+        source = PackSource()
+    else:
+        raise AttributeError("Please select a sample source: 'directory', 'pack' or 'synth'.")
+    if cached:
+        source = CachedSource(source)
+    if processed and os.path.exists(SAMPLE_MANIFEST_PATH):
+        from core.audio.preprocess import ProcessedSource, read_manifest
+        source = ProcessedSource(source, read_manifest())
+    if anchors:
+        from core.audio.anchors import AnchorSource
+        source = AnchorSource(source)
+    return source
@@ -0,0 +1,104 @@
+from functools import lru_cache
+import numpy as np
+from pygame import mixer
+from core.audio.pcm import to_sound
+from core.pitch import get_frequency, LOWEST_MIDI, HIGHEST_MIDI
+from core.configurations import SYNTH_DURATION, SYNTH_HARMONICS, SYNTH_INHARMONICITY, SYNTH_ATTACK, SYNTH_DECAY, \
+    SYNTH_SUSTAIN, SYNTH_RELEASE, SYNTH_VARIATION, SYNTH_VOLUME, SOUNDS_COUNT
+
+
+class Synthesizer:
+    """
+        Class used to generate piano-like tones. A tone is the sum of the harmonics of its note, where each harmonic
+        decays faster than the previous one, shaped by an ADSR envelope. Every harmonic is computed at once as one
+        row of a NumPy matrix. The tones are memoised per note and variant, for every note of the piano, so moving
+        through the octaves does not generate them again. They are kept as float32, about 86 KB per tone.
+
+           @duration : float, optional
+                the length of the tones in seconds
+
+           @harmonics : list, optional
+                the amplitude of each harmonic. The first one is the fundamental
+
+           @variation : float, optional
+                how much the amplitudes and decays of the variants differ from the harmonic table, from 0 to 1.
+                The variant 0 uses the table as it is
+
+        Methods
+        -------
+        get_tone(note, octave, variant, frequency)
+            Returns the samples of the given note and variant, at the given sample rate, between -1 and 1
+
+        get_variants(variant)
+            Returns the amplitudes and decay rates of the harmonics of the given variant
+
+        get_envelope(length, frequency)
+            Returns the ADSR envelope of a tone with the given number of samples
+    """
+    def __init__(self, duration = SYNTH_DURATION, harmonics = SYNTH_HARMONICS, variation = SYNTH_VARIATION):
+        self.duration = duration
+        self.harmonics = np.array(harmonics, dtype = np.float64)
+        self.variation = variation
+        self.get_tone = lru_cache(maxsize = (HIGHEST_MIDI - LOWEST_MIDI + 1) * SOUNDS_COUNT)(self.get_tone)
+        self.get_envelope = lru_cache(maxsize = 4)(self.get_envelope)
+
+    def get_tone(self, note, octave, variant, frequency):
+        length = round(self.duration * frequency)
+        pitch = get_frequency(note, octave)
+        amplitudes, decays = self.get_variants(variant)
+        numbers = np.arange(1, len(amplitudes) + 1)
+        partials = numbers * pitch * np.sqrt(1 + SYNTH_INHARMONICITY * numbers ** 2)
+        audible = partials < frequency / 2
+        time = np.arange(length) / frequency
+        phases = 2 * np.pi * np.outer(partials[audible], time)
+        decaying = np.exp(-np.outer(decays[audible], time))
+        tone = (amplitudes[audible, np.newaxis] * decaying * np.sin(phases)).sum(axis = 0)
+        tone *= self.get_envelope(length, frequency)
+        tone *= SYNTH_VOLUME / max(np.abs(tone).max(), 1e-9)
+        tone = tone.astype(np.float32)
+        tone.flags.writeable = False
+        return tone
+
+    def get_variants(self, variant):
+        numbers = np.arange(1, len(self.harmonics) + 1)
+        amplitudes = self.harmonics.copy()
+        decays = 2.0 * numbers
+        if variant:
+            random = np.random.default_rng(variant)
+            amplitudes *= 1 + self.variation * random.uniform(-1, 1, len(amplitudes))
+            decays *= 1 + self.variation * random.uniform(-1, 1, len(decays))
+        return amplitudes, decays
+
+    def get_envelope(self, length, frequency):
+        attack = max(1, round(SYNTH_ATTACK * frequency))
+        decay = max(1, round(SYNTH_DECAY * frequency))
+        release = max(1, round(SYNTH_RELEASE * frequency))
+        envelope = np.full(length, SYNTH_SUSTAIN)
+        envelope[:attack] = np.linspace(0, 1, attack, endpoint = False)[:length]
+        end = min(attack + decay, length)
+        envelope[attack:end] = np.linspace(1, SYNTH_SUSTAIN, decay, endpoint = False)[:max(0, end - attack)]
+        envelope[-release:] *= np.linspace(1, 0, min(release, length))
+        envelope.flags.writeable = False
+        return envelope
+
+
+class SynthSource:
+    """
+        Class used to generate the sounds with a Synthesizer instead of reading them from files. Every id is a
+        different variant of the timbre.
+
+           @synthesizer : Synthesizer, optional
+                the synthesizer of the sounds
+
+        Methods
+        -------
+        load(note, octave, id)
+            Generates the given sound as a mixer.Sound
+    """
+    def __init__(self, synthesizer = None):
+        self.synthesizer = synthesizer if synthesizer is not None else Synthesizer()
+        self.path = None
+
+    def load(self, note, octave, id):
+        frequency = mixer.get_init()[0]
+        return to_sound(self.synthesizer.get_tone(note, octave, id, frequency))
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from core.audio.pcm_cache import FingerprintIndex
+from core.audio.sample_pack import SOUND_FILE
+from core.configurations import TRANSCODE_TARGETS, OGG_QUALITY
+from definitions import SOUNDS_DIR, TRANSCODED_DIR
+
+EXTENSIONS = {'wav': '.wav', 'ogg': '.ogg'}
+DECODE_COST = {'wav': 0, 'ogg': 1} #THE LOWER, THE FASTER TO DECODE
+INDEX = 'transcoded.json'
+
+
+def get_directory(target, path = TRANSCODED_DIR):
+    """
+        Returns the directory of the sounds of the given (format, frequency, channels) target.
+    """
+    format, frequency, channels = target
+    return os.path.join(path, f"{format}-{frequency}-{channels}")
+
+
+class TranscodedSource:
+    """
+        Class used to read every sound from the fastest to decode of its transcoded files, or from the source when
+        the sound was not transcoded. The transcoded directories are listed once, when the source is created, so
+        choosing a file never touches the disk. The files with the frequency and the channels of the mixer are
+        preferred, because the mixer does not need to convert them, then the formats that are faster to decode.
+
+           @source : DirectorySource
+                the source of the sounds that were not transcoded
+
+           @path : str, optional
+                the directory of the transcoded sounds
+
+        Methods
+        -------
+        get_path(note, octave, id)
+            Returns the path of the file the given sound is read from
+
+        get_fingerprint(note, octave, id, fingerprints)
+            Returns the hash of the file of the given sound, using the given FingerprintIndex
+
+        load(note, octave, id)
+            Decodes the given sound into a mixer.Sound
+    """
+    def __init__(self, source, path = TRANSCODED_DIR):
+        from pygame import mixer
+        self.source = source
+        self.path = source.path
+        self.files = {}
+        frequency, size, channels = mixer.get_init()
+        directories = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                target = entry.name.split('-')
+                if entry.is_dir() and len(target) == 3 and target[0] in EXTENSIONS:
+                    converted = (int(target[1]), int(target[2])) != (frequency, channels)
+                    directories.append((converted, DECODE_COST[target[0]], entry.path))
+        for converted, cost, directory in sorted(directories, reverse = True):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    self.files[os.path.splitext(entry.name)[0]] = entry.path
+
+    def get_path(self, note, octave, id):
+        return self.files.get(f"{note}{octave}-id{id}") or self.source.get_path(note, octave, id)
+
+    def get_fingerprint(self, note, octave, id, fingerprints):
+        return fingerprints.get_file(self.get_path(note, octave, id))
+
+    def load(self, note, octave, id):
+        from pygame import mixer
+        return mixer.Sound(self.get_path(note, octave, id))
+
+
+def _transcode(task):
+    source, destination, (format, frequency, channels) = task
+    from pygame import mixer
+    if mixer.get_init() != (frequency, -16, channels):
+        mixer.quit()
+        mixer.init(frequency, -16, channels)
+    data = mixer.Sound(source).get_raw()
+    temporary = f"{destination}.{os.getpid()}.tmp"
+    if format == 'wav':
+        with wave.open(temporary, 'wb') as f:
+            f.setnchannels(channels)
+            f.setsampwidth(2)
+            f.setframerate(frequency)
+            f.writeframes(data)
+    else:
+        subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-f', 's16le', '-ar', str(frequency), '-ac', str(channels),
+                        '-i', '-', '-c:a', 'libvorbis', '-q:a', str(OGG_QUALITY), '-f', 'ogg', temporary],
+                       input = data, check = True)
+    os.replace(temporary, destination)
+    return os.path.getsize(destination)
+
+
+def _initialise_worker():
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+def transcode(sounds = SOUNDS_DIR, path = TRANSCODED_DIR, targets = TRANSCODE_TARGETS, workers = None):
+    """
+        Transcodes the sound files of the given directory to every target, in a pool of processes. An output is
+        skipped when it exists and was made from the same content of its sound file: the hashes of the sound files
+        are kept by a FingerprintIndex, which hashes a file again only when its size or modification time changed.
+        Returns the number of transcoded files and the number of skipped files.
+
+        Parameters
+        ----------
+        sounds : str, optional
+            the directory that contains the sound files
+        path : str, optional
+            the directory of the transcoded sounds, with one directory per target
+        targets : list, optional
+            the (format, frequency, channels) targets, the format being 'wav' or 'ogg'
+        workers : int, optional
+            the number of processes. Defaults to the number of processors
+    """
+    os.makedirs(path, exist_ok = True)
+    fingerprints = FingerprintIndex(os.path.join(path, 'fingerprints.json'))
+    try:
+        with open(os.path.join(path, INDEX)) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    with os.scandir(sounds) as entries:
+        files = sorted((entry.name, entry.path) for entry in entries if SOUND_FILE.match(entry.name))
+    tasks = []
+    skipped = 0
+    for target in targets:
+        format, frequency, channels = target
+        if format == 'ogg' and shutil.which('ffmpeg') is None:
+            print(f"Skipping {get_directory(target, path)}: ffmpeg is needed to encode OGG Vorbis", file = sys.stderr)
+            continue
+        directory = get_directory(target, path)
+        os.makedirs(directory, exist_ok = True)
+        for name, source in files:
+            destination = os.path.join(directory, os.path.splitext(name)[0] + EXTENSIONS[format])
+            fingerprint = fingerprints.get_file(source)
+            if index.get(destination) == fingerprint and os.path.exists(destination):
+                skipped += 1
+            else:
+                tasks.append((source, destination, tuple(target), fingerprint))
+    if tasks:
+        with ProcessPoolExecutor(max_workers = workers, initializer = _initialise_worker) as pool:
+            chunksize = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+            for (source, destination, target, fingerprint), size in zip(tasks, pool.map(
+                    _transcode, [task[:3] for task in tasks], chunksize = chunksize)):
+                index[destination] = fingerprint
+    fingerprints.save()
+    temporary = os.path.join(path, INDEX + '.tmp')
+    with open(temporary, 'w') as f:
+        json.dump(index, f)
+    os.replace(temporary, os.path.join(path, INDEX))
+    return len(tasks), skipped
+
+
+def parse_target(text):
+    format, frequency, channels = text.split(':')
+    if format not in EXTENSIONS:
+        raise argparse.ArgumentTypeError(f"Unknown format: {format}")
+    return format, int(frequency), int(channels)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Transcodes the sound files to formats that are faster to decode.')
+    parser.add_argument('--sounds', default = SOUNDS_DIR, help = 'the directory that contains the sound files')
+    parser.add_argument('--output', default = TRANSCODED_DIR, help = 'the directory of the transcoded sounds')
+    parser.add_argument('--target', type = parse_target, action = 'append', dest = 'targets',
+                        help = 'a FORMAT:FREQUENCY:CHANNELS target, like wav:44100:2 or ogg:22050:1. May be repeated')
+    parser.add_argument('--workers', type = int, help = 'the number of processes, the number of processors by default')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    transcoded, skipped = transcode(args.sounds, args.output, args.targets or TRANSCODE_TARGETS, args.workers)
+    duration = time.perf_counter() - start
+    print(f"Transcoded {transcoded} files and skipped {skipped} up to date files in {duration:.1f} s "
+          f"({transcoded / duration:.0f} files/s)", file = sys.stderr)
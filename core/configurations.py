@@ -4,9 +4,95 @@ PIANO_RELY = 0.275
 PIANO_RELWIDTH = 0.96
 PIANO_RELHEIGHT = 0.65
 TOPMENU_RELHEIGHT = 0.2
+PIANO_RENDERER = 'buttons' #'buttons': ONE TK BUTTON PER KEY, 'canvas': ALL THE KEYS ON ONE CANVAS
 
 #SOUNDS FILE CONFIGURATIONS
-SOUNDS_COUNT = 10
+SOUNDS_COUNT = 10 #VARIANTS OF EVERY NOTE MADE BY THE SYNTHESISER, THE SOUND FILES ARE LISTED BY core/audio/library.py
+NOTES = ["C", "Cb", "D", "Db", "E", "F", "Fb", "G", "Gb", "A", "Ab", "B"]
+
+#AUDIO DEVICE CONFIGURATIONS
+MIXER_FREQUENCY = 44100 #HZ
+MIXER_SIZE = -16 #SIGNED 16 BIT SAMPLES
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 256 #SAMPLES, SMALL FOR LOW LATENCY
+
+#SAMPLE BANK CONFIGURATIONS
+SAMPLE_SOURCE = 'directory' #'directory': ONE FILE PER SOUND IN sounds/, 'pack': THE SAMPLE PACK BUILT BY core/audio/sample_pack.py, 'synth': TONES GENERATED BY core/audio/synth.py
+SAMPLE_BANK_MEMORY_BUDGET = 80 * 1024 * 1024 #BYTES
+PREFETCH_NEIGHBOUR_OCTAVES = 1
+
+#ANCHOR SAMPLES CONFIGURATIONS
+ANCHOR_SAMPLES_ENABLED = False #IF True, ONLY THE ANCHOR SOUNDS ARE READ, THE OTHER NOTES ARE RESAMPLED FROM THE NEAREST ANCHOR
+ANCHOR_INTERVAL = 3 #SEMITONES BETWEEN TWO ANCHORS, 3 IS ONE ANCHOR PER MINOR THIRD
+ANCHOR_MEASURE_PITCH = True #MEASURE THE PITCH ERROR OF EVERY RESAMPLED NOTE
+
+#PCM CACHE CONFIGURATIONS
+PCM_CACHE_ENABLED = True
+PCM_CACHE_MAX_SIZE = 512 * 1024 * 1024 #BYTES
+PCM_CACHE_SAVE_DELAY = 1.0 #SECONDS BETWEEN THE LAST CACHED SOUND AND THE SAVE OF THE FINGERPRINTS
+
+#TRANSCODING CONFIGURATIONS
+TRANSCODE_ENABLED = True #READ THE SOUNDS TRANSCODED BY core/audio/transcode.py, IF THERE ARE ANY
+TRANSCODE_TARGETS = [('wav', 44100, 2)] #(FORMAT, FREQUENCY, CHANNELS), THE FORMAT IS 'wav' OR 'ogg' (NEEDS ffmpeg)
+OGG_QUALITY = 6 #FROM -1 TO 10
+
+#SAMPLE PREPROCESSING CONFIGURATIONS
+SAMPLE_MANIFEST_ENABLED = True #APPLY THE TRIM AND THE GAIN OF THE MANIFEST BUILT BY core/audio/preprocess.py, IF IT EXISTS
+ONSET_THRESHOLD = -40 #DB BELOW THE PEAK, THE SILENCE BEFORE THE FIRST LOUDER MILLISECOND IS TRIMMED
+ONSET_PREROLL = 2 #MS KEPT BEFORE THE ONSET
+TARGET_LOUDNESS = -20 #DBFS
+MAX_GAIN = 12 #DB
+
+#SYNTHESISER CONFIGURATIONS
+SYNTH_DURATION = 0.5 #SECONDS, THE LENGTH OF THE RECORDED SOUNDS
+SYNTH_HARMONICS = [1.0, 0.6, 0.35, 0.25, 0.15, 0.1, 0.07, 0.05, 0.03, 0.02] #AMPLITUDE OF EACH HARMONIC
+SYNTH_INHARMONICITY = 0.0004 #STRETCH OF THE HIGHER HARMONICS, LIKE A PIANO STRING
+SYNTH_ATTACK = 0.005 #SECONDS
+SYNTH_DECAY = 0.15 #SECONDS
+SYNTH_SUSTAIN = 0.5 #LEVEL OF THE SUSTAIN, FROM 0 TO 1
+SYNTH_RELEASE = 0.08 #SECONDS
+SYNTH_VARIATION = 0.3 #RANDOM CHANGE OF THE HARMONICS OF THE VARIANTS, FROM 0 TO 1
+SYNTH_VOLUME = 0.5
+
+#AUDIO ENGINE CONFIGURATIONS
+VOICES = 16
+FADEOUT_TIME = 150 #MS
+
+#INSTRUMENTATION CONFIGURATIONS
+LATENCY_PROBE_ENABLED = True
+LATENCY_BUFFER_SIZE = 1024 #MEASUREMENTS KEPT PER STAGE
+
+#ATTEMPT STORE CONFIGURATIONS
+ATTEMPT_STORE_ENABLED = True #SAVES EVERY ROUND OF THE GAMES IN attempts.sqlite3
+PLAYER_NAME = 'player'
+ATTEMPT_STORE_BATCH_SIZE = 256 #ROUNDS WRITTEN IN ONE TRANSACTION
+ATTEMPT_STORE_FLUSH_INTERVAL = 0.5 #SECONDS A ROUND CAN WAIT FOR ITS BATCH
+
+#NOTE SELECTION CONFIGURATIONS
+NOTE_SELECTION = 'uniform' #'uniform': EVERY NOTE IS EQUALLY LIKELY, 'adaptive': THE NOTES WITH MORE WRONG ANSWERS ARE PLAYED MORE OFTEN
+ADAPTIVE_HISTORY = 2000 #LAST ROUNDS USED FOR THE ERROR RATES WHEN THE GAME STARTS
+ADAPTIVE_ERROR_DECAY = 0.2 #WEIGHT OF THE LAST ANSWER IN THE ERROR RATE OF A NOTE
+ADAPTIVE_BASE_WEIGHT = 0.1 #WEIGHT OF A NOTE THAT IS NEVER WRONG
+ADAPTIVE_RETRY_ROUNDS = 3 #ROUNDS A SOUND RESTS AFTER A WRONG ANSWER
+ADAPTIVE_FIRST_INTERVAL = 8 #ROUNDS A SOUND RESTS AFTER ITS FIRST RIGHT ANSWER, DOUBLED AFTER EVERY RIGHT ANSWER
+ADAPTIVE_RESTING_FACTOR = 0.05 #WEIGHT OF A RESTING SOUND COMPARED TO ITS FULL WEIGHT
+
+#SETTINGS CONFIGURATIONS
+SETTINGS_SAVE_DELAY = 1.0 #SECONDS BETWEEN THE LAST CHANGE OF THE SETTINGS AND THEIR SAVE
+
+#CHORDS CONFIGURATIONS
+STIMULUS = 'note' #'note': ONE NOTE PER ROUND, 'harmonic': TWO NOTES AT ONCE, 'melodic': TWO NOTES ONE AFTER THE OTHER, 'chord': THREE TO FIVE NOTES AT ONCE
+INTERVALS = list(range(1, 13)) #SEMITONES OF THE INTERVALS
+CHORDS = {'major': (0, 4, 7), 'minor': (0, 3, 7), 'diminished': (0, 3, 6), 'augmented': (0, 4, 8), 'major seventh': (0, 4, 7, 11),
+          'dominant seventh': (0, 4, 7, 10), 'minor seventh': (0, 3, 7, 10), 'dominant ninth': (0, 4, 7, 10, 14)} #SEMITONES FROM THE LOWEST NOTE
+MELODIC_DELAY = 600 #MS BETWEEN THE NOTES OF A MELODIC INTERVAL
+CHORD_CACHE_SIZE = 64 #MIXED SOUNDS KEPT IN MEMORY
+CHORD_HEADROOM = 0.9 #THE PEAK OF THE MIXED SOUNDS IS LIMITED TO THIS LEVEL
+
+#MIDI DRILL CONFIGURATIONS
+MIDI_DRILL_SPEED = 1.0 #1 IS THE TEMPO OF THE FILE
+MIDI_DRILL_MELODY = True #KEEP ONLY THE HIGHEST NOTE OF THE NOTES THAT START TOGETHER
+MIDI_DRILL_CHORD_TOLERANCE = 0.02 #SECONDS BETWEEN THE NOTES THAT START TOGETHER
 
 #GAME CONFIGURATIONS
 SOUNDS_COUNT_MINIMUM = 5
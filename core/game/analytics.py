@@ -0,0 +1,129 @@
+import numpy as np
+from core.pitch import get_midi, get_note, LOWEST_MIDI, HIGHEST_MIDI
+
+PITCHES = HIGHEST_MIDI - LOWEST_MIDI + 1
+INTERVALS = 2 * PITCHES - 1 #FROM -95 TO 95 SEMITONES
+
+
+class ConfusionMatrix:
+    """
+        Class used to keep the statistics of the answers of the player: a pitch × pitch matrix that counts how many
+        times every note was answered with every other note, the number of answers and right answers of every note,
+        and the number of wrong answers at every interval from the right note. Every answer updates the arrays in
+        O(1), and the whole history is aggregated with NumPy, without a loop over the rounds.
+
+        Methods
+        -------
+        add(note, octave, answer_note, answer_octave)
+            Counts one answer
+
+        record(session, round)
+            Counts the answer of the given GameRound, if it was answered
+
+        rebuild(expected, pressed, counts)
+            Replaces the statistics by the ones of the given arrays of MIDI numbers
+
+        load(store)
+            Replaces the statistics by the whole history of the given AttemptStore
+
+        get_answers()
+            Returns the number of answers
+
+        get_accuracy(note, octave)
+            Returns the ratio of right answers of the given note, or of every note if note is None
+
+        get_note_accuracies()
+            Returns an array with the ratio of right answers of every pitch, NaN for the pitches without answers
+
+        get_confusions(count)
+            Returns the count most frequent mistakes as (note, octave, answer_note, answer_octave, times) tuples
+
+        get_interval_errors(count)
+            Returns the count most frequent intervals of the wrong answers, in semitones, as (interval, times) pairs
+
+        summary()
+            Returns a dictionary with the number of answers, the accuracy, the weakest notes, the most frequent
+            mistakes and the most frequent interval errors
+    """
+    def __init__(self):
+        self.matrix = np.zeros((PITCHES, PITCHES), dtype = np.int64)
+        self.totals = np.zeros(PITCHES, dtype = np.int64)
+        self.correct = np.zeros(PITCHES, dtype = np.int64)
+        self.intervals = np.zeros(INTERVALS, dtype = np.int64)
+
+    def add(self, note, octave, answer_note, answer_octave):
+        expected = get_midi(note, octave) - LOWEST_MIDI
+        pressed = get_midi(answer_note, answer_octave) - LOWEST_MIDI
+        self.matrix[expected, pressed] += 1
+        self.totals[expected] += 1
+        if expected == pressed:
+            self.correct[expected] += 1
+        else:
+            self.intervals[pressed - expected + PITCHES - 1] += 1
+
+    def record(self, session, round):
+        if round.answer is not None:
+            self.add(*round.target, *round.answer)
+
+    def rebuild(self, expected, pressed, counts = None):
+        expected = np.asarray(expected, dtype = np.int64) - LOWEST_MIDI
+        pressed = np.asarray(pressed, dtype = np.int64) - LOWEST_MIDI
+        counts = np.ones(len(expected), dtype = np.int64) if counts is None else np.asarray(counts, dtype = np.int64)
+        valid = (expected >= 0) & (expected < PITCHES) & (pressed >= 0) & (pressed < PITCHES)
+        expected, pressed, counts = expected[valid], pressed[valid], counts[valid]
+        self.matrix = np.bincount(expected * PITCHES + pressed, weights = counts,
+                                  minlength = PITCHES * PITCHES).astype(np.int64).reshape(PITCHES, PITCHES)
+        self.totals = self.matrix.sum(axis = 1)
+        self.correct = np.diagonal(self.matrix).copy()
+        wrong = expected != pressed
+        self.intervals = np.bincount(pressed[wrong] - expected[wrong] + PITCHES - 1, weights = counts[wrong],
+                                     minlength = INTERVALS).astype(np.int64)
+
+    def load(self, store):
+        rows = np.array([tuple(row) for row in store.count_answers()], dtype = np.int64).reshape(-1, 3)
+        self.rebuild(rows[:, 0], rows[:, 1], rows[:, 2])
+
+    def get_answers(self):
+        return int(self.totals.sum())
+
+    def get_accuracy(self, note = None, octave = None):
+        if note is None:
+            total, correct = self.totals.sum(), self.correct.sum()
+        else:
+            pitch = get_midi(note, octave) - LOWEST_MIDI
+            total, correct = self.totals[pitch], self.correct[pitch]
+        return float(correct / total) if total else 0.0
+
+    def get_note_accuracies(self):
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            return np.where(self.totals > 0, self.correct / self.totals, np.nan)
+
+    def get_confusions(self, count = 3):
+        mistakes = self.matrix.copy()
+        np.fill_diagonal(mistakes, 0)
+        flat = mistakes.ravel()
+        count = min(count, np.count_nonzero(flat))
+        if count == 0:
+            return []
+        indexes = np.argpartition(flat, -count)[-count:]
+        indexes = indexes[np.argsort(flat[indexes])[::-1]]
+        confusions = []
+        for index in indexes:
+            expected, pressed = divmod(int(index), PITCHES)
+            confusions.append((*get_note(expected + LOWEST_MIDI), *get_note(pressed + LOWEST_MIDI), int(flat[index])))
+        return confusions
+
+    def get_interval_errors(self, count = 3):
+        count = min(count, np.count_nonzero(self.intervals))
+        if count == 0:
+            return []
+        indexes = np.argsort(self.intervals)[::-1][:count]
+        return [(int(index) - PITCHES + 1, int(self.intervals[index])) for index in indexes]
+
+    def summary(self, count = 3):
+        accuracies = self.get_note_accuracies()
+        answered = np.flatnonzero(self.totals)
+        weakest = answered[np.argsort(accuracies[answered], kind = 'stable')[:count]]
+        return {'answers': self.get_answers(), 'accuracy': self.get_accuracy(),
+                'weakest': [(*get_note(int(pitch) + LOWEST_MIDI), float(accuracies[pitch])) for pitch in weakest],
+                'confusions': self.get_confusions(count), 'intervals': self.get_interval_errors(count)}
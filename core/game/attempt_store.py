@@ -0,0 +1,164 @@
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from core.pitch import get_midi
+from core.configurations import PLAYER_NAME, ATTEMPT_STORE_BATCH_SIZE, ATTEMPT_STORE_FLUSH_INTERVAL
+from definitions import ATTEMPTS_DB_PATH
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    user TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    expected INTEGER NOT NULL,
+    pressed INTEGER,
+    variant INTEGER NOT NULL,
+    lowest_octave INTEGER NOT NULL,
+    highest_octave INTEGER NOT NULL,
+    played_at REAL NOT NULL,
+    answered_at REAL,
+    response_time REAL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_user ON attempts (user, played_at);
+CREATE INDEX IF NOT EXISTS attempts_by_note ON attempts (user, expected, played_at);
+CREATE INDEX IF NOT EXISTS attempts_by_answer ON attempts (user, expected, pressed);
+CREATE INDEX IF NOT EXISTS attempts_by_session ON attempts (session, round);
+'''
+COLUMNS = ('session', 'user', 'mode', 'round', 'expected', 'pressed', 'variant', 'lowest_octave', 'highest_octave',
+           'played_at', 'answered_at', 'response_time')
+INSERT = f"INSERT INTO attempts ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+SELECT = f"SELECT {', '.join(COLUMNS)} FROM attempts"
+
+
+class AttemptStore:
+    """
+        Class used to save every round of the games in a SQLite database. The rounds are queued by the Tk thread
+        and written in batches by a worker thread, in one transaction per batch, so recording a round never waits
+        for the disk. The database uses WAL mode, so the history can be read while a batch is written. The notes
+        are stored as MIDI numbers and the times as Unix timestamps in seconds.
+
+           @path : str, optional
+                the path of the database
+
+           @user : str, optional
+                the name of the player whose rounds are recorded and read
+
+        Methods
+        -------
+        record(session, round)
+            Queues the given GameRound of the given GameSession
+
+        flush()
+            Blocks until every queued round is written
+
+        close()
+            Writes the queued rounds and stops the worker thread
+
+        get_history(limit, before)
+            Returns the last rounds of the user played before the given timestamp, newest first
+
+        get_note_history(note, octave, limit, before)
+            Returns the last rounds of the user whose expected note was the given note, newest first
+
+        get_session(session)
+            Returns the rounds of the given session id, in order
+
+        count_attempts()
+            Returns the number of rounds recorded for the user
+
+        count_answers()
+            Returns (expected, pressed, count) rows that count the answers of the user for every pair of notes
+
+        export()
+            Yields every round of the user, oldest first
+    """
+    def __init__(self, path = ATTEMPTS_DB_PATH, user = PLAYER_NAME):
+        self.path = path
+        self.user = user
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.reader = self.__connect(check_same_thread = False)
+        self.reader.executescript(SCHEMA)
+        self.reader.row_factory = sqlite3.Row
+        self.thread = threading.Thread(target = self.__run, name = 'attempt-store', daemon = True)
+        self.thread.start()
+
+    def record(self, session, round):
+        played_at = session.started_at + round.played_at / 1000
+        answered_at = session.started_at + round.answered_at / 1000 if round.answered_at is not None else None
+        pressed = get_midi(*round.answer) if round.answer is not None else None
+        self.queue.put((session.id, self.user, session.mode, round.index, get_midi(*round.target), pressed, round.id,
+                        *session.get_octaves(), played_at, answered_at, round.get_response_time()))
+
+    def flush(self):
+        self.queue.join()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        with self.lock:
+            self.reader.close()
+
+    def get_history(self, limit = 100, before = None):
+        before = before if before is not None else float('inf')
+        return self.__read(f"{SELECT} WHERE user = ? AND played_at < ? ORDER BY played_at DESC LIMIT ?",
+                           (self.user, before, limit))
+
+    def get_note_history(self, note, octave, limit = 100, before = None):
+        before = before if before is not None else float('inf')
+        return self.__read(f"{SELECT} WHERE user = ? AND expected = ? AND played_at < ? ORDER BY played_at DESC LIMIT ?",
+                           (self.user, get_midi(note, octave), before, limit))
+
+    def get_session(self, session):
+        return self.__read(f"{SELECT} WHERE session = ? ORDER BY round", (session,))
+
+    def count_attempts(self):
+        return self.__read("SELECT COUNT(*) FROM attempts WHERE user = ?", (self.user,))[0][0]
+
+    def count_answers(self):
+        return self.__read("SELECT expected, pressed, COUNT(*) FROM attempts WHERE user = ? AND pressed IS NOT NULL "
+                           "GROUP BY expected, pressed", (self.user,))
+
+    def export(self):
+        connection = self.__connect()
+        try:
+            yield from connection.execute(f"{SELECT} WHERE user = ? ORDER BY played_at", (self.user,))
+        finally:
+            connection.close()
+
+    def __connect(self, check_same_thread = True):
+        connection = sqlite3.connect(self.path, check_same_thread = check_same_thread)
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('PRAGMA synchronous = NORMAL')
+        return connection
+
+    def __read(self, query, parameters):
+        with self.lock:
+            return self.reader.execute(query, parameters).fetchall()
+
+    def __run(self):
+        connection = self.__connect()
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + ATTEMPT_STORE_FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < ATTEMPT_STORE_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get(timeout = max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is None
+            rows = [row for row in batch if row is not None]
+            try:
+                with connection:
+                    connection.executemany(INSERT, rows)
+            except sqlite3.Error as error:
+                print(f"Could not save {len(rows)} attempts: {error}", file = sys.stderr)
+            for x in batch:
+                self.queue.task_done()
+        connection.close()
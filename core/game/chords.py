@@ -0,0 +1,62 @@
+from core.pitch import get_midi, get_note
+from core.configurations import STIMULUS, INTERVALS, CHORDS, MELODIC_DELAY
+
+
+class ChordPicker:
+    """
+        Class used to build the notes of a round around the note picked by the selector: an interval of two notes
+        played together or one after the other, or a chord of three to five notes. Only the notes of the game are
+        used: the shape is built upwards from the picked note, or downwards to it when it does not fit.
+
+           @stimulus : str
+                'harmonic', 'melodic' or 'chord'
+
+           @shapes : list, optional
+                the shapes that can be picked, as semitones from the lowest note. Defaults to INTERVALS for the
+                intervals and to CHORDS for the chords
+
+        Methods
+        -------
+        pick(note, octave, targets, rng)
+            Returns the (note, octave) pairs of a round that contains the given note, in the order they are played
+
+        get_delay()
+            Returns the ms between the starts of two notes of a round
+    """
+    def __init__(self, stimulus, shapes = None):
+        if stimulus not in ('harmonic', 'melodic', 'chord'):
+            raise AttributeError("Please select a stimulus: 'note', 'harmonic', 'melodic' or 'chord'.")
+        self.stimulus = stimulus
+        if shapes is None:
+            shapes = list(CHORDS.values()) if stimulus == 'chord' else [(0, interval) for interval in INTERVALS]
+        self.shapes = [tuple(shape) for shape in shapes]
+
+    def pick(self, note, octave, targets, rng):
+        pitches = {get_midi(*target) for target in targets}
+        root = get_midi(note, octave)
+        fits = []
+        for shape in self.shapes:
+            for lowest in (root, root - shape[-1]):
+                chord = [lowest + semitones for semitones in shape]
+                if all(pitch in pitches for pitch in chord):
+                    fits.append(chord)
+                    break
+        if not fits:
+            return [(note, octave)]
+        chord = rng.choice(fits)
+        if self.stimulus == 'melodic' and rng.random() < 0.5:
+            chord.reverse()
+        return [get_note(pitch) for pitch in chord]
+
+    def get_delay(self):
+        return MELODIC_DELAY if self.stimulus == 'melodic' else 0
+
+
+def create_chord_picker(name = STIMULUS):
+    """
+        Returns the ChordPicker of the given stimulus: 'harmonic', 'melodic' or 'chord', or None for 'note', the
+        rounds of one note.
+    """
+    if name == 'note':
+        return None
+    return ChordPicker(name)
@@ -0,0 +1,45 @@
+from core.midi_file import MidiFile, get_melody
+from core.pitch import get_note
+from core.configurations import MIDI_DRILL_SPEED, MIDI_DRILL_MELODY, MIDI_DRILL_CHORD_TOLERANCE
+
+
+def fit_to_keys(pitch, low, high):
+    """
+        Returns the given MIDI number moved by whole octaves into the given range of MIDI numbers, or None if the
+        range is shorter than one octave and no octave of the note is in it.
+    """
+    if pitch < low:
+        pitch += (low - pitch + 11) // 12 * 12
+    elif pitch > high:
+        pitch -= (pitch - high + 11) // 12 * 12
+    return pitch if low <= pitch <= high else None
+
+
+def read_drill(path, pitches, speed = MIDI_DRILL_SPEED, melody = MIDI_DRILL_MELODY, channels = None, tracks = None):
+    """
+        Yields the notes of a MIDI file as the timeline of a GameSession: a (ms, note, octave) tuple for every note,
+        moved by whole octaves onto the given keys. The file is read while the game is played, so a long file does
+        not delay the start of the game.
+
+        Parameters
+        ----------
+        path : str
+            the path of the .mid file
+        pitches : range
+            the MIDI numbers of the keys shown on the piano
+        speed : float, optional
+            the speed of the drill, 1 is the tempo of the file
+        melody : bool, optional
+            if True, only the highest note of the notes that start together is kept
+        channels : iterable, optional
+            the channels whose notes are used. Defaults to every channel but the drums
+        tracks : iterable, optional
+            the tracks whose notes are used. Defaults to every track
+    """
+    notes = MidiFile(path).get_notes(channels, tracks)
+    if melody:
+        notes = get_melody(notes, MIDI_DRILL_CHORD_TOLERANCE)
+    for time, pitch, velocity, channel, track in notes:
+        pitch = fit_to_keys(pitch, pitches[0], pitches[-1])
+        if pitch is not None:
+            yield (time * 1000 / speed, *get_note(pitch))
@@ -0,0 +1,181 @@
+import heapq
+import math
+import time
+
+DUE_TOLERANCE = 1e-6 #MS, ABSORBS THE ROUNDING OF THE CLOCK TIMES GIVEN TO tick()
+
+
+class GameScheduler:
+    """
+        Class used to run the events of a game on one timeline. Every event has a deadline in ms measured from the
+        start of the timeline with a monotonic clock, and only the next deadline is waiting in the Tk loop. The
+        delay of each timer is computed from the absolute deadline, so a late event does not delay the next ones.
+        Without a widget, nothing waits in a loop and the events are called by tick(), which can also run a timeline
+        faster than real time.
+
+           @widget : tkinter widget or None
+                the widget whose after() method is used to wait for the next deadline. If None, the events are only
+                called by tick()
+
+           @clock : method, optional
+                returns the current time in seconds. Must be monotonic
+
+           @probe : LatencyProbe, optional
+                if given, every event is measured from its deadline. Requires clock to be time.monotonic
+
+        Methods
+        -------
+        schedule(ms, method)
+            calls the method ms milliseconds after the start of the timeline
+
+        schedule_in(ms, method)
+            calls the method ms milliseconds from now
+
+        start(now)
+            starts a new timeline at the given clock time, now by default. The events scheduled before are kept, the
+            jitter measurements are cleared
+
+        tick(now)
+            calls every event due at the given clock time, now by default. The events see now as the current time
+
+        pause()
+            stops the timeline. The time spent paused does not count towards the deadlines
+
+        resume()
+            continues a paused timeline
+
+        cancel()
+            removes every event and stops the timeline
+
+        is_running()
+            :returns: True if the timeline was started and not cancelled
+
+        is_paused()
+            :returns: True if the timeline is paused
+
+        elapsed(now)
+            :returns: the number of ms from the start of the timeline to the given clock time, now by default,
+            without the time spent paused
+
+        get_next_deadline()
+            :returns: the deadline of the next event in ms from the start of the timeline, or None
+
+        get_jitter()
+            :returns: a list of (deadline, lateness) pairs in ms, one for every event that was called
+
+        get_jitter_summary()
+            :returns: a dictionary with the number of events and the mean, 95th percentile and maximum lateness in ms
+    """
+    def __init__(self, widget, clock = time.monotonic, probe = None):
+        self.widget = widget
+        self.clock = clock
+        self.probe = probe
+        self.events = []
+        self.order = 0
+        self.start_time = None
+        self.paused_at = None
+        self.timer = None
+        self.jitter = []
+        self.now = None
+
+    def schedule(self, ms, method):
+        self.order += 1
+        heapq.heappush(self.events, (ms, self.order, method))
+        if self.widget is not None and self.events[0][1] == self.order: #WITHOUT A WIDGET, NOTHING WAITS FOR THE DEADLINE
+            self.__arm()
+
+    def schedule_in(self, ms, method):
+        self.schedule(self.elapsed() + ms, method)
+
+    def start(self, now = None):
+        self.start_time = now if now is not None else self.__time()
+        self.paused_at = None
+        self.jitter = []
+        self.__arm()
+
+    def pause(self):
+        if self.is_running() and not self.is_paused():
+            self.paused_at = self.__time()
+            self.__disarm()
+
+    def resume(self):
+        if self.is_paused():
+            self.start_time += self.__time() - self.paused_at
+            self.paused_at = None
+            self.__arm()
+
+    def cancel(self):
+        self.__disarm()
+        self.events = []
+        self.start_time = None
+        self.paused_at = None
+
+    def is_running(self):
+        return self.start_time is not None
+
+    def is_paused(self):
+        return self.paused_at is not None
+
+    def tick(self, now = None):
+        self.now = now
+        try:
+            self.__run()
+        finally:
+            self.now = None
+
+    def elapsed(self, now = None):
+        if self.start_time is None:
+            return 0
+        if self.paused_at is not None:
+            now = self.paused_at
+        elif now is None:
+            now = self.now if self.now is not None else self.clock()
+        return (now - self.start_time) * 1000
+
+    def get_next_deadline(self):
+        return self.events[0][0] if self.events else None
+
+    def get_jitter(self):
+        return list(self.jitter)
+
+    def get_jitter_summary(self):
+        lateness = sorted(late for deadline, late in self.jitter)
+        if not lateness:
+            return {'events': 0, 'mean': 0, 'p95': 0, 'max': 0}
+        return {'events': len(lateness), 'mean': sum(lateness) / len(lateness),
+                'p95': lateness[min(len(lateness) - 1, int(len(lateness) * 0.95))], 'max': lateness[-1]}
+
+    def __arm(self):
+        self.__disarm()
+        if self.widget is not None and self.events and self.is_running() and not self.is_paused():
+            delay = max(0, math.ceil(self.events[0][0] - self.elapsed()))
+            self.timer = self.widget.after(delay, self.__fire)
+
+    def __disarm(self):
+        if self.timer is not None:
+            self.widget.after_cancel(self.timer)
+            self.timer = None
+
+    def __time(self):
+        return self.now if self.now is not None else self.clock()
+
+    def __fire(self):
+        self.timer = None
+        self.__run()
+        self.__arm()
+
+    def __run(self):
+        if self.start_time is None or self.paused_at is not None:
+            return
+        now = self.elapsed()
+        due = now + DUE_TOLERANCE
+        events = self.events
+        while events and events[0][0] <= due:
+            deadline, order, method = heapq.heappop(events)
+            self.jitter.append((deadline, now - deadline))
+            if self.probe is not None:
+                self.probe.begin(self.start_time + deadline / 1000)
+            method()
+            if self.start_time is None or self.paused_at is not None: #THE EVENT CANCELLED OR PAUSED THE TIMELINE
+                return
+            events = self.events
@@ -0,0 +1,240 @@
+import heapq
+from core.audio.library import create_library
+from core.pitch import get_midi, get_note, LOWEST_MIDI, HIGHEST_MIDI
+from core.configurations import NOTE_SELECTION, ADAPTIVE_HISTORY, ADAPTIVE_ERROR_DECAY, \
+    ADAPTIVE_BASE_WEIGHT, ADAPTIVE_RETRY_ROUNDS, ADAPTIVE_FIRST_INTERVAL, ADAPTIVE_RESTING_FACTOR
+
+UNKNOWN_ERROR_RATE = 0.5
+
+
+class FenwickTree:
+    """
+        Class used to keep the weights of a pool of items, so changing one weight, summing the weights of a prefix
+        of the pool and finding the item at a cumulative weight are O(log n).
+
+           @weights : list
+                the initial weight of every item
+
+        Methods
+        -------
+        update(index, weight)
+            Sets the weight of the given item
+
+        get(index)
+            Returns the weight of the given item
+
+        prefix(index)
+            Returns the sum of the weights of the items before the given index
+
+        find(value)
+            Returns the index of the item where the cumulative weight goes past the given value
+    """
+    def __init__(self, weights):
+        self.size = len(weights)
+        self.weights = list(weights)
+        self.tree = [0.0] + self.weights
+        for index in range(1, self.size + 1):
+            parent = index + (index & -index)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[index]
+        self.step = 1 << max(0, self.size.bit_length() - 1)
+
+    def update(self, index, weight):
+        difference = weight - self.weights[index]
+        self.weights[index] = weight
+        index += 1
+        while index <= self.size:
+            self.tree[index] += difference
+            index += index & -index
+
+    def get(self, index):
+        return self.weights[index]
+
+    def prefix(self, index):
+        total = 0.0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    def find(self, value):
+        position = 0
+        step = self.step
+        while step:
+            following = position + step
+            if following <= self.size and self.tree[following] <= value:
+                position = following
+                value -= self.tree[following]
+            step >>= 1
+        return min(position, self.size - 1)
+
+
+def get_voiced(library, targets):
+    """
+        Returns the given (note, octave) pairs that have at least one sound in the given library, and raises a
+        ValueError if none of them has one.
+    """
+    voiced = [target for target in targets if library.get_ids(*target)]
+    if not voiced:
+        raise ValueError("None of the notes of the game has a sound in the sample library.")
+    return voiced
+
+
+class UniformSelector:
+    """
+        Class used to pick every note and sound id of a game with the same probability. Only the sounds of the
+        library are picked: the notes without any sound are removed once by get_targets(), so picking a round is
+        a single choice among the notes and one among their ids.
+
+           @library : SampleLibrary, optional
+                the sounds that exist. Defaults to the library of the configured sample source
+
+        Methods
+        -------
+        get_targets(targets)
+            Returns the given (note, octave) pairs that have a sound. Raises a ValueError if none has one
+
+        select(targets, rng)
+            Returns the (note, octave, id) of the next round, picked from the (note, octave) pairs returned by
+            get_targets()
+
+        update(round)
+            Does nothing
+    """
+    def __init__(self, library = None):
+        self.library = library if library is not None else create_library()
+
+    def get_targets(self, targets):
+        return get_voiced(self.library, targets)
+
+    def select(self, targets, rng):
+        note, octave = rng.choice(targets)
+        return note, octave, rng.choice(self.library.get_ids(note, octave))
+
+    def update(self, round):
+        pass
+
+
+class AdaptiveSelector:
+    """
+        Class used to pick the notes the player gets wrong more often than the notes they know. The pool holds every
+        sound of the library, so the notes may have different numbers of sounds, and the weight of each sound is the error rate of its note plus a
+        base weight. Once played, a sound rests for some rounds, like in spaced repetition: a few rounds after a
+        wrong answer, and twice as many rounds as the last time after a right one. The weights are kept in a
+        FenwickTree, so picking a sound and updating the weights after an answer are O(log n).
+
+           @store : AttemptStore, optional
+                if given, the error rates start from the last rounds of the player
+
+           @library : SampleLibrary, optional
+                the sounds that exist. Defaults to the library of the configured sample source
+
+        Methods
+        -------
+        get_targets(targets)
+            Returns the given (note, octave) pairs that have a sound. Raises a ValueError if none has one
+
+        select(targets, rng)
+            Returns the (note, octave, id) of the next round, picked from the given (note, octave) pairs. The pairs
+            are expected to be consecutive notes, like the keys of a piano. Raises a ValueError if none of them has
+            a sound
+
+        update(round)
+            Updates the error rate of the note of the given GameRound and makes its sound rest
+
+        get_error_rate(note, octave)
+            Returns the error rate of the given note
+    """
+    def __init__(self, store = None, library = None):
+        pitches = HIGHEST_MIDI - LOWEST_MIDI + 1
+        self.library = library if library is not None else create_library()
+        self.variants = []
+        self.starts = []
+        for pitch in range(pitches):
+            self.starts.append(len(self.variants))
+            self.variants.extend((pitch, id) for id in self.library.get_ids(*get_note(pitch + LOWEST_MIDI)))
+        self.starts.append(len(self.variants))
+        self.indexes = {variant: index for index, variant in enumerate(self.variants)}
+        self.error_rates = [UNKNOWN_ERROR_RATE] * pitches
+        self.intervals = [0] * len(self.variants)
+        self.due = [0] * len(self.variants)
+        self.resting = []
+        self.round = 0
+        if store is not None:
+            self.__load(store)
+        self.tree = FenwickTree([self.__get_weight(index) for index in range(len(self.variants))])
+
+    def select(self, targets, rng):
+        self.round += 1
+        self.__wake_up()
+        pitches = [get_midi(note, octave) - LOWEST_MIDI for note, octave in targets]
+        low, high = self.starts[min(pitches)], self.starts[max(pitches) + 1]
+        start = self.tree.prefix(low)
+        total = self.tree.prefix(high) - start
+        if total <= 0:
+            raise ValueError("None of the notes of the game has a sound in the sample library.")
+        index = min(max(self.tree.find(start + rng.random() * total), low), high - 1)
+        pitch, id = self.variants[index]
+        return (*get_note(pitch + LOWEST_MIDI), id)
+
+    def get_targets(self, targets):
+        return get_voiced(self.library, targets)
+
+    def update(self, round):
+        pitch = get_midi(*round.target) - LOWEST_MIDI
+        if round.answer is not None:
+            self.__update_error_rate(pitch, round.answer != round.target)
+        index = self.indexes.get((pitch, round.id))
+        if index is None:
+            return
+        if round.answer is not None:
+            if round.answer == round.target:
+                self.intervals[index] = max(ADAPTIVE_FIRST_INTERVAL, self.intervals[index] * 2)
+            else:
+                self.intervals[index] = ADAPTIVE_RETRY_ROUNDS
+        self.due[index] = self.round + max(self.intervals[index], ADAPTIVE_RETRY_ROUNDS)
+        heapq.heappush(self.resting, (self.due[index], index))
+        for variant in range(self.starts[pitch], self.starts[pitch + 1]):
+            self.tree.update(variant, self.__get_weight(variant))
+
+    def get_error_rate(self, note, octave):
+        return self.error_rates[get_midi(note, octave) - LOWEST_MIDI]
+
+    def __get_weight(self, index):
+        weight = ADAPTIVE_BASE_WEIGHT + self.error_rates[self.variants[index][0]]
+        if self.due[index] > self.round:
+            weight *= ADAPTIVE_RESTING_FACTOR
+        return weight
+
+    def __update_error_rate(self, pitch, wrong):
+        self.error_rates[pitch] += ADAPTIVE_ERROR_DECAY * (wrong - self.error_rates[pitch])
+
+    def __wake_up(self):
+        while self.resting and self.resting[0][0] <= self.round:
+            due, index = heapq.heappop(self.resting)
+            if self.due[index] == due:
+                self.tree.update(index, self.__get_weight(index))
+
+    def __load(self, store):
+        for row in reversed(store.get_history(ADAPTIVE_HISTORY)):
+            if row['pressed'] is not None and LOWEST_MIDI <= row['expected'] <= HIGHEST_MIDI:
+                self.__update_error_rate(row['expected'] - LOWEST_MIDI, row['pressed'] != row['expected'])
+
+
+def create_selector(name = NOTE_SELECTION, store = None, library = None):
+    """
+        Returns the note selector with the given name: 'uniform' or 'adaptive'.
+
+        Parameters
+        ----------
+        name : str, optional
+        store : AttemptStore, optional
+            the history used by the adaptive selector
+        library : SampleLibrary, optional
+            the sounds that can be picked
+    """
+    if name == 'uniform':
+        return UniformSelector(library)
+    elif name == 'adaptive':
+        return AdaptiveSelector(store, library)
+    raise AttributeError("Please select a note selection: 'uniform' or 'adaptive'.")
@@ -0,0 +1,387 @@
+import random
+import time
+import uuid
+from core.game.scheduler import GameScheduler
+from core.game.selection import UniformSelector
+from core.pitch import get_midi
+from core.configurations import PRACTICE_GUESS_TIME, TIME_FOR_SHOW_ANSWER, TOTAL_TIME
+
+PRACTICE = 'practice'
+TEST = 'test'
+ANSWER_RESTORE_TIME = TIME_FOR_SHOW_ANSWER - 500 #MS, WHEN THE ANSWER IS HIDDEN AGAIN
+
+
+class GameSink:
+    """
+        Class used to receive the events of a GameSession. Does nothing, so a session can run without audio and
+        without a window. A view subclasses it, or implements the same methods.
+
+        Methods
+        -------
+        on_play(note, octave, id)
+            plays the sound of a round
+
+        on_play_chord(sounds, delay)
+            plays the (note, octave, id) sounds of a round of several notes, each one starting delay ms after the
+            previous one
+
+        on_show_answer(note, octave)
+            shows the answer of a round
+
+        on_hide_answer(note, octave)
+            hides the answer of a round
+
+        on_game_over(session)
+            ends the game
+    """
+    def on_play(self, note, octave, id):
+        pass
+
+    def on_play_chord(self, sounds, delay):
+        pass
+
+    def on_show_answer(self, note, octave):
+        pass
+
+    def on_hide_answer(self, note, octave):
+        pass
+
+    def on_game_over(self, session):
+        pass
+
+
+class GameRound:
+    """
+        Class used to represent one round of a game: the notes that were played and the answer of the player. In a
+        round of several notes, the target is the note picked by the selector and the answer is the target when
+        every note was pressed, or else the wrong note nearest to the target.
+
+        Attributes
+        ----------
+        index : int
+            the position of the round in its game
+        target : (str, int)
+            the note and the octave that was played
+        id : int
+            the id of the sound that was played
+        notes : list
+            the (note, octave) pairs that were played, in the order they were played
+        ids : list
+            the id of the sound of every note
+        answers : list
+            the (note, octave) pairs the player pressed so far, in a round of several notes
+        played_at : float
+            the ms from the start of the game to the sound, or None if it was not played yet
+        answer : (str, int)
+            the note and the octave the player pressed, or None
+        answered_at : float
+            the ms from the start of the game to the answer, or None
+
+        Methods
+        -------
+        is_correct()
+            :returns: True if the answer is the target
+
+        get_response_time()
+            :returns: the ms from the sound to the answer, or None
+    """
+    def __init__(self, index, target, id, notes = None, ids = None):
+        self.index = index
+        self.target = target
+        self.id = id
+        self.notes = notes if notes is not None else [target]
+        self.ids = ids if ids is not None else [id]
+        self.answers = []
+        self.played_at = None
+        self.answer = None
+        self.answered_at = None
+
+    def is_correct(self):
+        return self.answer == self.target
+
+    def get_response_time(self):
+        if self.answered_at is None or self.played_at is None:
+            return None
+        return self.answered_at - self.played_at
+
+
+class GameSession:
+    """
+        Class used to run one game without any widget. Every round is picked by the selector when its sound is
+        played, so the selector can adapt to the previous answers, and every event of the game is called by a
+        GameScheduler. With a Tk widget the scheduler waits in the Tk loop; without one,
+        the game only moves when tick() is called, so it can be simulated faster than real time.
+
+        In practice mode, a sound is played every TOTAL_TIME ms and its answer is shown PRACTICE_GUESS_TIME ms later.
+        In test mode, a sound is played and the answer is shown when the player presses a key, then the next sound
+        is played TIME_FOR_SHOW_ANSWER ms later.
+
+        With a timeline, like a melody read from a MIDI file, the notes of the rounds and their times come from the
+        timeline and only the sound ids are picked by the selector. The notes without any sound are skipped. The timeline is read one note ahead, so only the
+        next round waits in the scheduler. In practice mode, every note is played at its time and its answer is
+        shown PRACTICE_GUESS_TIME ms later, or when the next note is played if it comes sooner. In test mode, the
+        next note waits until TIME_FOR_SHOW_ANSWER ms after the answer, and the rest of the timeline is delayed by
+        the same time.
+
+        With a chord picker, and without a timeline, every round plays an interval or a chord built around the note
+        picked by the selector, and a round is answered when as many keys as notes were pressed.
+
+           @mode : str
+                'practice' or 'test'
+
+           @targets : list
+                the (note, octave) pairs the rounds are picked from. The notes without any sound are skipped, and a
+                ValueError is raised if none of them has one
+
+           @count : int
+                the number of rounds. With a timeline, None plays the whole timeline
+
+           @sink : GameSink, optional
+                receives the sounds, the answers and the end of the game
+
+           @scheduler : GameScheduler, optional
+                the scheduler of the game. Defaults to a scheduler without widget, driven by tick()
+
+           @clock : method, optional
+                returns the current time in seconds, used when no scheduler is given
+
+           @rng : random.Random, optional
+                the random numbers of the selector
+
+           @selector : UniformSelector or AdaptiveSelector, optional
+                picks the note and the sound id of every round. Defaults to a UniformSelector
+
+           @recorders : list, optional
+                objects with a record(session, round) method, like AttemptStore or ConfusionMatrix. Every round is
+                recorded when it is answered, or when its answer is shown in practice mode
+
+           @timeline : iterable, optional
+                (ms, note, octave) tuples in time order, the ms being measured from the start of the timeline
+
+           @chords : ChordPicker, optional
+                builds the interval or the chord of every round. Defaults to rounds of one note
+
+        Methods
+        -------
+        start(now)
+            starts the game at the given clock time, now by default
+
+        press(note, octave, now)
+            answers the current round at the given clock time, now by default. :returns: True if a round was answered,
+            or is waiting for its other notes
+
+        tick(now)
+            calls every event due at the given clock time, now by default
+
+        stop()
+            stops the game without calling on_game_over
+
+        is_running()
+            :returns: True if the game was started and is not over
+
+        is_awaiting()
+            :returns: True if a sound was played and its round was not answered yet
+
+        get_next_time()
+            :returns: the clock time of the next event, or None
+
+        get_rounds()
+            :returns: the GameRound of every round played so far
+
+        get_octaves()
+            :returns: the lowest and the highest octave of the notes the rounds are picked from
+
+        get_results()
+            :returns: a dictionary with the number of rounds, answers and correct answers, the accuracy and the mean
+            response time in ms
+    """
+    def __init__(self, mode, targets, count, sink = None, scheduler = None, clock = time.monotonic, rng = None, selector = None, recorders = (),
+                 timeline = None, chords = None):
+        if mode not in (PRACTICE, TEST):
+            raise AttributeError("Please select a game mode: 'practice' or 'test'.")
+        self.mode = mode
+        self.targets = list(targets)
+        self.count = count
+        self.sink = sink if sink is not None else GameSink()
+        self.scheduler = scheduler if scheduler is not None else GameScheduler(None, clock = clock)
+        self.rng = rng if rng is not None else random.Random()
+        self.selector = selector if selector is not None else UniformSelector()
+        self.voiced = self.selector.get_targets(self.targets)
+        self.recorders = list(recorders)
+        self.timeline = timeline
+        self.chords = chords
+        if chords is not None:
+            self.voices = UniformSelector(self.selector.library)
+        self.events = None
+        self.following = None
+        self.shift = 0
+        self.id = None
+        self.started_at = None
+        self.rounds = []
+        self.current = None
+        self.awaiting = False
+        self.over = False
+
+    def start(self, now = None):
+        self.scheduler.cancel()
+        self.id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.rounds = []
+        self.current = None
+        self.awaiting = False
+        self.over = False
+        if self.timeline is not None:
+            self.events = iter(self.timeline)
+            self.following = self.__pull(0)
+            if self.following is None:
+                self.scheduler.schedule(0, self.__game_over)
+            else:
+                self.shift = -self.following[0]
+                self.scheduler.schedule(0, lambda: self.__play_event(0))
+        elif self.mode == PRACTICE:
+            for index in range(self.count):
+                start = index * TOTAL_TIME
+                self.scheduler.schedule(start, lambda index = index: self.__play(index))
+                self.scheduler.schedule(start + PRACTICE_GUESS_TIME, lambda index = index: self.__show_answer(index))
+            self.scheduler.schedule(self.count * TOTAL_TIME, self.__game_over)
+        else:
+            self.scheduler.schedule(0, lambda: self.__play(0))
+        self.scheduler.start(now)
+
+    def press(self, note, octave, now = None):
+        if not self.awaiting:
+            return False
+        round = self.rounds[self.current]
+        if len(round.notes) > 1:
+            if (note, octave) in round.answers:
+                return True
+            round.answers.append((note, octave))
+            if len(round.answers) < len(round.notes):
+                return True
+            round.answer = self.__get_answer(round)
+        else:
+            round.answer = (note, octave)
+        round.answered_at = self.scheduler.elapsed(now)
+        self.awaiting = False
+        self.__finish(round)
+        if self.mode == TEST and self.timeline is not None:
+            self.__show_answer(self.current, round.answered_at)
+            at = round.answered_at + TIME_FOR_SHOW_ANSWER
+            if self.following is None:
+                self.scheduler.schedule(at, self.__game_over)
+            else:
+                self.shift = max(self.shift, at - self.following[0])
+                index = self.current + 1
+                self.scheduler.schedule(self.following[0] + self.shift, lambda: self.__play_event(index))
+        elif self.mode == TEST:
+            self.__show_answer(self.current, round.answered_at)
+            following = self.current + 1
+            if following < self.count:
+                self.scheduler.schedule(round.answered_at + TIME_FOR_SHOW_ANSWER, lambda: self.__play(following))
+            else:
+                self.scheduler.schedule(round.answered_at + TIME_FOR_SHOW_ANSWER, self.__game_over)
+        return True
+
+    def tick(self, now = None):
+        self.scheduler.tick(now)
+
+    def stop(self):
+        self.scheduler.cancel()
+        self.awaiting = False
+
+    def is_running(self):
+        return self.scheduler.is_running() and not self.over
+
+    def is_awaiting(self):
+        return self.awaiting
+
+    def get_next_time(self):
+        deadline = self.scheduler.get_next_deadline()
+        if deadline is None or not self.scheduler.is_running():
+            return None
+        return self.scheduler.start_time + deadline / 1000
+
+    def get_rounds(self):
+        return list(self.rounds)
+
+    def get_octaves(self):
+        return min(octave for note, octave in self.targets), max(octave for note, octave in self.targets)
+
+    def get_results(self):
+        answered = [round for round in self.rounds if round.answer is not None]
+        correct = sum(1 for round in answered if round.is_correct())
+        responses = [round.get_response_time() for round in answered]
+        return {'rounds': len(self.rounds), 'answered': len(answered), 'correct': correct,
+                'accuracy': correct / len(answered) if answered else 0,
+                'mean_response': sum(responses) / len(responses) if responses else 0}
+
+    def __play(self, index, target = None):
+        note, octave, id = self.selector.select([target] if target is not None else self.voiced, self.rng)
+        round = GameRound(index, (note, octave), id)
+        if self.chords is not None and target is None:
+            round.notes = self.chords.pick(note, octave, self.voiced, self.rng)
+            round.ids = [id if sound == round.target else self.voices.select([sound], self.rng)[2] for sound in round.notes]
+        self.rounds.append(round)
+        round.played_at = self.scheduler.elapsed()
+        self.current = index
+        self.awaiting = True
+        if len(round.notes) > 1:
+            self.sink.on_play_chord([(*sound, id) for sound, id in zip(round.notes, round.ids)], self.chords.get_delay())
+        else:
+            self.sink.on_play(*round.target, round.id)
+
+    def __play_event(self, index):
+        time, note, octave = self.following
+        self.__play(index, (note, octave))
+        self.following = self.__pull(index + 1)
+        if self.mode == TEST:
+            return
+        start = time + self.shift
+        if self.following is None:
+            self.scheduler.schedule(start + PRACTICE_GUESS_TIME, lambda: self.__show_answer(index))
+            self.scheduler.schedule(start + TOTAL_TIME, self.__game_over)
+        else:
+            following = self.following[0] + self.shift
+            self.scheduler.schedule(min(start + PRACTICE_GUESS_TIME, following), lambda: self.__show_answer(index))
+            self.scheduler.schedule(following, lambda: self.__play_event(index + 1))
+
+    def __pull(self, index):
+        if self.count is not None and index >= self.count:
+            return None
+        for event in self.events:
+            if self.selector.library.get_ids(event[1], event[2]):
+                return event
+        return None
+
+    def __show_answer(self, index, at = None):
+        if self.mode == PRACTICE:
+            if self.awaiting:
+                self.__finish(self.rounds[index])
+            self.awaiting = False
+        notes = self.rounds[index].notes
+        for note in notes:
+            self.sink.on_show_answer(*note)
+        at = at if at is not None else self.scheduler.elapsed()
+        self.scheduler.schedule(at + ANSWER_RESTORE_TIME, lambda: self.__hide_answer(notes))
+
+    def __hide_answer(self, notes):
+        for note in notes:
+            self.sink.on_hide_answer(*note)
+
+    def __get_answer(self, round):
+        wrong = [answer for answer in round.answers if answer not in round.notes]
+        if not wrong:
+            return round.target
+        pitch = get_midi(*round.target)
+        return min(wrong, key = lambda answer: abs(get_midi(*answer) - pitch))
+
+    def __finish(self, round):
+        self.selector.update(round)
+        for recorder in self.recorders:
+            recorder.record(self, round)
+
+    def __game_over(self):
+        self.over = True
+        self.awaiting = False
+        self.scheduler.cancel()
+        self.sink.on_game_over(self)
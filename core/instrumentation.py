@@ -0,0 +1,72 @@
+import time
+from array import array
+from core.configurations import LATENCY_PROBE_ENABLED, LATENCY_BUFFER_SIZE
+
+STAGES = ('lookup', 'play', 'color')
+
+
+class LatencyProbe:
+    """
+        Class used to measure the latency between the dispatch of an action (a key press or a game event) and the
+        moments its sound is found, its sound starts playing and its key changes color. The latencies are kept in
+        fixed-size ring buffers, so recording one is a clock read and an array store.
+
+           @size : int, optional
+                the number of latencies kept for each stage
+
+           @enabled : bool, optional
+                if False, nothing is recorded
+
+        Methods
+        -------
+        begin(at)
+            starts measuring an action dispatched at the given time.monotonic() time. Defaults to now
+
+        mark(stage)
+            records the ms elapsed since the dispatch of the current action for the given stage
+
+        summary()
+            :returns: a dictionary with the number of measurements and the p50, p95 and p99 latencies of each stage
+
+        report()
+            prints the summary
+    """
+    def __init__(self, size = LATENCY_BUFFER_SIZE, enabled = LATENCY_PROBE_ENABLED):
+        self.size = size
+        self.enabled = enabled
+        self.samples = {stage: array('d', [0.0]) * size for stage in STAGES}
+        self.counts = dict.fromkeys(STAGES, 0)
+        self.start = None
+
+    def begin(self, at = None):
+        if self.enabled:
+            self.start = time.monotonic() if at is None else at
+
+    def mark(self, stage):
+        if self.start is None:
+            return
+        count = self.counts[stage]
+        self.samples[stage][count % self.size] = (time.monotonic() - self.start) * 1000
+        self.counts[stage] = count + 1
+
+    def summary(self):
+        summary = {}
+        for stage in STAGES:
+            count = min(self.counts[stage], self.size)
+            latencies = sorted(self.samples[stage][:count])
+            summary[stage] = {'count': self.counts[stage], 'p50': self.__percentile(latencies, 50),
+                              'p95': self.__percentile(latencies, 95), 'p99': self.__percentile(latencies, 99)}
+        return summary
+
+    def report(self):
+        for stage, values in self.summary().items():
+            print(f"{stage}: {values['count']} measurements, p50 {values['p50']:.2f} ms, "
+                  f"p95 {values['p95']:.2f} ms, p99 {values['p99']:.2f} ms")
+
+    def __percentile(self, latencies, percent):
+        if not latencies:
+            return 0
+        return latencies[min(len(latencies) - 1, len(latencies) * percent // 100)]
+
+
+probe = LatencyProbe()
@@ -0,0 +1,187 @@
+import heapq
+import struct
+
+BLOCK = 64 * 1024 #BYTES READ AT ONCE FROM A TRACK
+MARGIN = 16 #BYTES, THE LONGEST EVENT HEADER
+DEFAULT_TEMPO = 500000 #MICROSECONDS PER QUARTER NOTE, 120 BPM
+DRUMS = 9 #THE CHANNEL OF THE PERCUSSIONS, COUNTED FROM 0
+
+TEMPO = 0
+NOTE = 1
+
+
+class MidiFile:
+    """
+        Class used to read the notes of a Standard MIDI File lazily. Only the headers of the chunks are read when
+        the file is opened. Every track is then read in blocks by its own generator, the tracks are merged in time
+        order with a heap, and the ticks are converted to seconds with the tempo changes met on the way, so the
+        first notes are available at once and the memory used does not grow with the size of the file.
+
+           @path : str
+                the path of the .mid file. Raises a ValueError if it is not a Standard MIDI File
+
+        Methods
+        -------
+        get_notes(channels, tracks)
+            Yields a (time, pitch, velocity, channel, track) tuple for every note that starts, in time order. The
+            time is in seconds from the start of the file and the pitch is a MIDI number
+
+        read_track(index)
+            Yields the tempo changes and the note starts of the given track, as (tick, TEMPO, tempo) and
+            (tick, NOTE, pitch, velocity, channel, track) tuples
+    """
+    def __init__(self, path):
+        self.path = path
+        self.tracks = []
+        with open(path, 'rb') as f:
+            header = f.read(14)
+            if len(header) < 14:
+                raise ValueError(f"{path} is not a Standard MIDI File")
+            chunk, length, self.format, count, self.division = struct.unpack('>4sIHHH', header)
+            if chunk != b'MThd' or length < 6:
+                raise ValueError(f"{path} is not a Standard MIDI File")
+            f.seek(length - 6, 1)
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    break
+                chunk, length = struct.unpack('>4sI', header)
+                if chunk == b'MTrk':
+                    self.tracks.append((f.tell(), length))
+                f.seek(length, 1)
+        if self.format == 2:
+            raise ValueError(f"{path} holds independent sequences (format 2), which are not supported")
+
+    def get_notes(self, channels = None, tracks = None):
+        """
+            Parameters
+            ----------
+            channels : iterable, optional
+                the channels whose notes are yielded, counted from 0. Defaults to every channel but the drums
+            tracks : iterable, optional
+                the tracks whose notes are yielded. Defaults to every track
+        """
+        channels = set(channels) if channels is not None else set(range(16)) - {DRUMS}
+        tracks = set(tracks) if tracks is not None else set(range(len(self.tracks)))
+        if self.division & 0x8000:
+            frames = 256 - (self.division >> 8)
+            seconds_per_tick = 1 / (frames * (self.division & 0xff))
+        else:
+            seconds_per_tick = DEFAULT_TEMPO / 1e6 / self.division
+        start_tick = 0
+        start_time = 0.0
+        readers = [self.read_track(index) for index in range(len(self.tracks))]
+        for event in heapq.merge(*readers, key = lambda event: event[0]):
+            if event[1] == TEMPO:
+                if not self.division & 0x8000:
+                    start_time += (event[0] - start_tick) * seconds_per_tick
+                    start_tick = event[0]
+                    seconds_per_tick = event[2] / 1e6 / self.division
+            elif event[4] in channels and event[5] in tracks:
+                yield start_time + (event[0] - start_tick) * seconds_per_tick, event[2], event[3], event[4], event[5]
+
+    def read_track(self, index):
+        offset, length = self.tracks[index]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            remaining = length
+            data = b''
+            position = 0
+            tick = 0
+            running = 0
+
+            def take(count):
+                nonlocal position, remaining
+                available = data[position:position + count]
+                position += len(available)
+                if len(available) < count:
+                    rest = f.read(min(count - len(available), remaining))
+                    remaining -= len(rest)
+                    available += rest
+                return available
+
+            def skip(count):
+                nonlocal position, remaining
+                available = min(count, len(data) - position)
+                position += available
+                if available < count:
+                    skipped = min(count - available, remaining)
+                    f.seek(skipped, 1)
+                    remaining -= skipped
+
+            try:
+                while True:
+                    if len(data) - position < MARGIN and remaining:
+                        block = f.read(min(BLOCK, remaining))
+                        remaining -= len(block)
+                        data = data[position:] + block
+                        position = 0
+                    if position >= len(data):
+                        return
+                    delta = 0
+                    while True:
+                        byte = data[position]
+                        position += 1
+                        delta = delta << 7 | byte & 0x7f
+                        if byte < 0x80:
+                            break
+                    tick += delta
+                    status = data[position]
+                    if status >= 0x80:
+                        position += 1
+                        if status < 0xf0: #ONLY THE CHANNEL EVENTS SET THE RUNNING STATUS
+                            running = status
+                    else:
+                        status = running
+                    kind = status & 0xf0
+                    if kind == 0x90 or kind == 0x80:
+                        pitch, velocity = data[position], data[position + 1]
+                        position += 2
+                        if kind == 0x90 and velocity:
+                            yield tick, NOTE, pitch, velocity, status & 0x0f, index
+                    elif kind == 0xc0 or kind == 0xd0:
+                        position += 1
+                    elif kind != 0xf0:
+                        position += 2
+                    else:
+                        kind = data[position] if status == 0xff else None
+                        if status == 0xff:
+                            position += 1
+                        size = 0
+                        while True:
+                            byte = data[position]
+                            position += 1
+                            size = size << 7 | byte & 0x7f
+                            if byte < 0x80:
+                                break
+                        if kind == 0x51:
+                            yield tick, TEMPO, int.from_bytes(take(size), 'big')
+                        elif kind == 0x2f:
+                            return
+                        else:
+                            skip(size)
+            except IndexError: #A TRUNCATED TRACK ENDS AT ITS LAST WHOLE EVENT
+                return
+
+
+def get_melody(notes, tolerance = 0.02):
+    """
+        Yields the highest note of every group of notes that start together, so a chord gives one note of the
+        melody. Only one group is kept in memory.
+
+        Parameters
+        ----------
+        notes : iterable
+            (time, pitch, velocity, channel, track) tuples in time order, like the ones of MidiFile.get_notes()
+        tolerance : float, optional
+            the seconds between the notes of a group
+    """
+    group = None
+    for note in notes:
+        if group is not None and note[0] - group[0] > tolerance:
+            yield group
+            group = None
+        if group is None or note[1] > group[1]:
+            group = note if group is None else (group[0], *note[1:])
+    if group is not None:
+        yield group
@@ -0,0 +1,67 @@
+from core.configurations import NOTES, ANCHOR_INTERVAL
+
+A4_MIDI = 69
+A4_FREQUENCY = 440.0 #HZ
+SEMITONES = {note: semitone for semitone, note in enumerate(NOTES)}
+LOWEST_MIDI = 24 #C1
+HIGHEST_MIDI = 119 #B8
+
+
+def get_midi(note, octave):
+    """
+        :returns: the MIDI number of the given note. A4 is 69
+    """
+    return 12 * (octave + 1) + SEMITONES[note]
+
+
+def get_note(midi):
+    """
+        :returns: the (note, octave) pair of the given MIDI number
+    """
+    octave, semitone = divmod(midi, 12)
+    return NOTES[semitone], octave - 1
+
+
+def get_name(midi):
+    """
+        :returns: the name of the given MIDI number, like 'Cb4'. The names of the 8 octaves are precomputed
+    """
+    if LOWEST_MIDI <= midi <= HIGHEST_MIDI:
+        return NAMES[midi - LOWEST_MIDI]
+    note, octave = get_note(midi)
+    return f"{note}{octave}"
+
+
+def get_frequency(note, octave):
+    """
+        :returns: the frequency in Hz of the given note, in equal temperament
+    """
+    return midi_to_frequency(get_midi(note, octave))
+
+
+def midi_to_frequency(midi):
+    """
+        :returns: the frequency in Hz of the given MIDI number, in equal temperament. Fractional numbers are allowed
+    """
+    return A4_FREQUENCY * 2 ** ((midi - A4_MIDI) / 12)
+
+
+def get_anchor(note, octave, interval = ANCHOR_INTERVAL):
+    """
+        Returns the (note, octave) pair of the anchor nearest to the given note. The anchors are every interval-th
+        semitone from C1. On a tie, the lower anchor is used.
+    """
+    offset = get_midi(note, octave) - LOWEST_MIDI
+    anchor = (offset + (interval - 1) // 2) // interval * interval
+    last = (HIGHEST_MIDI - LOWEST_MIDI) // interval * interval
+    return get_note(LOWEST_MIDI + min(anchor, last))
+
+
+def is_anchor(note, octave, interval = ANCHOR_INTERVAL):
+    """
+        :returns: True if the given note is an anchor
+    """
+    return (get_midi(note, octave) - LOWEST_MIDI) % interval == 0
+
+
+NAMES = tuple(f"{note}{octave}" for note, octave in map(get_note, range(LOWEST_MIDI, HIGHEST_MIDI + 1)))
@@ -0,0 +1,121 @@
+import json
+import os
+import sys
+import threading
+from core import default_settings
+from core.configurations import SETTINGS_SAVE_DELAY
+from definitions import SETTINGS_PATH
+
+DEFAULTS = {name: getattr(default_settings, name) for name in dir(default_settings) if name.isupper()}
+
+
+class Settings:
+    """
+        Class used to keep the settings of the player. The settings start from the values of default_settings.py,
+        replaced by the ones saved in a JSON file. Changing a setting calls its subscribers at once, on the calling
+        thread, and saves the file a moment later on a timer thread, so many changes are saved with one write. The
+        file is written to a temporary file that replaces the old one, so a crash never leaves half a file.
+
+           @path : str, optional
+                the path of the JSON file
+
+           @delay : float, optional
+                the seconds between the last change and the save
+
+        Methods
+        -------
+        get(name)
+            Returns the value of the given setting
+
+        set(name, value)
+            Changes the given setting, calls its subscribers and schedules a save
+
+        update(values)
+            Changes every setting of the given dictionary
+
+        subscribe(name, method)
+            Calls the method with the new value every time the given setting changes. :returns: a method that
+            removes the subscription
+
+        flush()
+            Saves the pending changes now
+    """
+    def __init__(self, path = SETTINGS_PATH, delay = SETTINGS_SAVE_DELAY):
+        self.path = path
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.values = dict(DEFAULTS)
+        self.values.update(self.__load())
+        self.subscribers = {}
+        self.timer = None
+
+    def get(self, name):
+        return self.values[name]
+
+    def set(self, name, value):
+        self.update({name: value})
+
+    def update(self, values):
+        changed = []
+        with self.lock:
+            for name, value in values.items():
+                if name not in DEFAULTS:
+                    raise KeyError(f"Unknown setting: {name}")
+                if self.values[name] != value:
+                    self.values[name] = value
+                    changed.append((name, value))
+            if changed:
+                self.__schedule_save()
+        for name, value in changed:
+            for method in list(self.subscribers.get(name, [])):
+                method(value)
+
+    def subscribe(self, name, method):
+        self.subscribers.setdefault(name, []).append(method)
+        return lambda: self.subscribers[name].remove(method)
+
+    def flush(self):
+        with self.lock:
+            if self.timer is None:
+                return
+            self.timer.cancel()
+            self.timer = None
+        self.__save()
+
+    def __schedule_save(self):
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = threading.Timer(self.delay, self.__save_later)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def __save_later(self):
+        with self.lock:
+            self.timer = None
+        self.__save()
+
+    def __save(self):
+        with self.lock:
+            data = json.dumps(self.values, indent = 2)
+        temporary = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+        except OSError as error:
+            print(f"Could not save the settings: {error}", file = sys.stderr)
+
+    def __load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(saved, dict):
+            return {}
+        return {name: value for name, value in saved.items() if name in DEFAULTS and type(value) is type(DEFAULTS[name])}
+
+
+settings = Settings()
@@ -1,39 +1,112 @@
+import hashlib
+import importlib.util
 import os
-import subprocess
+import re
 import sys
+import time
+from contextlib import contextmanager
 from definitions import ROOT_DIR
-settings = ROOT_DIR+"\\settings.txt"
 
-_string = "pip install -r requirements.txt"
+REQUIREMENTS = os.path.join(ROOT_DIR, 'requirements.txt')
+STAMP = os.path.join(ROOT_DIR, '.requirements_stamp')
+
 
 def setup():
+    """
+        Checks that every requirement of requirements.txt can be imported, without importing it. Once the check
+        passes, a stamp file keyed by requirements.txt and the Python interpreter is written, so the next launches
+        skip the check. Exits with a message that explains how to install the requirements if one is missing.
+    """
+    stamp = _get_stamp()
+    if _read_stamp() == stamp:
+        return
+    missing = get_missing_requirements()
+    if missing:
+        raise SystemExit(f"Missing requirements: {', '.join(missing)}.\n"
+                         f"Install them with: {sys.executable} -m pip install -r {REQUIREMENTS}")
+    _write_stamp(stamp)
+
+
+def get_missing_requirements():
+    """
+        :returns: the requirements of requirements.txt whose module cannot be found
+    """
+    missing = []
+    for requirement in _read_requirements():
+        if importlib.util.find_spec(requirement) is None:
+            missing.append(requirement)
+    return missing
+
+
+class StartupProfiler():
+    """
+        Class used to measure the duration of each phase of the startup.
+
+        @enabled : bool, optional
+            if False, the phases are not measured and nothing is printed
+
+        Methods
+        -------
+        phase(name)
+            context manager that measures the code it wraps as the phase with the given name
+
+        report()
+            prints the duration of every phase and the total startup time
+    """
+    def __init__(self, enabled = True):
+        self.enabled = enabled
+        self.phases = []
+        self.start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        yield
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self):
+        if not self.enabled:
+            return
+        for name, duration in self.phases:
+            print(f"{name:<24}{duration * 1000:>10.1f} ms")
+        print(f"{'total':<24}{(time.perf_counter() - self.start) * 1000:>10.1f} ms")
+
+
+def _read_requirements():
+    requirements = []
+    with open(REQUIREMENTS) as f:
+        for line in f:
+            name = re.split(r'[\s=<>!~;\[]', line.strip(), maxsplit = 1)[0]
+            if name and not name.startswith('#'):
+                requirements.append(name)
+    return requirements
+
+
+def _get_stamp():
+    digest = hashlib.sha1()
+    with open(REQUIREMENTS, 'rb') as f:
+        digest.update(f.read())
+    digest.update(sys.executable.encode())
+    digest.update(sys.version.encode())
+    return digest.hexdigest()
+
+
+def _read_stamp():
     try:
-        file = open(settings, 'r')
-        string = file.readline().split("==")[-1].replace("\n","")
-        file.close()
-        if string.lower() == "false":
-            install()
-    except:
-        install()
-
-def install():
-    subprocess.call(_string.replace("-r ", f"-r {ROOT_DIR}\\"))
-    file = open(settings, 'w')
-    file.write("requirements_installed==True")
-    file.close()
-
-def _write_batch():
-    path = ROOT_DIR+"\\setup.bat"
-    python_path = sys.executable
-    script_path = os.path.abspath(__file__)
-    string = f"@echo off\n{python_path} {script_path}"
-    print(1)
-
-def test():
-    print('test')
-    python_path = sys.executable
-    script_path = ROOT_DIR+"\\core\\setup.py"
-    subprocess.call(f"{python_path} {script_path}")
+        with open(STAMP) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _write_stamp(stamp):
+    try:
+        with open(STAMP, 'w') as f:
+            f.write(stamp)
+    except OSError:
+        pass
+
 
 if __name__ == "__main__":
-    setup()
\ No newline at end of file
+    setup()
@@ -1,3 +1,12 @@
 import os
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__)) # This is your Project Root
+SOUNDS_DIR = os.path.join(ROOT_DIR, 'sounds')
+SAMPLE_PACK_PATH = os.path.join(ROOT_DIR, 'sounds.pack')
+TRANSCODED_DIR = os.path.join(ROOT_DIR, 'sounds-transcoded')
+SAMPLE_MANIFEST_PATH = os.path.join(ROOT_DIR, 'sounds.manifest.json')
+ATTEMPTS_DB_PATH = os.path.join(ROOT_DIR, 'attempts.sqlite3')
+SETTINGS_PATH = os.path.join(ROOT_DIR, 'settings.json')
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache'), 'ear-exercise-piano')
+PCM_CACHE_DIR = os.path.join(CACHE_DIR, 'pcm')
+LIBRARY_CACHE_PATH = os.path.join(CACHE_DIR, 'library.json')
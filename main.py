@@ -1,20 +1,83 @@
+import argparse
 import tkinter
 
-from core.setup import setup
-setup()
+from core.setup import setup, StartupProfiler
 from core.GUI.gui_configurations import ROOT_BACKGROUND
-from core.GUI.top_menu.top_menu import TopMenu
-from core.configurations import TOPMENU_RELHEIGHT
+from core.configurations import TOPMENU_RELHEIGHT, ATTEMPT_STORE_ENABLED
+from core.instrumentation import probe
+
 class MainMenu(tkinter.Tk):
 
-    def __init__(self):
+    def __init__(self, drill = None):
         super(MainMenu, self).__init__()
         self.wm_title("Tkinter window")
         self.geometry("1400x700")
         self.configure(background = ROOT_BACKGROUND)
-        menu = TopMenu(self, parent = False, rlx=0, rly=0, rlwidth=1, rlheight=TOPMENU_RELHEIGHT)
-        menu.place()
+        self.audio = None
+        self.store = None
+        self.analytics = None
+        self.drill = drill
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.bind('<F12>', lambda event: self.report())
 
-if __name__ == "__main__":
-    root = MainMenu()
+    def build(self, profiler):
+        with profiler.phase('import audio'):
+            from core.audio.device import AudioDevice
+        with profiler.phase('open audio'):
+            self.audio = AudioDevice()
+            self.audio.open()
+        if ATTEMPT_STORE_ENABLED:
+            with profiler.phase('open attempt store'):
+                from core.game.attempt_store import AttemptStore
+                self.store = AttemptStore()
+            with profiler.phase('load analytics'):
+                from core.game.analytics import ConfusionMatrix
+                self.analytics = ConfusionMatrix()
+                self.analytics.load(self.store)
+        with profiler.phase('import gui'):
+            from core.GUI.top_menu.top_menu import TopMenu
+        with profiler.phase('build menu'):
+            menu = TopMenu(self, self.audio, store = self.store, analytics = self.analytics, drill = self.drill, parent = False, rlx=0, rly=0, rlwidth=1, rlheight=TOPMENU_RELHEIGHT)
+            menu.place()
+
+    def report(self):
+        probe.report()
+        if self.audio is not None and self.audio.is_open():
+            misses, seconds = self.audio.sample_bank.get_misses()
+            print(f"sample bank: {misses} sounds decoded on a key press, {seconds * 1000:.1f} ms")
+
+    def close(self):
+        self.report()
+        if self.audio is not None:
+            self.audio.close()
+        if self.store is not None:
+            self.store.close()
+        from core.settings import settings
+        settings.flush()
+        self.destroy()
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Ear exercise piano.')
+    parser.add_argument('--profile-startup', action = 'store_true', help = 'prints the duration of each startup phase')
+    parser.add_argument('--drill', metavar = 'FILE', help = 'a MIDI file whose notes are played by the games instead of random notes')
+    args = parser.parse_args()
+    if args.drill is not None:
+        from core.midi_file import MidiFile
+        try:
+            MidiFile(args.drill)
+        except (OSError, ValueError) as error:
+            parser.error(f"--drill: {error}")
+    profiler = StartupProfiler(enabled = args.profile_startup)
+    with profiler.phase('check requirements'):
+        setup()
+    with profiler.phase('create window'):
+        root = MainMenu(args.drill)
+        root.update()
+    root.build(profiler)
+    with profiler.phase('first frame'):
+        root.update()
+    profiler.report()
     root.mainloop()
+
+if __name__ == "__main__":
+    main()
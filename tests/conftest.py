@@ -0,0 +1,16 @@
+import os
+import pytest
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+@pytest.fixture
+def mixer():
+    """
+        Initialises the pygame mixer in the format of the application, without any audio device.
+    """
+    from pygame import mixer
+    from core.configurations import MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER
+    mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+    yield mixer
+    mixer.quit()
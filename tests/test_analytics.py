@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from core.game.analytics import ConfusionMatrix
+
+
+class Store:
+    """
+        The count_answers() of an AttemptStore, from a fixed list of (expected, pressed, count) rows.
+    """
+    def __init__(self, rows):
+        self.rows = rows
+
+    def count_answers(self):
+        return self.rows
+
+
+@pytest.fixture
+def matrix():
+    matrix = ConfusionMatrix()
+    matrix.add('A', 4, 'A', 4)
+    matrix.add('A', 4, 'Ab', 4)
+    matrix.add('A', 4, 'Ab', 4)
+    matrix.add('C', 4, 'C', 4)
+    matrix.add('C', 4, 'B', 3)
+    return matrix
+
+
+def test_answers_and_accuracy(matrix):
+    assert matrix.get_answers() == 5
+    assert matrix.get_accuracy() == pytest.approx(2 / 5)
+    assert matrix.get_accuracy('A', 4) == pytest.approx(1 / 3)
+    assert matrix.get_accuracy('E', 4) == 0.0
+
+
+def test_confusions_and_intervals(matrix):
+    assert matrix.get_confusions(2) == [('A', 4, 'Ab', 4, 2), ('C', 4, 'B', 3, 1)]
+    assert matrix.get_interval_errors(2) == [(1, 2), (-1, 1)]
+
+
+def test_summary_lists_the_weakest_notes(matrix):
+    summary = matrix.summary(1)
+    assert summary['answers'] == 5
+    assert summary['weakest'] == [('A', 4, pytest.approx(1 / 3))]
+    accuracies = matrix.get_note_accuracies()
+    assert np.isnan(accuracies[0])
+
+
+def test_load_matches_the_answers_added_one_by_one(matrix):
+    loaded = ConfusionMatrix()
+    loaded.load(Store([(69, 69, 1), (69, 70, 2), (60, 60, 1), (60, 59, 1), (200, 60, 4)]))
+    assert np.array_equal(loaded.matrix, matrix.matrix)
+    assert np.array_equal(loaded.intervals, matrix.intervals)
+    assert loaded.get_accuracy() == matrix.get_accuracy()
+
+
+def test_load_of_an_empty_history():
+    matrix = ConfusionMatrix()
+    matrix.load(Store([]))
+    assert matrix.get_answers() == 0
+    assert matrix.summary()['confusions'] == []
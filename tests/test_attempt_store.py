@@ -0,0 +1,73 @@
+import pytest
+from core.game.attempt_store import AttemptStore
+from core.game.session import GameRound
+from core.configurations import ATTEMPT_STORE_BATCH_SIZE
+
+
+class Session:
+    """
+        The attributes of a GameSession read by AttemptStore.record.
+    """
+    def __init__(self, id, mode = 'test'):
+        self.id = id
+        self.mode = mode
+        self.started_at = 1000.0
+
+    def get_octaves(self):
+        return 4, 5
+
+
+def make_round(index, target, answer):
+    round = GameRound(index, target, 0)
+    round.played_at = index * 1000
+    if answer is not None:
+        round.answer = answer
+        round.answered_at = round.played_at + 800
+    return round
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AttemptStore(str(tmp_path / 'attempts.sqlite3'), user = 'tester')
+    yield store
+    store.close()
+
+
+def test_rounds_are_written_in_batches(store):
+    session = Session('a')
+    count = 2 * ATTEMPT_STORE_BATCH_SIZE + 10
+    for index in range(count):
+        store.record(session, make_round(index, ('A', 4), ('A', 4)))
+    store.flush()
+    assert store.count_attempts() == count
+    rows = store.get_session('a')
+    assert [row['round'] for row in rows] == list(range(count))
+    assert rows[0]['expected'] == 69
+    assert rows[0]['played_at'] == pytest.approx(1000.0)
+    assert rows[0]['response_time'] == pytest.approx(800)
+
+
+def test_answers_are_counted_per_pair_of_notes(store):
+    session = Session('b')
+    store.record(session, make_round(0, ('A', 4), ('A', 4)))
+    store.record(session, make_round(1, ('A', 4), ('B', 4)))
+    store.record(session, make_round(2, ('A', 4), ('B', 4)))
+    store.record(session, make_round(3, ('C', 4), None))
+    store.flush()
+    assert sorted(tuple(row) for row in store.count_answers()) == [(69, 69, 1), (69, 71, 2)]
+    assert [row['round'] for row in store.get_note_history('A', 4)] == [2, 1, 0]
+    assert store.get_session('b')[3]['pressed'] is None
+
+
+def test_close_writes_the_queued_rounds(tmp_path):
+    path = str(tmp_path / 'attempts.sqlite3')
+    store = AttemptStore(path, user = 'tester')
+    for index in range(5):
+        store.record(Session('c'), make_round(index, ('E', 4), ('E', 4)))
+    store.close()
+    reopened = AttemptStore(path, user = 'tester')
+    try:
+        assert reopened.count_attempts() == 5
+        assert [row[3] for row in reopened.export()] == [0, 1, 2, 3, 4]
+    finally:
+        reopened.close()
@@ -0,0 +1,81 @@
+import random
+import numpy as np
+import pytest
+from core.audio.chords import ChordMixer
+from core.audio.pcm import from_sound, to_sound
+from core.game.chords import ChordPicker, create_chord_picker
+from core.pitch import get_midi
+from core.configurations import NOTES, MELODIC_DELAY, CHORD_HEADROOM
+
+LENGTH = 4410 #SAMPLES OF A FAKE SOUND
+
+
+class SampleBank:
+    """
+        SampleBank whose sounds are constant levels, that counts the sounds it is asked for.
+    """
+    def __init__(self, level = 0.6):
+        self.level = level
+        self.calls = 0
+
+    def get(self, note, octave, id):
+        self.calls += 1
+        return to_sound(np.full(LENGTH, self.level))
+
+
+@pytest.fixture
+def targets():
+    return [(note, 4) for note in NOTES]
+
+
+def test_shapes_are_built_from_the_notes_of_the_game(targets):
+    picker = ChordPicker('chord', shapes = [(0, 4, 7)])
+    rng = random.Random(0)
+    assert picker.pick('C', 4, targets, rng) == [('C', 4), ('E', 4), ('G', 4)]
+    assert picker.pick('B', 4, targets, rng) == [('E', 4), ('Gb', 4), ('B', 4)] #BUILT DOWNWARDS TO THE NOTE
+    assert picker.pick('Fb', 4, targets[:7], rng) == [('Fb', 4)] #NO SHAPE FITS
+    assert picker.get_delay() == 0
+
+
+def test_melodic_intervals_are_played_both_ways(targets):
+    picker = ChordPicker('melodic')
+    rng = random.Random(0)
+    orders = set()
+    for x in range(50):
+        notes = picker.pick('E', 4, targets, rng)
+        assert len(notes) == 2 and ('E', 4) in notes
+        orders.add(get_midi(*notes[0]) < get_midi(*notes[1]))
+    assert orders == {True, False}
+    assert picker.get_delay() == MELODIC_DELAY
+
+
+def test_the_stimulus_is_checked():
+    assert create_chord_picker('note') is None
+    assert create_chord_picker('harmonic').stimulus == 'harmonic'
+    with pytest.raises(AttributeError):
+        ChordPicker('arpeggio')
+
+
+def test_mixed_sounds_are_kept_until_they_are_the_least_used(mixer):
+    bank = SampleBank()
+    chords = ChordMixer(bank, size = 2)
+    first = chords.get([('C', 4, 0), ('E', 4, 0)])
+    assert chords.get([('C', 4, 0), ('E', 4, 0)]) is first
+    assert bank.calls == 2
+    chords.get([('D', 4, 0), ('F', 4, 0)])
+    chords.get([('C', 4, 0), ('E', 4, 0)])
+    chords.get([('G', 4, 0), ('B', 4, 0)]) #DROPS THE D MINOR THIRD, USED LONGER AGO
+    assert chords.get_size() == 2
+    assert chords.get([('C', 4, 0), ('E', 4, 0)]) is first
+    assert chords.get([('C', 4, 0), ('E', 4, 0)], MELODIC_DELAY) is not first
+    assert chords.get_size() == 2
+
+
+def test_mixed_sounds_are_delayed_and_limited(mixer):
+    frequency = mixer.get_init()[0]
+    samples = from_sound(ChordMixer(SampleBank()).get([('C', 4, 0), ('E', 4, 0)], 50))
+    step = frequency * 50 // 1000
+    assert len(samples) == LENGTH + step
+    assert samples[step:LENGTH, 0] == pytest.approx(CHORD_HEADROOM, abs = 0.01)
+    assert samples[:step, 0] == pytest.approx(CHORD_HEADROOM / 2, abs = 0.01)
+    assert samples[LENGTH:, 0] == pytest.approx(CHORD_HEADROOM / 2, abs = 0.01)
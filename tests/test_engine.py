@@ -0,0 +1,62 @@
+import pytest
+from core.audio import engine as engine_module
+from core.audio.engine import AudioEngine
+
+
+class Channel:
+    """
+        Mixer channel that records what it plays and fades, and stays busy until it is finished by the test.
+    """
+    def __init__(self):
+        self.sound = None
+        self.fades = 0
+
+    def play(self, sound):
+        self.sound = sound
+
+    def fadeout(self, time):
+        self.fades += 1
+
+    def get_busy(self):
+        return self.sound is not None
+
+    def finish(self):
+        self.sound = None
+
+
+@pytest.fixture
+def engine(mixer, monkeypatch):
+    engine = AudioEngine(voices = 2, fadeout = 100)
+    engine.channels = [Channel() for channel in engine.channels]
+    free = lambda: next((channel for channel in engine.channels if not channel.get_busy()), None)
+    monkeypatch.setattr(engine_module.mixer, 'find_channel', free)
+    return engine
+
+
+def test_idle_voices_are_not_faded(engine):
+    first = engine.play('a')
+    second = engine.play('b')
+    assert first is not second
+    assert [channel.fades for channel in engine.channels] == [0, 0, 0]
+    first.finish()
+    third = engine.play('c')
+    assert third not in (first, second)
+    assert [channel.fades for channel in engine.channels] == [0, 0, 0]
+
+
+def test_the_oldest_voice_fades_when_the_last_channel_is_taken(engine):
+    first, second, third = engine.play('a'), engine.play('b'), engine.play('c')
+    assert [first.fades, second.fades, third.fades] == [1, 0, 0]
+    assert engine.play('d') is first #STOLEN ONCE FADED
+    assert first.sound == 'd'
+    assert second.fades == 1
+    assert engine.get_busy_voices() == 3
+
+
+def test_free_channels_are_used_from_the_least_recently_started(engine):
+    first, second, third = engine.play('a'), engine.play('b'), engine.play('c')
+    for channel in (first, second, third):
+        channel.finish()
+    second.play('x') #STARTED OUTSIDE THE ENGINE IS STILL BUSY
+    assert engine.play('d') is first
+    assert engine.play('e') is third
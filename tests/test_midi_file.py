@@ -0,0 +1,74 @@
+import struct
+import pytest
+from core.midi_file import MidiFile, get_melody
+from core.game.drill import read_drill, fit_to_keys
+
+DIVISION = 480 #TICKS PER QUARTER NOTE
+
+
+def chunk(kind, data):
+    return kind + struct.pack('>I', len(data)) + data
+
+
+def write(path, *tracks, format = 1, division = DIVISION):
+    header = chunk(b'MThd', struct.pack('>HHH', format, len(tracks), division))
+    path.write_bytes(header + b''.join(chunk(b'MTrk', track) for track in tracks))
+    return str(path)
+
+
+#120 BPM, THEN 240 BPM FROM THE THIRD QUARTER NOTE
+TEMPO_TRACK = (b'\x00\xff\x51\x03\x07\xa1\x20'
+               b'\x00\xff\x03\x04name'
+               b'\x87\x40\xff\x51\x03\x03\xd0\x90'
+               b'\x00\xff\x2f\x00')
+
+#C4 AND E4 WITH RUNNING STATUS, A DRUM, A NOTE OFF AS A VELOCITY 0, THEN G4 AFTER THE TEMPO CHANGE
+NOTES_TRACK = (b'\x00\x90\x3c\x40'
+               b'\x83\x60\x40\x40'
+               b'\x00\x99\x24\x7f'
+               b'\x00\x90\x40\x00'
+               b'\x87\x40\x43\x50'
+               b'\x00\xff\x2f\x00')
+
+
+@pytest.fixture
+def song(tmp_path):
+    return write(tmp_path / 'song.mid', TEMPO_TRACK, NOTES_TRACK)
+
+
+def test_notes_are_timed_with_the_tempo_changes(song):
+    notes = list(MidiFile(song).get_notes())
+    assert [note[1:] for note in notes] == [(60, 64, 0, 1), (64, 64, 0, 1), (67, 80, 0, 1)]
+    assert [note[0] for note in notes] == pytest.approx([0, 0.5, 1.25])
+
+
+def test_channels_and_tracks_are_filtered(song):
+    assert [note[1] for note in MidiFile(song).get_notes(channels = [9])] == [36]
+    assert list(MidiFile(song).get_notes(tracks = [0])) == []
+
+
+def test_a_truncated_track_ends_at_its_last_whole_event(tmp_path):
+    path = write(tmp_path / 'truncated.mid', NOTES_TRACK[:6], format = 0)
+    assert [note[1] for note in MidiFile(path).get_notes()] == [60]
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / 'song.mid'
+    path.write_bytes(b'RIFF' + bytes(10))
+    with pytest.raises(ValueError):
+        MidiFile(str(path))
+    with pytest.raises(ValueError):
+        MidiFile(write(path, NOTES_TRACK, format = 2))
+
+
+def test_melody_keeps_the_highest_note_of_a_chord():
+    notes = [(0, 60, 1, 0, 0), (0.01, 64, 2, 0, 0), (0.5, 62, 3, 0, 0), (1, 67, 4, 0, 0), (1, 55, 5, 0, 0)]
+    assert list(get_melody(notes)) == [(0, 64, 2, 0, 0), (0.5, 62, 3, 0, 0), (1, 67, 4, 0, 0)]
+
+
+def test_drill_fits_the_notes_to_the_keys(song):
+    assert fit_to_keys(40, 60, 83) == 64
+    assert fit_to_keys(90, 60, 83) == 78
+    assert fit_to_keys(61, 62, 66) is None
+    drill = list(read_drill(song, range(72, 84), speed = 2, melody = False))
+    assert drill == [(0, 'C', 5), (pytest.approx(250), 'E', 5), (pytest.approx(625), 'G', 5)]
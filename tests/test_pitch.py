@@ -0,0 +1,37 @@
+import pytest
+from core.pitch import get_midi, get_note, get_name, get_frequency, get_anchor, is_anchor, LOWEST_MIDI, HIGHEST_MIDI
+
+
+def test_midi_numbers():
+    assert get_midi('A', 4) == 69
+    assert get_midi('C', 1) == LOWEST_MIDI
+    assert get_midi('B', 8) == HIGHEST_MIDI
+    assert get_midi('Cb', 4) == 61 #Cb IS THE NOTE AFTER C
+
+
+def test_notes_round_trip():
+    for midi in range(LOWEST_MIDI, HIGHEST_MIDI + 1):
+        assert get_midi(*get_note(midi)) == midi
+
+
+def test_names():
+    assert get_name(69) == 'A4'
+    assert get_name(61) == 'Cb4'
+    assert get_name(12) == 'C0' #OUTSIDE THE PRECOMPUTED NAMES
+
+
+def test_frequencies():
+    assert get_frequency('A', 4) == pytest.approx(440)
+    assert get_frequency('A', 5) == pytest.approx(880)
+    assert get_frequency('C', 4) == pytest.approx(261.626, abs = 1e-3)
+
+
+def test_anchors():
+    assert get_anchor('C', 1, 3) == ('C', 1)
+    assert get_anchor('Cb', 1, 3) == ('C', 1)
+    assert get_anchor('D', 1, 3) == ('Db', 1)
+    assert get_anchor('B', 8, 3) == ('A', 8) #THE LAST ANCHOR
+    assert is_anchor('Db', 1, 3)
+    assert not is_anchor('D', 1, 3)
+    for midi in range(LOWEST_MIDI, HIGHEST_MIDI - 1):
+        assert abs(get_midi(*get_anchor(*get_note(midi), 3)) - midi) <= 1
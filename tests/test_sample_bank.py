@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from core.audio.library import SampleLibrary
+from core.audio.pcm import to_sound
+from core.audio.sample_bank import SampleBank
+from core.configurations import NOTES
+
+LENGTH = 4410 #SAMPLES OF A FAKE SOUND
+
+
+class Source:
+    """
+        Sample source whose sounds are silences, that counts the sounds it decodes.
+    """
+    path = None
+
+    def __init__(self):
+        self.loads = 0
+
+    def load(self, note, octave, id):
+        self.loads += 1
+        return to_sound(np.zeros(LENGTH))
+
+
+@pytest.fixture
+def library():
+    return SampleLibrary([(note, octave, 0, 1, 0.1) for octave in (3, 4, 5) for note in NOTES])
+
+
+def test_sounds_that_are_not_loaded_are_counted_as_misses(mixer, library):
+    source = Source()
+    bank = SampleBank(source, library = library)
+    bank.load_octave(4)
+    assert bank.get('A', 4, 0) is bank.get('A', 4, 0)
+    assert bank.get_misses()[0] == 0
+    bank.get('A', 5, 0)
+    bank.get('A', 5, 0)
+    misses, seconds = bank.get_misses()
+    assert misses == 1
+    assert seconds > 0
+    assert source.loads == len(NOTES) + 1
+
+
+def test_the_least_recently_used_octaves_are_evicted(mixer, library):
+    bank = SampleBank(Source(), library = library)
+    bank.load_octave(3)
+    size = bank.get_memory_usage()
+    bank.memory_budget = 2 * size
+    bank.load_octave(4)
+    bank.get('C', 3, 0)
+    bank.load_octave(5)
+    assert bank.get_loaded_octaves() == [3, 5]
+    assert bank.get_memory_usage() == 2 * size
+    assert not bank.is_loaded('C', 4, 0)
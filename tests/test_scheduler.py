@@ -0,0 +1,88 @@
+import pytest
+from core.game.scheduler import GameScheduler
+
+
+class Clock:
+    """
+        Simulated clock of a scheduler, in seconds.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return GameScheduler(None, clock = clock)
+
+
+def test_events_run_in_deadline_order(scheduler):
+    calls = []
+    scheduler.schedule(200, lambda: calls.append('b'))
+    scheduler.schedule(100, lambda: calls.append('a'))
+    scheduler.schedule(200, lambda: calls.append('c'))
+    scheduler.start(0)
+    scheduler.tick(0.15)
+    assert calls == ['a']
+    scheduler.tick(0.2)
+    assert calls == ['a', 'b', 'c']
+    assert scheduler.get_next_deadline() is None
+
+
+def test_events_see_the_time_of_the_tick(scheduler):
+    seen = []
+    scheduler.schedule(100, lambda: seen.append(scheduler.elapsed()))
+    scheduler.start(0)
+    scheduler.tick(0.25)
+    assert seen == [pytest.approx(250)]
+
+
+def test_pause_does_not_count_towards_the_deadlines(scheduler, clock):
+    calls = []
+    scheduler.schedule(1000, lambda: calls.append(scheduler.elapsed()))
+    scheduler.start(0)
+    clock.now = 0.4
+    scheduler.pause()
+    assert scheduler.is_paused()
+    clock.now = 10
+    scheduler.tick()
+    assert calls == []
+    assert scheduler.elapsed() == pytest.approx(400)
+    scheduler.resume()
+    clock.now = 10.5
+    scheduler.tick()
+    assert calls == []
+    clock.now = 10.6
+    scheduler.tick()
+    assert calls == [pytest.approx(1000)]
+
+
+def test_jitter_is_measured_from_the_deadline(scheduler):
+    scheduler.schedule(100, lambda: None)
+    scheduler.schedule(300, lambda: None)
+    scheduler.start(0)
+    scheduler.tick(0.13)
+    scheduler.tick(0.3)
+    jitter = scheduler.get_jitter()
+    assert [deadline for deadline, late in jitter] == [100, 300]
+    assert [late for deadline, late in jitter] == [pytest.approx(30), pytest.approx(0)]
+    summary = scheduler.get_jitter_summary()
+    assert summary['events'] == 2
+    assert summary['max'] == pytest.approx(30)
+
+
+def test_an_event_can_cancel_the_timeline(scheduler):
+    calls = []
+    scheduler.schedule(100, scheduler.cancel)
+    scheduler.schedule(100, lambda: calls.append('late'))
+    scheduler.start(0)
+    scheduler.tick(1)
+    assert calls == []
+    assert not scheduler.is_running()
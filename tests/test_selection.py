@@ -0,0 +1,75 @@
+import random
+import pytest
+from core.audio.library import SampleLibrary
+from core.game.selection import FenwickTree, AdaptiveSelector, UniformSelector, UNKNOWN_ERROR_RATE
+from core.game.session import GameRound
+from core.pitch import get_midi, LOWEST_MIDI
+from core.configurations import NOTES, ADAPTIVE_RESTING_FACTOR, ADAPTIVE_FIRST_INTERVAL
+
+
+@pytest.fixture
+def targets():
+    return [(note, 4) for note in NOTES]
+
+
+@pytest.fixture
+def library(targets):
+    return SampleLibrary([(note, octave, id, 1, 0.5) for note, octave in targets for id in range(2)])
+
+
+def answer(selector, note, octave, id, pressed):
+    round = GameRound(0, (note, octave), id)
+    round.answer = pressed
+    selector.update(round)
+
+
+def test_fenwick_tree_sums_and_finds():
+    weights = [1.0, 0.0, 2.0, 3.0, 0.5]
+    tree = FenwickTree(weights)
+    assert [tree.prefix(index) for index in range(6)] == pytest.approx([0, 1, 1, 3, 6, 6.5])
+    assert tree.find(0.5) == 0
+    assert tree.find(1.5) == 2 #THE ITEM OF WEIGHT 0 IS NEVER FOUND
+    assert tree.find(5.9) == 3
+    assert tree.find(6.4) == 4
+    tree.update(1, 4.0)
+    assert tree.get(1) == 4.0
+    assert tree.prefix(5) == pytest.approx(10.5)
+    assert tree.find(2.0) == 1
+
+
+def test_adaptive_selector_picks_only_the_given_notes(targets, library):
+    selector = AdaptiveSelector(library = library)
+    rng = random.Random(0)
+    picked = {selector.select(targets[3:6], rng)[:2] for x in range(200)}
+    assert picked == set(targets[3:6])
+
+
+def test_wrong_answers_raise_the_error_rate(library):
+    selector = AdaptiveSelector(library = library)
+    assert selector.get_error_rate('A', 4) == UNKNOWN_ERROR_RATE
+    answer(selector, 'A', 4, 0, ('B', 4))
+    wrong = selector.get_error_rate('A', 4)
+    answer(selector, 'C', 4, 0, ('C', 4))
+    assert wrong > UNKNOWN_ERROR_RATE
+    assert selector.get_error_rate('C', 4) < UNKNOWN_ERROR_RATE
+
+
+def test_a_played_sound_rests(targets, library):
+    selector = AdaptiveSelector(library = library)
+    index = selector.indexes[(get_midi('A', 4) - LOWEST_MIDI, 0)]
+    weight = selector.tree.get(index)
+    answer(selector, 'A', 4, 0, ('A', 4))
+    assert selector.tree.get(index) < weight * ADAPTIVE_RESTING_FACTOR
+    rng = random.Random(1)
+    for x in range(ADAPTIVE_FIRST_INTERVAL):
+        selector.select(targets, rng)
+    assert selector.tree.get(index) > weight * ADAPTIVE_RESTING_FACTOR
+
+
+def test_the_selectors_refuse_notes_without_sounds(library):
+    for selector in (UniformSelector(library), AdaptiveSelector(library = library)):
+        with pytest.raises(ValueError):
+            selector.get_targets([('C', 2), ('D', 2)])
+        assert selector.get_targets([('C', 2), ('C', 4)]) == [('C', 4)]
+    with pytest.raises(ValueError):
+        AdaptiveSelector(library = library).select([('C', 2), ('D', 2)], random.Random())
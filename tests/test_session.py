@@ -0,0 +1,130 @@
+import random
+import pytest
+from core.audio.library import SampleLibrary
+from core.game.selection import UniformSelector
+from core.game.session import GameSession, GameSink, PRACTICE, TEST, ANSWER_RESTORE_TIME
+from core.configurations import NOTES, PRACTICE_GUESS_TIME, TIME_FOR_SHOW_ANSWER, TOTAL_TIME
+
+COUNT = 50
+RESPONSE_TIME = 0.8 #SECONDS, THE SIMULATED TIME THE PLAYER TAKES TO ANSWER
+
+
+class CountingLibrary(SampleLibrary):
+    """
+        SampleLibrary that counts the calls of get_ids, to check that a game does not scan the notes every round.
+    """
+    def __init__(self, sounds):
+        super().__init__(sounds)
+        self.lookups = 0
+
+    def get_ids(self, note, octave):
+        self.lookups += 1
+        return super().get_ids(note, octave)
+
+
+class Clock:
+    """
+        Simulated clock of a session, in seconds.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingSink(GameSink):
+    """
+        GameSink that records every event of a session with the ms at which it was called.
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []
+
+    def record(self, kind, note):
+        self.events.append((self.clock.now * 1000, kind, note))
+
+    def on_play(self, note, octave, id):
+        self.record('play', (note, octave))
+
+    def on_show_answer(self, note, octave):
+        self.record('show', (note, octave))
+
+    def on_hide_answer(self, note, octave):
+        self.record('hide', (note, octave))
+
+    def on_game_over(self, session):
+        self.record('over', None)
+
+    def get_times(self, kind):
+        return [time for time, event, note in self.events if event == kind]
+
+
+@pytest.fixture
+def targets():
+    return [(note, octave) for octave in (4, 5) for note in NOTES]
+
+
+@pytest.fixture
+def library(targets):
+    return CountingLibrary([(note, octave, id, 1, 0.5) for note, octave in targets for id in range(3)])
+
+
+def run(mode, targets, library, answer = None):
+    clock = Clock()
+    sink = RecordingSink(clock)
+    session = GameSession(mode, targets, COUNT, sink = sink, clock = clock, rng = random.Random(0), selector = UniformSelector(library))
+    session.start()
+    while session.is_running():
+        clock.now = session.get_next_time()
+        session.tick()
+        if answer is not None and session.is_awaiting():
+            clock.now += RESPONSE_TIME
+            session.press(*answer(session.get_rounds()[-1]))
+    return session, sink
+
+
+def test_practice_session(targets, library):
+    session, sink = run(PRACTICE, targets, library)
+    assert len(session.get_rounds()) == COUNT
+    assert session.get_results()['answered'] == 0
+    plays = sink.get_times('play')
+    assert plays == pytest.approx([index * TOTAL_TIME for index in range(COUNT)])
+    assert sink.get_times('show') == pytest.approx([time + PRACTICE_GUESS_TIME for time in plays])
+    assert sink.get_times('hide') == pytest.approx([time + PRACTICE_GUESS_TIME + ANSWER_RESTORE_TIME for time in plays])
+    assert sink.get_times('over') == pytest.approx([COUNT * TOTAL_TIME])
+
+
+def test_test_session(targets, library):
+    wrong = lambda round: targets[(targets.index(round.target) + 1) % len(targets)]
+    session, sink = run(TEST, targets, library, lambda round: round.target if round.index % 2 == 0 else wrong(round))
+    rounds = session.get_rounds()
+    assert len(rounds) == COUNT
+    results = session.get_results()
+    assert results['answered'] == COUNT
+    assert results['correct'] == COUNT // 2
+    assert results['accuracy'] == 0.5
+    assert results['mean_response'] == pytest.approx(RESPONSE_TIME * 1000)
+    answers = [round.answered_at for round in rounds]
+    assert sink.get_times('show') == pytest.approx(answers)
+    assert sink.get_times('hide') == pytest.approx([time + ANSWER_RESTORE_TIME for time in answers])
+    assert sink.get_times('play')[1:] == pytest.approx([time + TIME_FOR_SHOW_ANSWER for time in answers[:-1]])
+    assert sink.get_times('over') == pytest.approx([answers[-1] + TIME_FOR_SHOW_ANSWER])
+
+
+def test_notes_are_looked_up_once_per_round(targets, library):
+    run(TEST, targets, library, lambda round: round.target)
+    assert library.lookups <= len(targets) + COUNT
+
+
+def test_timeline_skips_the_notes_without_sounds(targets, library):
+    timeline = [(0, 'C', 4), (500, 'C', 8), (1000, 'E', 4), (1500, 'A', 1), (2000, 'G', 5)]
+    clock = Clock()
+    sink = RecordingSink(clock)
+    session = GameSession(PRACTICE, targets, None, sink = sink, clock = clock, selector = UniformSelector(library), timeline = timeline)
+    session.start()
+    while session.is_running():
+        clock.now = session.get_next_time()
+        session.tick()
+    assert [round.target for round in session.get_rounds()] == [('C', 4), ('E', 4), ('G', 5)]
+    assert sink.get_times('play') == pytest.approx([0, 1000, 2000])
@@ -0,0 +1,54 @@
+import json
+import os
+import time
+import pytest
+from core.settings import Settings, DEFAULTS
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'settings.json')
+
+
+def test_defaults_and_saved_values(path):
+    with open(path, 'w') as f:
+        json.dump({'SOUNDS_PER_SESSION': 20, 'SHOW_KEYS': 'yes', 'UNKNOWN': 1}, f)
+    settings = Settings(path)
+    assert settings.get('SOUNDS_PER_SESSION') == 20
+    assert settings.get('SHOW_KEYS') == DEFAULTS['SHOW_KEYS'] #A VALUE OF THE WRONG TYPE IS IGNORED
+    with pytest.raises(KeyError):
+        settings.set('UNKNOWN', 1)
+
+
+def test_changes_are_saved_once_after_the_delay(path):
+    settings = Settings(path, delay = 0.2)
+    calls = []
+    settings.subscribe('SOUNDS_PER_SESSION', calls.append)
+    settings.set('SOUNDS_PER_SESSION', 10)
+    settings.set('SOUNDS_PER_SESSION', 15)
+    settings.set('SOUNDS_PER_SESSION', 15)
+    assert calls == [10, 15]
+    assert not os.path.exists(path)
+    deadline = time.monotonic() + 5
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    with open(path) as f:
+        assert json.load(f)['SOUNDS_PER_SESSION'] == 15
+
+
+def test_flush_saves_at_once_and_leaves_no_temporary_file(path, tmp_path):
+    settings = Settings(path, delay = 60)
+    settings.update({'SOUNDS_PER_SESSION': 30, 'ONE_OCTAVE_ONLY': True})
+    settings.flush()
+    assert Settings(path).get('ONE_OCTAVE_ONLY') is True
+    assert os.listdir(tmp_path) == ['settings.json']
+
+
+def test_unsubscribe(path):
+    settings = Settings(path, delay = 60)
+    calls = []
+    unsubscribe = settings.subscribe('SHOW_KEYS', calls.append)
+    unsubscribe()
+    settings.set('SHOW_KEYS', not DEFAULTS['SHOW_KEYS'])
+    assert calls == []
+    settings.flush()
@@ -0,0 +1,42 @@
+import argparse
+import os
+import shutil
+import pytest
+from core.audio.sources import DirectorySource
+from core.audio.transcode import TranscodedSource, transcode, parse_target, get_directory
+from definitions import SOUNDS_DIR
+
+NAMES = ['A4-id0.mp3', 'A4-id1.mp3', 'C4-id0.mp3']
+
+
+@pytest.fixture
+def sounds(tmp_path):
+    directory = tmp_path / 'sounds'
+    directory.mkdir()
+    for name in NAMES:
+        shutil.copy(os.path.join(SOUNDS_DIR, name), directory / name)
+    return str(directory)
+
+
+def test_parse_target():
+    assert parse_target('wav:44100:2') == ('wav', 44100, 2)
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_target('flac:44100:2')
+
+
+def test_transcode_skips_the_files_that_did_not_change(sounds, tmp_path):
+    output = str(tmp_path / 'transcoded')
+    assert transcode(sounds, output, [('wav', 22050, 1)], workers = 1) == (3, 0)
+    assert sorted(os.listdir(get_directory(('wav', 22050, 1), output))) == ['A4-id0.wav', 'A4-id1.wav', 'C4-id0.wav']
+    assert transcode(sounds, output, [('wav', 22050, 1)], workers = 1) == (0, 3)
+
+
+def test_the_files_in_the_format_of_the_mixer_are_preferred(sounds, tmp_path, mixer):
+    output = str(tmp_path / 'transcoded')
+    frequency, size, channels = mixer.get_init()
+    transcode(sounds, output, [('wav', 22050, 1), ('wav', frequency, channels)], workers = 1)
+    os.remove(os.path.join(get_directory(('wav', frequency, channels), output), 'C4-id0.wav'))
+    source = TranscodedSource(DirectorySource(sounds), output)
+    assert source.get_path('A', 4, 0).startswith(get_directory(('wav', frequency, channels), output))
+    assert source.get_path('C', 4, 0).startswith(get_directory(('wav', 22050, 1), output))
+    assert source.load('A', 4, 1).get_length() == pytest.approx(0.5, abs = 0.01)